@@ -0,0 +1,87 @@
+"""
+Compare concurrent-request throughput of the WSGI and ASGI deployments.
+
+Start both servers against the same database, e.g.::
+
+    gunicorn core.wsgi:application -b :8000 --workers 3
+    gunicorn core.asgi:application -b :8001 --workers 3 \
+        -k uvicorn_worker.UvicornWorker
+
+and run::
+
+    python -m benchmarks.asgi_vs_wsgi --token <access token> \\
+        --target wsgi=http://localhost:8000/api/tasks/ \\
+        --target asgi=http://localhost:8001/api/async/tasks/
+
+Results are printed as JSON, one object per target.
+"""
+
+import argparse
+import json
+import statistics
+import time
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+
+
+def percentile(samples, pct):
+    samples = sorted(samples)
+    index = min(len(samples) - 1, round(pct / 100 * (len(samples) - 1)))
+    return samples[index]
+
+
+def fetch(url, token):
+    request = urllib.request.Request(url, headers={"Authorization": f"Bearer {token}"})
+    started = time.perf_counter()
+    with urllib.request.urlopen(request) as response:
+        response.read()
+        status = response.status
+    return status, time.perf_counter() - started
+
+
+def run_target(name, url, token, requests, concurrency):
+    fetch(url, token)  # Warm up connections and caches.
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        results = list(pool.map(lambda _: fetch(url, token), range(requests)))
+    elapsed = time.perf_counter() - started
+
+    latencies = [latency * 1000 for _, latency in results]
+    return {
+        "target": name,
+        "url": url,
+        "requests": requests,
+        "concurrency": concurrency,
+        "errors": sum(1 for status, _ in results if status != 200),
+        "throughput_rps": requests / elapsed,
+        "latency_ms": {
+            "mean": statistics.fmean(latencies),
+            "p50": percentile(latencies, 50),
+            "p95": percentile(latencies, 95),
+            "p99": percentile(latencies, 99),
+        },
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument(
+        "--target",
+        action="append",
+        required=True,
+        metavar="NAME=URL",
+        help="Endpoint to benchmark; repeat for every deployment.",
+    )
+    parser.add_argument("--token", required=True, help="JWT access token.")
+    parser.add_argument("--requests", type=int, default=1000)
+    parser.add_argument("--concurrency", type=int, default=50)
+    args = parser.parse_args(argv)
+
+    for target in args.target:
+        name, _, url = target.partition("=")
+        result = run_target(name, url, args.token, args.requests, args.concurrency)
+        print(json.dumps(result))
+
+
+if __name__ == "__main__":
+    main()
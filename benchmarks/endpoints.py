@@ -0,0 +1,307 @@
+"""
+Benchmark every GET route of the API and admin against a seeded database.
+
+Seed the database configured in core.settings once (this takes a while for
+the default volumes)::
+
+    python -m benchmarks.endpoints --seed --projects 100 --sprints 5000 \\
+        --tasks 1000000 --iterations 0
+
+then record a run per commit and compare them::
+
+    python -m benchmarks.endpoints --output before.json
+    python -m benchmarks.endpoints --output after.json --compare before.json
+
+Requests go through the Django test client, so the numbers exclude the
+network and the application server. Latency is measured over
+``--iterations`` requests, while SQL queries and peak memory (Python
+allocations traced by tracemalloc) come from one extra request each, so the
+tracing overhead does not skew the latency percentiles.
+"""
+
+import argparse
+import json
+import os
+import re
+import statistics
+import subprocess
+import sys
+import time
+import tracemalloc
+from dataclasses import dataclass
+from datetime import datetime, timezone
+
+from benchmarks.asgi_vs_wsgi import percentile
+
+# Admin routes of other apps (auth, password change, ...) are not ours to tune.
+ADMIN_ROUTE = re.compile(r"^admin:(index|app_list|tracker_\w+)$")
+# Which seeded object fills the pk of a route, picked by the route name.
+ROUTE_OBJECTS = ("sprint", "project", "task")
+
+
+@dataclass
+class Route:
+    name: str
+    route: str
+    kwargs: tuple
+
+
+def discover_routes(patterns=None, prefix="", namespace="", kwargs=()):
+    """Yield every named URL pattern of the root URLconf."""
+    from django.urls import URLResolver, get_resolver
+
+    if patterns is None:
+        patterns = get_resolver().url_patterns
+    for entry in patterns:
+        names = kwargs + tuple(entry.pattern.regex.groupindex)
+        if isinstance(entry, URLResolver):
+            yield from discover_routes(
+                entry.url_patterns,
+                prefix + str(entry.pattern),
+                f"{namespace}{entry.namespace}:" if entry.namespace else namespace,
+                names,
+            )
+        elif entry.name:
+            yield Route(namespace + entry.name, prefix + str(entry.pattern), names)
+
+
+def build_url(route, ids):
+    """Reverse ``route`` with seeded ids, or return None if it can't be filled."""
+    from django.urls import NoReverseMatch, reverse
+
+    if route.name.startswith("admin:") and not ADMIN_ROUTE.match(route.name):
+        return None
+    obj = next((name for name in ROUTE_OBJECTS if name in route.name), None)
+    values = {}
+    for kwarg in route.kwargs:
+        if kwarg == "app_label":
+            values[kwarg] = "tracker"
+        elif kwarg in ("pk", "object_id") and ids.get(obj) is not None:
+            values[kwarg] = ids[obj]
+        else:
+            return None
+    try:
+        return reverse(route.name, kwargs=values)
+    except NoReverseMatch:
+        return None
+
+
+class QueryCounter:
+    """Database execute wrapper counting queries and the time spent in them."""
+
+    def __init__(self):
+        self.count = 0
+        self.duration = 0.0
+
+    def __call__(self, execute, sql, params, many, context):
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.count += 1
+            self.duration += time.perf_counter() - started
+
+
+def fetch(client, url):
+    """GET ``url`` and read the whole body, streamed or not."""
+    response = client.get(url)
+    if response.streaming:
+        return response, sum(len(chunk) for chunk in response.streaming_content)
+    return response, len(response.content)
+
+
+def measure(client, url, iterations):
+    from django.db import connection
+
+    response, size = fetch(client, url)  # Warm up caches and the connection.
+    if response.status_code == 405:
+        return {"status": 405, "skipped": "GET not allowed"}
+
+    queries = QueryCounter()
+    with connection.execute_wrapper(queries):
+        fetch(client, url)
+
+    tracemalloc.start()
+    try:
+        fetch(client, url)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    latencies = []
+    for _ in range(iterations):
+        started = time.perf_counter()
+        fetch(client, url)
+        latencies.append((time.perf_counter() - started) * 1000)
+
+    result = {
+        "status": response.status_code,
+        "bytes": size,
+        "queries": queries.count,
+        "sql_ms": queries.duration * 1000,
+        "peak_memory_kb": peak / 1024,
+        "iterations": iterations,
+    }
+    if latencies:
+        result["latency_ms"] = {
+            "mean": statistics.fmean(latencies),
+            "p50": percentile(latencies, 50),
+            "p95": percentile(latencies, 95),
+            "p99": percentile(latencies, 99),
+            "max": max(latencies),
+        }
+    return result
+
+
+def benchmark_client(user):
+    from django.test import Client
+    from rest_framework_simplejwt.tokens import AccessToken
+
+    client = Client(HTTP_AUTHORIZATION=f"Bearer {AccessToken.for_user(user)}")
+    client.force_login(user)  # The admin authenticates with the session.
+    return client
+
+
+def sample_ids():
+    from tracker.models import Task
+
+    task = Task.objects.filter(sprint__isnull=False).order_by("-id").first()
+    if task is None:
+        task = Task.objects.order_by("-id").first()
+    if task is None:
+        return {}
+    return {"project": task.project_id, "sprint": task.sprint_id, "task": task.pk}
+
+
+def run(user, iterations=50, only=None):
+    """Benchmark every route matching the ``only`` regex; return the report."""
+    from django.db import connection
+
+    from tracker.models import Project, Sprint, Task
+
+    client = benchmark_client(user)
+    ids = sample_ids()
+    results = []
+    for route in discover_routes():
+        if only and not re.search(only, route.name):
+            continue
+        if "format" in route.kwargs:
+            continue  # Format-suffix duplicates of the router routes.
+        url = build_url(route, ids)
+        if url is None:
+            results.append(
+                {"name": route.name, "route": route.route, "skipped": "not benchmarked"}
+            )
+            continue
+        result = {"name": route.name, "route": route.route, "url": url}
+        result.update(measure(client, url, iterations))
+        results.append(result)
+
+    return {
+        "meta": {
+            "commit": _git_commit(),
+            "started_at": datetime.now(timezone.utc).isoformat(),
+            "database": connection.vendor,
+            "python": sys.version.split()[0],
+            "rows": {
+                "projects": Project.objects.count(),
+                "sprints": Sprint.objects.count(),
+                "tasks": Task.objects.count(),
+            },
+        },
+        "results": results,
+    }
+
+
+def compare(report, baseline, threshold):
+    """Return a line per route whose p95 or query count regressed."""
+    previous = {result["name"]: result for result in baseline["results"]}
+    regressions = []
+    for result in report["results"]:
+        before = previous.get(result["name"])
+        if not before or "latency_ms" not in result or "latency_ms" not in before:
+            continue
+        old, new = before["latency_ms"]["p95"], result["latency_ms"]["p95"]
+        if new > old * (1 + threshold / 100):
+            regressions.append(f"{result['name']}: p95 {old:.1f}ms -> {new:.1f}ms")
+        if result["queries"] > before["queries"]:
+            regressions.append(
+                f"{result['name']}: queries {before['queries']} -> {result['queries']}"
+            )
+    return regressions
+
+
+def _git_commit():
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--seed", action="store_true", help="Seed the database first.")
+    parser.add_argument("--projects", type=int, default=100)
+    parser.add_argument("--sprints", type=int, default=5000)
+    parser.add_argument("--tasks", type=int, default=1_000_000)
+    parser.add_argument("--users", type=int, default=200)
+    parser.add_argument("--iterations", type=int, default=50)
+    parser.add_argument("--only", metavar="REGEX", help="Only routes matching REGEX.")
+    parser.add_argument("--output", help="Write the JSON report to this file.")
+    parser.add_argument("--compare", metavar="REPORT", help="Baseline JSON report.")
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=20,
+        help="Allowed p95 slowdown against the baseline, in percent.",
+    )
+    args = parser.parse_args(argv)
+
+    os.environ.setdefault("DJANGO_SETTINGS_MODULE", "core.settings")
+    import django
+
+    django.setup()
+    from django.conf import settings
+    from django.contrib.auth import get_user_model
+
+    # The test client sends requests as "testserver".
+    settings.ALLOWED_HOSTS = [*settings.ALLOWED_HOSTS, "testserver"]
+
+    from benchmarks.seed import BENCH_ADMIN_USERNAME, seed
+
+    if args.seed:
+        seed(
+            projects=args.projects,
+            sprints=args.sprints,
+            tasks=args.tasks,
+            users=args.users,
+            log=lambda message: print(message, file=sys.stderr),
+        )
+    if args.iterations <= 0:
+        return 0
+
+    user, _ = get_user_model().objects.get_or_create(
+        username=BENCH_ADMIN_USERNAME,
+        defaults={"is_staff": True, "is_superuser": True},
+    )
+    report = run(user, iterations=args.iterations, only=args.only)
+    output = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w") as fh:
+            fh.write(output)
+    else:
+        print(output)
+
+    if args.compare:
+        with open(args.compare) as fh:
+            regressions = compare(report, json.load(fh), args.threshold)
+        for line in regressions:
+            print(f"REGRESSION {line}", file=sys.stderr)
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
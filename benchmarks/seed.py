@@ -0,0 +1,125 @@
+"""Seed the configured database with a large, realistic tracker dataset."""
+
+import random
+import time
+from datetime import date, timedelta
+
+from django.contrib.auth import get_user_model
+
+from tracker.counters import reconcile_task_counts
+from tracker.models import (
+    Project,
+    Sprint,
+    SprintStatusChoices,
+    Task,
+    TaskPriorityChoices,
+    TaskStatusChoices,
+)
+
+User = get_user_model()
+
+BENCH_ADMIN_USERNAME = "bench-admin"
+SPRINT_LENGTH = timedelta(days=14)
+
+
+def _batches(items, size):
+    batch = []
+    for item in items:
+        batch.append(item)
+        if len(batch) >= size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def seed(
+    projects=100, sprints=5000, tasks=1_000_000, users=200, batch_size=5000, log=print
+):
+    """
+    Create ``projects`` projects with ``sprints`` sprints and ``tasks`` tasks
+    spread over them (a fifth of the tasks stay in the backlog), plus
+    ``users`` assignees and a staff user for the benchmark client.
+    Returns the number of rows created per model.
+    """
+    rng = random.Random(42)
+    started = time.monotonic()
+
+    User.objects.get_or_create(
+        username=BENCH_ADMIN_USERNAME, defaults={"is_staff": True, "is_superuser": True}
+    )
+    user_ids = [
+        user.pk
+        for user in User.objects.bulk_create(
+            User(username=f"bench-user-{i}-{rng.getrandbits(32):x}")
+            for i in range(users)
+        )
+    ]
+    log(f"Created {len(user_ids)} users")
+
+    project_ids = [
+        project.pk
+        for project in Project.objects.bulk_create(
+            Project(name=f"Project {i}", description="Benchmark project")
+            for i in range(projects)
+        )
+    ]
+    log(f"Created {len(project_ids)} projects")
+
+    def sprint_rows():
+        per_project = max(1, sprints // max(1, projects))
+        start = date(2020, 1, 6)
+        for i in range(sprints):
+            project_id = project_ids[i % len(project_ids)]
+            offset = SPRINT_LENGTH * (i // len(project_ids) % per_project)
+            yield Sprint(
+                project_id=project_id,
+                name=f"Sprint {i}",
+                start_date=start + offset,
+                end_date=start + offset + SPRINT_LENGTH,
+                status=rng.choice(SprintStatusChoices.values),
+            )
+
+    sprint_projects = []
+    for batch in _batches(sprint_rows(), batch_size):
+        created = Sprint.objects.bulk_create(batch)
+        sprint_projects.extend((sprint.pk, sprint.project_id) for sprint in created)
+    log(f"Created {len(sprint_projects)} sprints")
+
+    def task_rows():
+        for i in range(tasks):
+            if sprint_projects and rng.random() < 0.8:
+                sprint_id, project_id = rng.choice(sprint_projects)
+            else:
+                sprint_id, project_id = None, rng.choice(project_ids)
+            yield Task(
+                project_id=project_id,
+                sprint_id=sprint_id,
+                assignee_id=rng.choice(user_ids)
+                if user_ids and rng.random() < 0.7
+                else None,
+                title=f"Task {i}",
+                description="Lorem ipsum dolor sit amet. " * rng.randint(0, 20),
+                status=rng.choice(TaskStatusChoices.values),
+                priority=rng.choice(TaskPriorityChoices.values),
+                due_date=date(2020, 1, 1) + timedelta(days=rng.randint(0, 2000)),
+            )
+
+    created = 0
+    for batch in _batches(task_rows(), batch_size):
+        Task.objects.bulk_create(batch)
+        created += len(batch)
+        if created % (batch_size * 20) == 0:
+            log(f"Created {created} tasks")
+    log(f"Created {created} tasks in {time.monotonic() - started:.0f}s")
+
+    # bulk_create bypasses the counter bookkeeping, recount once at the end.
+    reconcile_task_counts()
+    log("Reconciled task counters")
+
+    return {
+        "users": len(user_ids),
+        "projects": len(project_ids),
+        "sprints": len(sprint_projects),
+        "tasks": created,
+    }
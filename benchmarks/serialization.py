@@ -0,0 +1,68 @@
+"""
+Compare list endpoints with and without the values() fast path.
+
+Runs against the database configured in core.settings; seed it first with
+``python -m benchmarks.endpoints --seed --iterations 0``. Then::
+
+    python -m benchmarks.serialization --iterations 20
+
+Results are printed as JSON, one object per URL, with the latency of both
+modes and the speedup of the fast path at the median.
+"""
+
+import argparse
+import json
+import os
+import sys
+
+DEFAULT_URLS = (
+    "/api/tasks/?page_size=500",
+    "/api/tasks/?page_size=500&fields=id,title,status,assignee",
+    "/api/sprints/?page_size=50",
+    "/api/projects/?page_size=100",
+)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--iterations", type=int, default=20)
+    parser.add_argument(
+        "--url",
+        action="append",
+        help="List URL to benchmark; repeatable. Defaults to the main lists.",
+    )
+    args = parser.parse_args(argv)
+
+    os.environ.setdefault("DJANGO_SETTINGS_MODULE", "core.settings")
+    import django
+
+    django.setup()
+    from django.conf import settings
+    from django.contrib.auth import get_user_model
+
+    from benchmarks.endpoints import benchmark_client, measure
+    from benchmarks.seed import BENCH_ADMIN_USERNAME
+
+    settings.ALLOWED_HOSTS = [*settings.ALLOWED_HOSTS, "testserver"]
+    user, _ = get_user_model().objects.get_or_create(
+        username=BENCH_ADMIN_USERNAME,
+        defaults={"is_staff": True, "is_superuser": True},
+    )
+    client = benchmark_client(user)
+
+    for url in args.url or DEFAULT_URLS:
+        result = {"url": url}
+        for mode, enabled in (("serializer", False), ("fast", True)):
+            settings.API_FAST_SERIALIZATION = enabled
+            result[mode] = measure(client, url, args.iterations)
+        slow, fast = result["serializer"], result["fast"]
+        if "latency_ms" in slow and "latency_ms" in fast:
+            result["speedup_p50"] = (
+                slow["latency_ms"]["p50"] / fast["latency_ms"]["p50"]
+            )
+        print(json.dumps(result))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
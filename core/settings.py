@@ -11,6 +11,7 @@ https://docs.djangoproject.com/en/5.2/ref/settings/
 """
 
 import os
+import tempfile
 from pathlib import Path
 
 import environ
@@ -45,10 +46,13 @@ INSTALLED_APPS = [
     "django.contrib.messages",
     "django.contrib.staticfiles",
     "rest_framework",
+    "django_filters",
     "tracker",
 ]
 
 MIDDLEWARE = [
+    "tracker.profiling.ProfilingMiddleware",
+    "tracker.metrics.MetricsMiddleware",
     "django.middleware.security.SecurityMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "django.middleware.common.CommonMiddleware",
@@ -60,11 +64,79 @@ MIDDLEWARE = [
 
 REST_FRAMEWORK = {
     "DEFAULT_AUTHENTICATION_CLASSES": (
-        "rest_framework_simplejwt.authentication.JWTAuthentication",
+        "tracker.authentication.CachedJWTAuthentication",
     ),
     "DEFAULT_PERMISSION_CLASSES": ("rest_framework.permissions.IsAuthenticated",),
+    "DEFAULT_PAGINATION_CLASS": "tracker.pagination.TrackerCursorPagination",
+    "PAGE_SIZE": int(os.getenv("API_PAGE_SIZE", "50")),
 }
 
+# Upper bound for the ``page_size`` query parameter on paginated endpoints.
+API_MAX_PAGE_SIZE = int(os.getenv("API_MAX_PAGE_SIZE", "500"))
+# Upper bound for the number of items accepted by bulk endpoints.
+API_BULK_MAX_ITEMS = int(os.getenv("API_BULK_MAX_ITEMS", "1000"))
+
+# Render list endpoints from values() rows, see tracker/fastpath.py.
+API_FAST_SERIALIZATION = os.getenv("API_FAST_SERIALIZATION", "true").lower() == "true"
+API_FAST_PLAN_CACHE_SIZE = int(os.getenv("API_FAST_PLAN_CACHE_SIZE", "256"))
+
+# "Changes since" sync endpoint, see tracker/sync.py.
+API_SYNC_PAGE_SIZE = int(os.getenv("API_SYNC_PAGE_SIZE", "500"))
+API_SYNC_SETTLE_SECONDS = int(os.getenv("API_SYNC_SETTLE_SECONDS", "2"))
+API_SYNC_MAX_HOLD_SECONDS = int(os.getenv("API_SYNC_MAX_HOLD_SECONDS", "600"))
+API_SYNC_RETENTION_DAYS = int(os.getenv("API_SYNC_RETENTION_DAYS", "30"))
+
+# Tasks removed per transaction by background deletes, see tracker/deletion.py.
+API_DELETION_BATCH_SIZE = int(os.getenv("API_DELETION_BATCH_SIZE", "1000"))
+
+# Largest task count exported by a streamed GET; bigger exports must be queued
+# as a job with POST.
+API_EXPORT_SYNC_MAX_ROWS = int(os.getenv("API_EXPORT_SYNC_MAX_ROWS", "100000"))
+
+# Database-backed background jobs run by `manage.py run_jobs`, see
+# tracker/jobs.py.
+API_JOBS_MAX_ATTEMPTS = int(os.getenv("API_JOBS_MAX_ATTEMPTS", "3"))
+API_JOBS_RETRY_SECONDS = int(os.getenv("API_JOBS_RETRY_SECONDS", "30"))
+API_JOBS_TIMEOUT_SECONDS = int(os.getenv("API_JOBS_TIMEOUT_SECONDS", "3600"))
+API_JOBS_POLL_SECONDS = float(os.getenv("API_JOBS_POLL_SECONDS", "1"))
+API_JOBS_RETENTION_DAYS = int(os.getenv("API_JOBS_RETENTION_DAYS", "7"))
+
+# Live task events streamed to sprint boards under ASGI, see tracker/live.py.
+API_LIVE_ENABLED = os.getenv("API_LIVE_ENABLED", "false").lower() == "true"
+API_LIVE_BROKER = os.getenv("API_LIVE_BROKER", "tracker.live.PostgresBroker")
+API_LIVE_QUEUE_SIZE = int(os.getenv("API_LIVE_QUEUE_SIZE", "1000"))
+API_LIVE_HEARTBEAT_SECONDS = int(os.getenv("API_LIVE_HEARTBEAT_SECONDS", "15"))
+API_LIVE_RETRY_MS = int(os.getenv("API_LIVE_RETRY_MS", "3000"))
+
+# Opt-in response cache for the tracker read endpoints, see tracker/cache.py.
+API_CACHE_ENABLED = os.getenv("API_CACHE_ENABLED", "false").lower() == "true"
+API_CACHE_ALIAS = os.getenv("API_CACHE_ALIAS", "default")
+API_CACHE_TIMEOUT = int(os.getenv("API_CACHE_TIMEOUT", "300"))
+
+# Authentication caches, see tracker/authentication.py.
+API_AUTH_TOKEN_CACHE_SIZE = int(os.getenv("API_AUTH_TOKEN_CACHE_SIZE", "10000"))
+API_AUTH_CACHE_ALIAS = os.getenv("API_AUTH_CACHE_ALIAS", "default")
+API_AUTH_USER_CACHE_TTL = int(os.getenv("API_AUTH_USER_CACHE_TTL", "60"))
+
+# Per-request SQL/timing instrumentation and /metrics, see tracker/metrics.py.
+API_METRICS_ENABLED = os.getenv("API_METRICS_ENABLED", "false").lower() == "true"
+# Comma-separated client addresses that may read /metrics besides staff.
+API_METRICS_ALLOWED_IPS = os.getenv("API_METRICS_ALLOWED_IPS", "127.0.0.1,::1")
+
+# Opt-in request profiling, see tracker/profiling.py.
+API_PROFILE_SAMPLE_RATE = float(os.getenv("API_PROFILE_SAMPLE_RATE", "0"))
+API_PROFILE_SLOW_MS = int(os.getenv("API_PROFILE_SLOW_MS", "0"))
+API_PROFILE_DIR = os.getenv(
+    "API_PROFILE_DIR", os.path.join(tempfile.gettempdir(), "tracker-profiles")
+)
+API_PROFILE_MAX_ENTRIES = int(os.getenv("API_PROFILE_MAX_ENTRIES", "200"))
+API_PROFILE_STACK_INTERVAL_MS = int(os.getenv("API_PROFILE_STACK_INTERVAL_MS", "5"))
+API_PROFILE_EXPLAIN_LIMIT = int(os.getenv("API_PROFILE_EXPLAIN_LIMIT", "5"))
+
+# Admin changelists trust the planner's row estimate above this many rows
+# instead of running COUNT(*), see tracker/admin.py.
+ADMIN_EXACT_COUNT_LIMIT = int(os.getenv("ADMIN_EXACT_COUNT_LIMIT", "10000"))
+
 ROOT_URLCONF = "core.urls"
 
 TEMPLATES = [
@@ -99,6 +171,48 @@ DATABASES = {
     }
 }
 
+# Connection reuse. With DATABASE_POOL enabled each worker process keeps a
+# psycopg connection pool; the total DATABASE_POOL_TOTAL connections (default:
+# one per request a worker serves at once) is split between GUNICORN_WORKERS
+# processes. Otherwise connections persist for DATABASE_CONN_MAX_AGE seconds.
+GUNICORN_WORKERS = int(os.getenv("GUNICORN_WORKERS", "3"))
+GUNICORN_THREADS = int(os.getenv("GUNICORN_THREADS", "1"))
+SERVER_MODE = os.getenv("SERVER_MODE", "wsgi")
+# Under ASGI every request runs its ORM calls on a thread of its own, so a
+# uvicorn worker's concurrency is not bounded by GUNICORN_THREADS.
+ASGI_DB_CONCURRENCY = int(os.getenv("ASGI_DB_CONCURRENCY", "10"))
+WORKER_DB_CONCURRENCY = (
+    ASGI_DB_CONCURRENCY if SERVER_MODE == "asgi" else GUNICORN_THREADS
+)
+
+if os.getenv("DATABASE_POOL", "true").lower() == "true":
+    from psycopg_pool import ConnectionPool
+
+    DATABASE_POOL_TOTAL = int(
+        os.getenv("DATABASE_POOL_TOTAL", GUNICORN_WORKERS * WORKER_DB_CONCURRENCY)
+    )
+    DATABASE_POOL_MAX_SIZE = max(1, DATABASE_POOL_TOTAL // GUNICORN_WORKERS)
+    DATABASES["default"]["OPTIONS"] = {
+        "pool": {
+            # psycopg_pool rejects a min_size above max_size.
+            "min_size": min(
+                int(os.getenv("DATABASE_POOL_MIN_SIZE", "1")), DATABASE_POOL_MAX_SIZE
+            ),
+            "max_size": DATABASE_POOL_MAX_SIZE,
+            "timeout": float(os.getenv("DATABASE_POOL_TIMEOUT", "10")),
+            "max_idle": float(os.getenv("DATABASE_POOL_MAX_IDLE", "300")),
+            # Verify every connection as it is checked out of the pool.
+            "check": ConnectionPool.check_connection,
+        },
+    }
+elif SERVER_MODE == "asgi":
+    # Persistent connections are per thread, and ASGI requests run on
+    # short-lived threads: each would leave its connection behind.
+    DATABASES["default"]["CONN_MAX_AGE"] = 0
+else:
+    DATABASES["default"]["CONN_MAX_AGE"] = int(os.getenv("DATABASE_CONN_MAX_AGE", "60"))
+    DATABASES["default"]["CONN_HEALTH_CHECKS"] = True
+
 
 # Password validation
 # https://docs.djangoproject.com/en/5.2/ref/settings/#auth-password-validators
@@ -137,6 +251,9 @@ USE_TZ = True
 STATIC_URL = "static/"
 STATIC_ROOT = os.path.join(BASE_DIR, "staticfiles")
 
+# Files written by background jobs, e.g. task exports.
+MEDIA_ROOT = os.getenv("MEDIA_ROOT", os.path.join(BASE_DIR, "media"))
+
 # Default primary key field type
 # https://docs.djangoproject.com/en/5.2/ref/settings/#default-auto-field
 
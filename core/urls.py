@@ -19,9 +19,12 @@ from django.contrib import admin
 from django.urls import include, path
 from rest_framework_simplejwt.views import TokenObtainPairView, TokenRefreshView
 
+from tracker.views import metrics
+
 urlpatterns = [
     path("admin/", admin.site.urls),
     path("api/", include("tracker.urls")),
     path("token/", TokenObtainPairView.as_view(), name="token_obtain_pair"),
     path("token/refresh/", TokenRefreshView.as_view(), name="token_refresh"),
+    path("metrics", metrics, name="metrics"),
 ]
@@ -9,5 +9,14 @@ set -e
 python manage.py migrate --noinput
 python manage.py collectstatic --noinput
 
-# Start app server
-exec gunicorn core.wsgi:application --bind 0.0.0.0:8000 --workers 3 --timeout 60
+# Start app server. SERVER_MODE=asgi serves core.asgi through uvicorn workers,
+# which enables the async read endpoints under /api/async/. Their database
+# pool is sized from ASGI_DB_CONCURRENCY instead of GUNICORN_THREADS.
+if [ "${SERVER_MODE:-wsgi}" = "asgi" ]; then
+    exec gunicorn core.asgi:application --bind 0.0.0.0:8000 \
+        --worker-class uvicorn_worker.UvicornWorker \
+        --workers "${GUNICORN_WORKERS:-3}" --timeout 60
+fi
+
+exec gunicorn core.wsgi:application --bind 0.0.0.0:8000 \
+    --workers "${GUNICORN_WORKERS:-3}" --threads "${GUNICORN_THREADS:-1}" --timeout 60
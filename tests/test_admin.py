@@ -0,0 +1,197 @@
+import pytest
+from django.db import connection
+from django.test import Client
+from django.test.utils import CaptureQueriesContext
+
+from tests.fixtures import (  # noqa: F401
+    admin_user,
+    project_1,
+    sprint_1,
+    task_1,
+    user,
+)
+from tracker.admin import EstimatedCountPaginator, estimate_count
+from tracker.models import Project, Sprint, SprintStatusChoices, Task
+
+TASKS_URL = "/admin/tracker/task/"
+
+
+@pytest.fixture
+def admin_site_client(admin_user):  # noqa: F811
+    admin_user.is_superuser = True
+    admin_user.save()
+    client = Client()
+    client.force_login(admin_user)
+    return client
+
+
+def seed(count, user):  # noqa: F811
+    for i in range(count):
+        project = Project.objects.create(name=f"Project {i}")
+        sprint = Sprint.objects.create(
+            project=project,
+            name=f"Sprint {i}",
+            start_date="2023-01-01",
+            end_date="2023-01-15",
+        )
+        Task.objects.create(
+            project=project, sprint=sprint, assignee=user, title=f"Task {i}"
+        )
+
+
+def changelist_queries(client, url=TASKS_URL, **params):
+    with CaptureQueriesContext(connection) as ctx:
+        response = client.get(url, params)
+    assert response.status_code == 200
+    return ctx.captured_queries
+
+
+def act(client, action, tasks, **data):
+    return client.post(
+        TASKS_URL,
+        {"action": action, "_selected_action": [task.pk for task in tasks], **data},
+        follow=True,
+    )
+
+
+@pytest.mark.django_db
+class TestLargeTableAdmin:
+    @pytest.mark.parametrize(
+        "url", [TASKS_URL, "/admin/tracker/sprint/", "/admin/tracker/project/"]
+    )
+    def test_changelist_query_count_is_flat(
+        self,
+        admin_site_client: Client,
+        user,  # noqa: F811
+        url,
+    ):
+        seed(1, user)
+        few = len(changelist_queries(admin_site_client, url))
+        seed(20, user)
+        assert len(changelist_queries(admin_site_client, url)) == few
+
+    def test_no_full_count(self, admin_site_client: Client, task_1: Task):  # noqa: F811
+        queries = changelist_queries(admin_site_client, status__exact=0)
+        assert len([q for q in queries if "COUNT(" in q["sql"]]) == 1
+
+    def test_related_filter_lists_selected_only(
+        self,
+        admin_site_client: Client,
+        user,  # noqa: F811
+    ):
+        seed(3, user)
+        project = Project.objects.first()
+        response = admin_site_client.get(TASKS_URL, {"project__id__exact": project.pk})
+        cl = response.context["cl"]
+        [project_filter] = [f for f in cl.filter_specs if f.title == "project"]
+        assert project_filter.lookup_choices == [(project.pk, str(project))]
+        assert list(cl.result_list) == list(project.tasks.all())
+
+    def test_autocomplete(
+        self,
+        admin_site_client: Client,
+        project_1: Project,  # noqa: F811
+    ):
+        response = admin_site_client.get(
+            "/admin/autocomplete/",
+            {
+                "app_label": "tracker",
+                "model_name": "task",
+                "field_name": "project",
+                "term": "Project",
+            },
+        )
+        assert response.status_code == 200
+        assert response.json()["results"][0]["id"] == str(project_1.pk)
+
+    def test_exact_count_without_estimate(self, task_1: Task):  # noqa: F811
+        assert estimate_count(Task.objects.all()) is None
+        assert EstimatedCountPaginator(Task.objects.order_by("id"), 10).count == 1
+
+
+@pytest.mark.django_db
+class TestTaskAdminActions:
+    def test_change_status(
+        self,
+        admin_site_client: Client,
+        sprint_1: Sprint,  # noqa: F811
+        task_1: Task,  # noqa: F811
+    ):
+        with CaptureQueriesContext(connection) as ctx:
+            response = act(admin_site_client, "change_status", [task_1], status=2)
+        assert "Set 1 tasks to Done." in response.content.decode()
+        task_updates = [
+            q
+            for q in ctx.captured_queries
+            if q["sql"].startswith('UPDATE "tracker_task"')
+        ]
+        assert len(task_updates) == 1
+        task_1.refresh_from_db()
+        sprint_1.refresh_from_db()
+        assert task_1.status == 2
+        assert (sprint_1.todo_count, sprint_1.done_count) == (0, 1)
+
+    def test_reassign(
+        self,
+        admin_site_client: Client,
+        user,  # noqa: F811
+        task_1: Task,  # noqa: F811
+    ):
+        act(admin_site_client, "reassign", [task_1], assignee=user.pk)
+        task_1.refresh_from_db()
+        assert task_1.assignee == user
+
+        response = act(admin_site_client, "reassign", [task_1], assignee=999)
+        assert "User not found." in response.content.decode()
+
+    def test_move_to_sprint_and_backlog(
+        self,
+        admin_site_client: Client,
+        sprint_1: Sprint,  # noqa: F811
+        task_1: Task,  # noqa: F811
+    ):
+        other = Sprint.objects.create(
+            project=sprint_1.project,
+            name="Sprint 2",
+            start_date="2023-01-16",
+            end_date="2023-01-31",
+        )
+        act(admin_site_client, "move_to_sprint", [task_1], sprint=other.pk)
+        task_1.refresh_from_db()
+        other.refresh_from_db()
+        assert task_1.sprint == other
+        assert other.todo_count == 1
+
+        act(admin_site_client, "move_to_backlog", [task_1])
+        task_1.refresh_from_db()
+        other.refresh_from_db()
+        assert task_1.sprint is None
+        assert other.todo_count == 0
+
+    def test_move_to_sprint_rejected(
+        self,
+        admin_site_client: Client,
+        sprint_1: Sprint,  # noqa: F811
+        task_1: Task,  # noqa: F811
+    ):
+        foreign = Sprint.objects.create(
+            project=Project.objects.create(name="Project 2"),
+            name="Foreign",
+            start_date="2023-01-16",
+            end_date="2023-01-31",
+        )
+        response = act(admin_site_client, "move_to_sprint", [task_1], sprint=foreign.pk)
+        assert "Sprint belongs to another project." in response.content.decode()
+
+        foreign.project = sprint_1.project
+        foreign.status = SprintStatusChoices.COMPLETED
+        foreign.save()
+        response = act(admin_site_client, "move_to_sprint", [task_1], sprint=foreign.pk)
+        assert (
+            "Cannot add or move tasks to a closed sprint." in response.content.decode()
+        )
+
+        response = act(admin_site_client, "move_to_sprint", [task_1])
+        assert "Choose a sprint for this action." in response.content.decode()
+        task_1.refresh_from_db()
+        assert task_1.sprint == sprint_1
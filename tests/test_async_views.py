@@ -0,0 +1,94 @@
+import pytest
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import AccessToken
+
+from tests.fixtures import (  # noqa: F401
+    admin_client,
+    project_1,
+    sprint_1,
+    task_1,
+    user,
+)
+from tracker.models import Project, Sprint, Task
+
+
+@pytest.fixture
+def token_client(user):  # noqa: F811
+    client = APIClient()
+    client.credentials(HTTP_AUTHORIZATION=f"Bearer {AccessToken.for_user(user)}")
+    return client
+
+
+@pytest.mark.django_db
+class TestAsyncReadPath:
+    def test_task_list_matches_sync(
+        self,
+        token_client: APIClient,
+        admin_client: APIClient,  # noqa: F811
+        task_1: Task,  # noqa: F811
+    ):
+        response = token_client.get("/api/async/tasks/?status=0&page_size=1")
+        assert response.status_code == 200
+        assert response["Content-Type"] == "application/json"
+        expected = admin_client.get("/api/tasks/?status=0&page_size=1").json()
+        assert response.json()["results"] == expected["results"]
+        assert response.json()["next"] is None
+
+    def test_task_detail_matches_sync(
+        self,
+        token_client: APIClient,
+        admin_client: APIClient,  # noqa: F811
+        task_1: Task,  # noqa: F811
+    ):
+        response = token_client.get(f"/api/async/tasks/{task_1.id}/")
+        assert response.status_code == 200
+        assert response.json() == admin_client.get(f"/api/tasks/{task_1.id}/").json()
+
+    def test_sprint_board_matches_sync(
+        self,
+        token_client: APIClient,
+        admin_client: APIClient,  # noqa: F811
+        sprint_1: Sprint,  # noqa: F811
+        task_1: Task,  # noqa: F811
+    ):
+        response = token_client.get(f"/api/async/sprints/{sprint_1.id}/board/")
+        assert response.status_code == 200
+        expected = admin_client.get(f"/api/sprints/{sprint_1.id}/").json()
+        assert response.json() == expected
+        assert response.json()["tasks"][0]["id"] == task_1.id
+
+    def test_project_list_paginates(
+        self,
+        token_client: APIClient,
+        project_1: Project,  # noqa: F811
+    ):
+        Project.objects.create(name="Project 2")
+        response = token_client.get("/api/async/projects/?page_size=1")
+        assert response.status_code == 200
+        assert response.json()["results"][0]["name"] == "Project 2"
+
+        response = token_client.get(response.json()["next"])
+        assert response.json()["results"][0]["name"] == project_1.name
+
+    def test_fail_nonexistent_task(self, token_client: APIClient):
+        response = token_client.get("/api/async/tasks/999/")
+        assert response.status_code == 404
+
+    def test_fail_invalid_filter(self, token_client: APIClient):
+        response = token_client.get("/api/async/tasks/?due_date__gte=nope")
+        assert response.status_code == 400
+        assert "due_date__gte" in response.json()
+
+    def test_fail_unauthenticated(self, task_1: Task):  # noqa: F811
+        response = APIClient().get("/api/async/tasks/")
+        assert response.status_code == 401
+        assert response["WWW-Authenticate"].startswith("Bearer")
+
+    def test_fail_invalid_token(self):
+        client = APIClient()
+        client.credentials(HTTP_AUTHORIZATION="Bearer nope")
+        assert client.get("/api/async/tasks/").status_code == 401
+
+    def test_fail_method_not_allowed(self, token_client: APIClient):
+        response = token_client.post("/api/async/tasks/", {})
+        assert response.status_code == 405
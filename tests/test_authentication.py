@@ -0,0 +1,120 @@
+import pytest
+from django.core.cache import caches
+from rest_framework.test import APIClient
+
+from tests.fixtures import admin_user, user  # noqa: F401
+from tracker.authentication import TokenCache, token_cache
+
+
+@pytest.fixture(autouse=True)
+def clear_auth_caches(settings, tmp_path):
+    # Users are only cached in a cache shared between processes.
+    settings.CACHES = {
+        **settings.CACHES,
+        "auth": {
+            "BACKEND": "django.core.cache.backends.filebased.FileBasedCache",
+            "LOCATION": str(tmp_path),
+        },
+    }
+    settings.API_AUTH_CACHE_ALIAS = "auth"
+    token_cache.clear()
+    caches["auth"].clear()
+    yield
+    token_cache.clear()
+
+
+def token_client(username: str, password: str) -> APIClient:
+    client = APIClient()
+    response = client.post("/token/", {"username": username, "password": password})
+    assert response.status_code == 200
+    client.credentials(HTTP_AUTHORIZATION=f"Bearer {response.data['access']}")
+    return client
+
+
+@pytest.mark.django_db
+class TestCachedJWTAuthentication:
+    def test_user_loaded_once(
+        self,
+        admin_user,  # noqa: F811
+        django_assert_num_queries,
+    ):
+        client = token_client("test-admin", "tfiPgh-1rtbUi")
+        with django_assert_num_queries(1):
+            assert client.get("/api/cache/stats/").status_code == 200
+        with django_assert_num_queries(0):
+            assert client.get("/api/cache/stats/").status_code == 200
+
+    def test_process_local_cache_not_used(
+        self,
+        settings,
+        admin_user,  # noqa: F811
+        django_assert_num_queries,
+    ):
+        settings.API_AUTH_CACHE_ALIAS = "default"
+        client = token_client("test-admin", "tfiPgh-1rtbUi")
+        for _ in range(2):
+            with django_assert_num_queries(1):
+                assert client.get("/api/cache/stats/").status_code == 200
+
+    def test_token_verified_once(self, admin_user, monkeypatch):  # noqa: F811
+        client = token_client("test-admin", "tfiPgh-1rtbUi")
+        client.get("/api/cache/stats/")
+
+        def fail(*args, **kwargs):
+            raise AssertionError("token verified again")
+
+        monkeypatch.setattr(
+            "rest_framework_simplejwt.authentication.JWTAuthentication"
+            ".get_validated_token",
+            fail,
+        )
+        assert client.get("/api/cache/stats/").status_code == 200
+
+    def test_deactivated_user_rejected(
+        self,
+        user,  # noqa: F811
+        django_capture_on_commit_callbacks,
+    ):
+        client = token_client("test-user", "mAkfol-6yTeqa")
+        assert client.get("/api/projects/").status_code == 200
+
+        with django_capture_on_commit_callbacks(execute=True):
+            user.is_active = False
+            user.save()
+        assert client.get("/api/projects/").status_code == 401
+
+    def test_staff_change_applied(
+        self,
+        admin_user,  # noqa: F811
+        django_capture_on_commit_callbacks,
+    ):
+        client = token_client("test-admin", "tfiPgh-1rtbUi")
+        assert client.get("/api/cache/stats/").status_code == 200
+
+        with django_capture_on_commit_callbacks(execute=True):
+            admin_user.is_staff = False
+            admin_user.save()
+        assert client.get("/api/cache/stats/").status_code == 403
+
+    def test_fail_invalid_token(self):
+        client = APIClient()
+        client.credentials(HTTP_AUTHORIZATION="Bearer not-a-token")
+        assert client.get("/api/projects/").status_code == 401
+        assert client.get("/api/projects/").status_code == 401
+
+
+class TestTokenCache:
+    def test_expired_entries_dropped(self):
+        cache = TokenCache(max_size=10)
+        cache.set(b"old", "token", expires_at=0)
+        assert cache.get(b"old") is None
+
+    def test_bounded_lru(self):
+        cache = TokenCache(max_size=2)
+        cache.set(b"a", "A", expires_at=2**40)
+        cache.set(b"b", "B", expires_at=2**40)
+        cache.get(b"a")
+        cache.set(b"c", "C", expires_at=2**40)
+        assert cache.get(b"a") == "A"
+        assert cache.get(b"b") is None
+        assert cache.get(b"c") == "C"
@@ -0,0 +1,44 @@
+import pytest
+from django.db.models import F
+
+from benchmarks.endpoints import compare, discover_routes, run
+from benchmarks.seed import seed
+from tests.fixtures import admin_user  # noqa: F401
+from tracker.models import Task
+
+
+@pytest.mark.django_db
+class TestEndpointBenchmarks:
+    def test_seed_creates_requested_volumes(self):
+        counts = seed(projects=2, sprints=4, tasks=50, users=3, batch_size=20, log=str)
+        assert counts == {"users": 3, "projects": 2, "sprints": 4, "tasks": 50}
+        assert not Task.objects.exclude(project=F("sprint__project")).exists()
+
+    def test_routes_cover_urlconfs(self):
+        names = {route.name for route in discover_routes()}
+        assert {"task-list", "sprint-detail", "token_obtain_pair"} <= names
+        assert "async_sprint_board" in names
+
+    def test_run_reports_every_route(self, admin_user):  # noqa: F811
+        seed(projects=1, sprints=2, tasks=20, users=2, log=str)
+        report = run(admin_user, iterations=2, only=r"^(task-|sprint-|token_)")
+        results = {result["name"]: result for result in report["results"]}
+
+        assert report["meta"]["rows"]["tasks"] == 20
+        detail = results["task-detail"]
+        assert detail["status"] == 200
+        assert detail["queries"] > 0
+        assert detail["peak_memory_kb"] > 0
+        assert set(detail["latency_ms"]) >= {"p50", "p95", "p99"}
+        assert results["sprint-export"]["bytes"] > 0
+        assert results["token_obtain_pair"]["skipped"] == "GET not allowed"
+
+    def test_compare_flags_regressions(self):
+        before = {"results": [_result("task-list", p95=10, queries=3)]}
+        after = {"results": [_result("task-list", p95=20, queries=4)]}
+        assert len(compare(after, before, threshold=20)) == 2
+        assert compare(before, before, threshold=20) == []
+
+
+def _result(name, p95, queries):
+    return {"name": name, "queries": queries, "latency_ms": {"p95": p95}}
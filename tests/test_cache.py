@@ -0,0 +1,184 @@
+import pytest
+from django.core.cache import caches
+from rest_framework.test import APIClient
+
+from tests.fixtures import (  # noqa: F401
+    admin_client,
+    project_1,
+    sprint_1,
+    task_1,
+    user,
+    user_client,
+)
+from tracker.cache import cache_stats
+from tracker.models import Project, Sprint, Task, TaskStatusChoices
+
+
+@pytest.fixture(autouse=True)
+def response_cache(settings):
+    settings.API_CACHE_ENABLED = True
+    settings.API_CACHE_ALIAS = "tracker-tests"
+    settings.CACHES = {
+        **settings.CACHES,
+        "tracker-tests": {
+            "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+            "LOCATION": "tracker-tests",
+        },
+    }
+    caches["tracker-tests"].clear()
+    yield
+    caches["tracker-tests"].clear()
+
+
+@pytest.mark.django_db
+class TestResponseCache:
+    def test_hit_runs_no_queries(
+        self,
+        admin_client: APIClient,  # noqa: F811
+        task_1: Task,  # noqa: F811
+        django_assert_num_queries,
+    ):
+        first = admin_client.get("/api/tasks/")
+        with django_assert_num_queries(0):
+            second = admin_client.get("/api/tasks/")
+
+        assert second.status_code == 200
+        assert second.data == first.data
+        assert second["ETag"] == first["ETag"]
+        assert cache_stats()["hits"] == 1
+        assert cache_stats()["misses"] == 1
+
+    def test_hit_not_modified(
+        self,
+        admin_client: APIClient,  # noqa: F811
+        task_1: Task,  # noqa: F811
+    ):
+        etag = admin_client.get(f"/api/tasks/{task_1.id}/")["ETag"]
+        response = admin_client.get(f"/api/tasks/{task_1.id}/", HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == 304
+        assert cache_stats()["hits"] == 1
+
+    def test_keys_are_per_user(
+        self,
+        admin_client: APIClient,  # noqa: F811
+        user_client: APIClient,  # noqa: F811
+        project_1: Project,  # noqa: F811
+    ):
+        admin_client.get("/api/projects/")
+        user_client.get("/api/projects/")
+        assert cache_stats()["misses"] == 2
+        assert cache_stats()["hits"] == 0
+
+    def test_keys_include_query_string(
+        self,
+        admin_client: APIClient,  # noqa: F811
+        task_1: Task,  # noqa: F811
+    ):
+        admin_client.get("/api/tasks/")
+        response = admin_client.get("/api/tasks/?status=2")
+        assert response.data["results"] == []
+
+    def test_task_save_invalidates_tasks_and_sprints(
+        self,
+        admin_client: APIClient,  # noqa: F811
+        sprint_1: Sprint,  # noqa: F811
+        task_1: Task,  # noqa: F811
+        django_capture_on_commit_callbacks,
+    ):
+        admin_client.get(f"/api/tasks/{task_1.id}/")
+        admin_client.get(f"/api/sprints/{sprint_1.id}/")
+        with django_capture_on_commit_callbacks(execute=True):
+            task_1.title = "Changed"
+            task_1.save()
+
+        response = admin_client.get(f"/api/tasks/{task_1.id}/")
+        assert response.data["title"] == "Changed"
+        response = admin_client.get(f"/api/sprints/{sprint_1.id}/")
+        assert response.data["tasks"][0]["title"] == "Changed"
+        assert cache_stats()["hits"] == 0
+
+    def test_task_delete_invalidates(
+        self,
+        admin_client: APIClient,  # noqa: F811
+        task_1: Task,  # noqa: F811
+        django_capture_on_commit_callbacks,
+    ):
+        admin_client.get("/api/tasks/")
+        with django_capture_on_commit_callbacks(execute=True):
+            task_1.delete()
+        assert admin_client.get("/api/tasks/").data["results"] == []
+
+    def test_task_save_keeps_project_cache(
+        self,
+        admin_client: APIClient,  # noqa: F811
+        task_1: Task,  # noqa: F811
+        django_capture_on_commit_callbacks,
+    ):
+        admin_client.get("/api/projects/")
+        with django_capture_on_commit_callbacks(execute=True):
+            task_1.save()
+        admin_client.get("/api/projects/")
+        assert cache_stats()["hits"] == 1
+
+    def test_bulk_create_invalidates(
+        self,
+        admin_client: APIClient,  # noqa: F811
+        project_1: Project,  # noqa: F811
+        django_capture_on_commit_callbacks,
+    ):
+        admin_client.get("/api/tasks/")
+        with django_capture_on_commit_callbacks(execute=True):
+            response = admin_client.post(
+                "/api/tasks/bulk/",
+                [{"project": project_1.id, "title": "Bulk"}],
+                format="json",
+            )
+        assert response.status_code == 201
+        assert len(admin_client.get("/api/tasks/").data["results"]) == 1
+
+    def test_sprint_close_invalidates_tasks(
+        self,
+        admin_client: APIClient,  # noqa: F811
+        sprint_1: Sprint,  # noqa: F811
+        task_1: Task,  # noqa: F811
+        django_capture_on_commit_callbacks,
+    ):
+        admin_client.get(f"/api/tasks/{task_1.id}/")
+        with django_capture_on_commit_callbacks(execute=True):
+            admin_client.post(f"/api/sprints/{sprint_1.id}/close/")
+        assert admin_client.get(f"/api/tasks/{task_1.id}/").data["sprint"] is None
+
+    def test_disabled(
+        self,
+        admin_client: APIClient,  # noqa: F811
+        task_1: Task,  # noqa: F811
+        settings,
+    ):
+        settings.API_CACHE_ENABLED = False
+        admin_client.get("/api/tasks/")
+        Task.objects.filter(pk=task_1.pk).update(status=TaskStatusChoices.DONE)
+        response = admin_client.get("/api/tasks/")
+        assert response.data["results"][0]["status"] == TaskStatusChoices.DONE
+        assert cache_stats() == {"hits": 0, "misses": 0, "hit_ratio": None}
+
+
+@pytest.mark.django_db
+class TestCacheStats:
+    def test_ok(
+        self,
+        admin_client: APIClient,  # noqa: F811
+        project_1: Project,  # noqa: F811
+    ):
+        admin_client.get("/api/projects/")
+        admin_client.get("/api/projects/")
+        response = admin_client.get("/api/cache/stats/")
+        assert response.status_code == 200
+        assert response.data == {"hits": 1, "misses": 1, "hit_ratio": 0.5}
+
+    def test_fail_non_admin_user(self, user_client: APIClient):  # noqa: F811
+        response = user_client.get("/api/cache/stats/")
+        assert response.status_code == 403
+
+    def test_fail_unauthenticated(self):
+        response = APIClient().get("/api/cache/stats/")
+        assert response.status_code == 401
@@ -0,0 +1,167 @@
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+from rest_framework.test import APIClient
+
+from tests.fixtures import (  # noqa: F401
+    admin_client,
+    admin_user,
+    project_1,
+    sprint_1,
+    task_1,
+)
+from tracker.models import Project, Sprint, Task, TaskStatusChoices
+
+
+def counts(obj):
+    obj.refresh_from_db()
+    return obj.todo_count, obj.in_progress_count, obj.done_count
+
+
+@pytest.fixture
+def sprint_2(project_1: Project):  # noqa: F811
+    return Sprint.objects.create(
+        project=project_1,
+        name="Sprint 2",
+        start_date="2023-01-16",
+        end_date="2023-01-31",
+    )
+
+
+@pytest.mark.django_db
+class TestTaskCounters:
+    def test_single_task_changes(
+        self,
+        admin_client: APIClient,  # noqa: F811
+        project_1: Project,  # noqa: F811
+        sprint_1: Sprint,  # noqa: F811
+        sprint_2: Sprint,
+    ):
+        response = admin_client.post(
+            "/api/tasks/",
+            {"project": project_1.id, "sprint": sprint_1.id, "title": "A"},
+        )
+        task_id = response.data["id"]
+        assert counts(sprint_1) == counts(project_1) == (1, 0, 0)
+
+        admin_client.patch(
+            f"/api/tasks/{task_id}/", {"status": TaskStatusChoices.IN_PROGRESS}
+        )
+        assert counts(sprint_1) == counts(project_1) == (0, 1, 0)
+
+        admin_client.patch(f"/api/tasks/{task_id}/", {"sprint": sprint_2.id})
+        assert counts(sprint_1) == (0, 0, 0)
+        assert counts(sprint_2) == counts(project_1) == (0, 1, 0)
+
+        admin_client.delete(f"/api/tasks/{task_id}/")
+        assert counts(sprint_2) == counts(project_1) == (0, 0, 0)
+
+    def test_repeated_saves_count_once(
+        self,
+        sprint_1: Sprint,  # noqa: F811
+        task_1: Task,  # noqa: F811
+    ):
+        task_1.status = TaskStatusChoices.DONE
+        task_1.save()
+        task_1.save()
+        task_1.title = "Renamed"
+        task_1.save(update_fields=["title"])
+        assert counts(sprint_1) == (0, 0, 1)
+
+    def test_bulk_paths(
+        self,
+        admin_client: APIClient,  # noqa: F811
+        project_1: Project,  # noqa: F811
+        sprint_1: Sprint,  # noqa: F811
+    ):
+        response = admin_client.post(
+            "/api/tasks/bulk/",
+            [
+                {"project": project_1.id, "sprint": sprint_1.id, "title": "A"},
+                {"project": project_1.id, "title": "B", "status": 2},
+            ],
+            format="json",
+        )
+        first, second = (task["id"] for task in response.data)
+        assert counts(sprint_1) == (1, 0, 0)
+        assert counts(project_1) == (1, 0, 1)
+
+        admin_client.patch(
+            "/api/tasks/bulk/",
+            [{"id": first, "status": 1}, {"id": second, "sprint": sprint_1.id}],
+            format="json",
+        )
+        assert counts(sprint_1) == (0, 1, 1)
+        assert counts(project_1) == (0, 1, 1)
+
+        admin_client.delete("/api/tasks/bulk/", {"ids": [first, second]}, format="json")
+        assert counts(sprint_1) == counts(project_1) == (0, 0, 0)
+
+    def test_close_moves_counts(
+        self,
+        admin_client: APIClient,  # noqa: F811
+        sprint_1: Sprint,  # noqa: F811
+        sprint_2: Sprint,
+        task_1: Task,  # noqa: F811
+    ):
+        Task.objects.create(
+            project=task_1.project, sprint=sprint_1, title="Done", status=2
+        )
+        admin_client.post(
+            f"/api/sprints/{sprint_1.id}/close/", {"rollover_to": sprint_2.id}
+        )
+        assert counts(sprint_1) == (0, 0, 1)
+        assert counts(sprint_2) == (1, 0, 0)
+        assert counts(task_1.project) == (1, 0, 1)
+
+    def test_exposed_read_only(
+        self,
+        admin_client: APIClient,  # noqa: F811
+        sprint_1: Sprint,  # noqa: F811
+        task_1: Task,  # noqa: F811
+    ):
+        response = admin_client.patch(
+            f"/api/sprints/{sprint_1.id}/", {"name": "Renamed", "todo_count": 99}
+        )
+        assert response.status_code == 200
+        assert response.data["todo_count"] == 1
+        response = admin_client.get(f"/api/projects/{sprint_1.project_id}/")
+        assert response.data["todo_count"] == 1
+
+    def test_stale_save_keeps_counts(
+        self,
+        sprint_1: Sprint,  # noqa: F811
+        task_1: Task,  # noqa: F811
+    ):
+        stale = Sprint.objects.get(pk=sprint_1.pk)
+        Task.objects.create(project=task_1.project, sprint=sprint_1, title="B")
+        stale.name = "Renamed"
+        stale.save()
+        assert counts(sprint_1) == (2, 0, 0)
+        assert sprint_1.name == "Renamed"
+
+
+@pytest.mark.django_db
+def test_reconcile_task_counts(
+    admin_client: APIClient,  # noqa: F811
+    project_1: Project,  # noqa: F811
+    sprint_1: Sprint,  # noqa: F811
+    task_1: Task,  # noqa: F811
+):
+    Task.objects.filter(pk=task_1.pk).update(status=TaskStatusChoices.DONE)
+    Project.objects.update(in_progress_count=5)
+    etag = admin_client.get(f"/api/sprints/{sprint_1.id}/")["ETag"]
+
+    out = StringIO()
+    call_command("reconcile_task_counts", "--dry-run", stdout=out)
+    assert "Found 1 sprints and 1 projects" in out.getvalue()
+    assert counts(project_1) == (1, 5, 0)
+
+    call_command("reconcile_task_counts", stdout=out)
+    assert "Repaired 1 sprints and 1 projects" in out.getvalue()
+    assert counts(sprint_1) == counts(project_1) == (0, 0, 1)
+    # Repaired rows are served fresh, not from the cache or as 304.
+    response = admin_client.get(f"/api/sprints/{sprint_1.id}/", HTTP_IF_NONE_MATCH=etag)
+    assert response.status_code == 200
+    assert response.data["done_count"] == 1
@@ -0,0 +1,58 @@
+from types import SimpleNamespace
+from unittest.mock import patch
+
+import pytest
+from rest_framework.test import APIClient
+
+from tests.fixtures import admin_client, user, user_client  # noqa: F401
+from tracker.db import pool_stats
+
+
+class FakePool:
+    name = "pool-1"
+
+    def get_stats(self):
+        return {
+            "pool_min": 1,
+            "pool_max": 4,
+            "pool_size": 3,
+            "pool_available": 1,
+            "requests_waiting": 2,
+            "requests_num": 10,
+            "requests_queued": 4,
+            "requests_wait_ms": 50,
+        }
+
+
+class TestPoolStats:
+    def test_pooled(self):
+        connection = SimpleNamespace(pool=FakePool())
+        with patch("tracker.db.connections", {"default": connection}):
+            stats = pool_stats()
+        assert stats["pooled"] is True
+        assert stats["in_use"] == 2
+        assert stats["waiting"] == 2
+        assert stats["requests_queued"] == 4
+        assert stats["avg_wait_ms"] == 5.0
+
+    def test_not_pooled(self):
+        connection = SimpleNamespace(pool=None)
+        with patch("tracker.db.connections", {"default": connection}):
+            assert pool_stats() == {"alias": "default", "pooled": False}
+
+
+@pytest.mark.django_db
+class TestDatabasePoolStatsView:
+    def test_ok(self, admin_client: APIClient):  # noqa: F811
+        response = admin_client.get("/api/db/pool/")
+        assert response.status_code == 200
+        assert response.data["alias"] == "default"
+        assert "pooled" in response.data
+
+    def test_fail_non_admin_user(self, user_client: APIClient):  # noqa: F811
+        response = user_client.get("/api/db/pool/")
+        assert response.status_code == 403
+
+    def test_fail_unauthenticated(self):
+        response = APIClient().get("/api/db/pool/")
+        assert response.status_code == 401
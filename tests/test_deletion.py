@@ -0,0 +1,210 @@
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+from django.db import connection
+from django.test import Client
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+
+from tests.fixtures import (  # noqa: F401
+    admin_client,
+    admin_user,
+    project_1,
+    sprint_1,
+    task_1,
+    user,
+    user_client,
+)
+from tracker.deletion import _delete_batch, request_deletion, run_deletion
+from tracker.models import Deletion, Project, Sprint, Task, Tombstone
+
+
+@pytest.fixture
+def sprint_2(project_1: Project):  # noqa: F811
+    return Sprint.objects.create(
+        project=project_1,
+        name="Sprint 2",
+        start_date="2023-01-16",
+        end_date="2023-01-31",
+    )
+
+
+@pytest.fixture
+def tasks(project_1: Project, sprint_1: Sprint, sprint_2: Sprint):  # noqa: F811
+    return [
+        Task.objects.create(project=project_1, sprint=sprint, title=f"Task {i}")
+        for i, sprint in enumerate([sprint_1, sprint_1, sprint_2, sprint_2, None])
+    ]
+
+
+def tombstones(model):
+    return sorted(
+        Tombstone.objects.filter(model=model).values_list("object_id", flat=True)
+    )
+
+
+@pytest.mark.django_db
+class TestBackgroundDeletion:
+    def test_delete_hides_project(
+        self,
+        admin_client: APIClient,  # noqa: F811
+        project_1: Project,  # noqa: F811
+        sprint_1: Sprint,  # noqa: F811
+        tasks: list,
+    ):
+        response = admin_client.delete(f"/api/projects/{project_1.id}/")
+        assert response.status_code == 202
+        assert response.data["model"] == "project"
+        assert response.data["total_tasks"] == 5
+        assert response.data["deleted_tasks"] == 0
+
+        assert admin_client.get(f"/api/projects/{project_1.id}/").status_code == 404
+        assert admin_client.get(f"/api/sprints/{sprint_1.id}/").status_code == 404
+        assert admin_client.get("/api/projects/").data["results"] == []
+        response = admin_client.post(
+            "/api/tasks/", {"project": project_1.id, "title": "Late"}
+        )
+        assert response.status_code == 400
+        # Nothing is deleted yet, but sync clients already drop both.
+        assert Task.objects.count() == 5
+        assert tombstones("project") == [project_1.id]
+        assert tombstones("sprint") == sorted(
+            Sprint.all_objects.values_list("id", flat=True)
+        )
+
+    def test_delete_hides_tasks(
+        self,
+        settings,
+        admin_client: APIClient,  # noqa: F811
+        project_1: Project,  # noqa: F811
+        sprint_1: Sprint,  # noqa: F811
+        tasks: list,
+    ):
+        settings.API_SYNC_SETTLE_SECONDS = 0
+        admin_client.delete(f"/api/sprints/{sprint_1.id}/")
+        hidden = [task.id for task in tasks[:2]]
+        visible = [task.id for task in tasks[2:]]
+
+        response = admin_client.get("/api/tasks/")
+        assert sorted(task["id"] for task in response.data["results"]) == visible
+        response = admin_client.get("/api/tasks/search/", {"q": "Task"})
+        assert sorted(task["id"] for task in response.data["results"]) == visible
+        assert admin_client.get(f"/api/tasks/{hidden[0]}/").status_code == 404
+        response = admin_client.get("/api/sync/")
+        assert sorted(task["id"] for task in response.data["changes"]["tasks"]) == (
+            visible
+        )
+        response = admin_client.get(f"/api/projects/{project_1.id}/export/?type=ndjson")
+        assert len(b"".join(response.streaming_content).splitlines()) == 3
+
+        response = admin_client.patch(
+            "/api/tasks/bulk/", [{"id": hidden[0], "title": "Late"}], format="json"
+        )
+        assert response.status_code == 400
+        response = admin_client.delete(
+            "/api/tasks/bulk/", {"ids": hidden}, format="json"
+        )
+        assert response.status_code == 404
+        response = admin_client.post(
+            "/api/tasks/bulk/assign/",
+            {"filter": {"project": project_1.id}, "user": None},
+            format="json",
+        )
+        assert response.data == {"updated": 3}
+
+    def test_run_deletes_in_batches(
+        self,
+        project_1: Project,  # noqa: F811
+        tasks: list,
+    ):
+        deletion = request_deletion(project_1)
+        reported = []
+        with CaptureQueriesContext(connection) as ctx:
+            deletion = run_deletion(
+                deletion, 2, lambda d: reported.append(d.deleted_tasks)
+            )
+
+        assert reported == [2, 4, 5]
+        assert deletion.finished_at is not None
+        assert not Project.all_objects.exists()
+        assert not Sprint.all_objects.exists()
+        assert not Task.objects.exists()
+        assert tombstones("task") == [task.id for task in tasks]
+        # One tombstone per object, and no task loaded into the collector.
+        assert Tombstone.objects.count() == 1 + 2 + 5
+        selects = [q for q in ctx.captured_queries if 'FROM "tracker_task"' in q["sql"]]
+        assert len(selects) < 10
+
+    def test_sprint_deletion_keeps_project_counts(
+        self,
+        admin_client: APIClient,  # noqa: F811
+        project_1: Project,  # noqa: F811
+        sprint_1: Sprint,  # noqa: F811
+        tasks: list,
+    ):
+        admin_client.delete(f"/api/sprints/{sprint_1.id}/")
+        run_deletion(Deletion.objects.get())
+
+        project_1.refresh_from_db()
+        assert project_1.todo_count == 3
+        assert Task.objects.filter(project=project_1).count() == 3
+        assert not Sprint.all_objects.filter(pk=sprint_1.pk).exists()
+
+    def test_resumes_after_interruption(
+        self,
+        project_1: Project,  # noqa: F811
+        tasks: list,
+    ):
+        deletion = request_deletion(project_1)
+        assert _delete_batch(deletion, 3) == 3
+
+        deletion = run_deletion(deletion, 3)
+        assert deletion.deleted_tasks == deletion.total_tasks == 5
+        assert not Task.objects.exists()
+        # A finished deletion is not run again.
+        assert run_deletion(deletion).finished_at == deletion.finished_at
+
+    def test_command(self, project_1: Project, tasks: list):  # noqa: F811
+        request_deletion(project_1)
+        out = StringIO()
+        call_command("run_deletions", "--batch-size", "10", stdout=out)
+        assert "deleted 5 of 5 tasks" in out.getvalue()
+        assert "Finished 1 deletions" in out.getvalue()
+        assert not Project.all_objects.exists()
+
+    def test_progress(
+        self,
+        admin_client: APIClient,  # noqa: F811
+        user_client: APIClient,  # noqa: F811
+        project_1: Project,  # noqa: F811
+        tasks: list,
+    ):
+        deletion = request_deletion(project_1)
+        _delete_batch(deletion, 2)
+
+        response = admin_client.get(f"/api/deletions/{deletion.id}/")
+        assert response.status_code == 200
+        assert response.data["deleted_tasks"] == 2
+        assert response.data["finished_at"] is None
+        assert user_client.get(f"/api/deletions/{deletion.id}/").status_code == 403
+        assert admin_client.get("/api/deletions/999/").status_code == 404
+
+    def test_admin_delete(
+        self,
+        admin_user,  # noqa: F811
+        project_1: Project,  # noqa: F811
+        tasks: list,
+    ):
+        admin_user.is_superuser = True
+        admin_user.save()
+        client = Client()
+        client.force_login(admin_user)
+
+        url = f"/admin/tracker/project/{project_1.id}/delete/"
+        response = client.get(url)
+        assert response.status_code == 200
+        response = client.post(url, {"post": "yes"})
+        assert response.status_code == 302
+        assert Deletion.objects.get().object_id == project_1.id
+        assert Task.objects.count() == 5
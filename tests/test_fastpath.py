@@ -0,0 +1,158 @@
+from datetime import date
+
+import pytest
+from django.utils import timezone
+from rest_framework import serializers
+from rest_framework.test import APIClient
+
+from tests.fixtures import (  # noqa: F401
+    admin_client,
+    admin_user,
+    project_1,
+    sprint_1,
+    task_1,
+)
+from tracker import fastpath
+from tracker.fastpath import compile_plan
+from tracker.models import (
+    Project,
+    Sprint,
+    Task,
+    TaskPriorityChoices,
+    TaskStatusChoices,
+)
+from tracker.serializers import ProjectSerializer, SprintSerializer, TaskSerializer
+
+URLS = (
+    "/api/tasks/?page_size=500",
+    "/api/tasks/?page_size=2&ordering=updated_at",
+    "/api/tasks/?page_size=500&fields=id,title,assignee,due_date",
+    "/api/tasks/?page_size=500&status__in=0,2",
+    "/api/sprints/?page_size=500",
+    "/api/sprints/?page_size=500&fields=name,tasks.title,tasks.completed_at",
+    "/api/sprints/?page_size=500&exclude=tasks",
+    "/api/projects/?page_size=500",
+)
+
+
+@pytest.fixture
+def tasks(project_1: Project, sprint_1: Sprint, admin_user):  # noqa: F811
+    other = Sprint.objects.create(
+        project=project_1, name="Empty", start_date="2023-02-01", end_date="2023-02-15"
+    )
+    Project.objects.create(name="Project 2")
+    now = timezone.now()
+    return Task.objects.bulk_create(
+        [
+            Task(
+                project=project_1,
+                sprint=sprint_1,
+                assignee=admin_user,
+                title="Assigned",
+                description="With a description",
+                status=TaskStatusChoices.DONE,
+                priority=TaskPriorityChoices.HIGH,
+                completed_at=now,
+                due_date=date(2024, 2, 29),
+            ),
+            Task(project=project_1, sprint=sprint_1, title="Unassigned"),
+            Task(project=project_1, title="Backlog", due_date=date(2024, 1, 1)),
+            Task(project=project_1, sprint=other, title="Elsewhere", status=2),
+        ]
+    )
+
+
+def fetch_all(client, url):
+    results = []
+    while url:
+        data = client.get(url).json()
+        results.extend(data["results"])
+        url = data["next"]
+    return results
+
+
+@pytest.mark.django_db
+class TestFastListEquivalence:
+    @pytest.mark.parametrize("url", URLS)
+    def test_matches_model_serializers(
+        self,
+        settings,
+        admin_client: APIClient,  # noqa: F811
+        tasks,
+        url,
+    ):
+        settings.API_FAST_SERIALIZATION = False
+        expected = fetch_all(admin_client, url)
+        settings.API_FAST_SERIALIZATION = True
+        assert fetch_all(admin_client, url) == expected
+        assert expected
+
+    @pytest.mark.parametrize(
+        "url", ["/api/tasks/", "/api/sprints/?page_size=10", "/api/projects/"]
+    )
+    def test_same_etag(
+        self,
+        settings,
+        admin_client: APIClient,  # noqa: F811
+        tasks,
+        url,
+    ):
+        settings.API_FAST_SERIALIZATION = False
+        slow = admin_client.get(url)
+        settings.API_FAST_SERIALIZATION = True
+        fast = admin_client.get(url)
+        assert fast["ETag"] == slow["ETag"]
+        assert "Last-Modified" not in fast
+
+    def test_renders_serializer_output(self, tasks):
+        for serializer_class, model in (
+            (TaskSerializer, Task),
+            (SprintSerializer, Sprint),
+            (ProjectSerializer, Project),
+        ):
+            plan = compile_plan(serializer_class())
+            rows = list(model.objects.order_by("id").values(*plan.columns))
+            plan.load_nested(rows)
+            expected = serializer_class(model.objects.order_by("id"), many=True).data
+            assert plan.render(rows) == expected
+
+    def test_sprint_list_queries(
+        self,
+        admin_client: APIClient,  # noqa: F811
+        tasks,
+        django_assert_num_queries,
+    ):
+        with django_assert_num_queries(2):
+            admin_client.get("/api/sprints/")
+
+    def test_unsupported_serializer_falls_back(self):
+        class WithMethodField(serializers.ModelSerializer):
+            label = serializers.SerializerMethodField()
+
+            class Meta:
+                model = Task
+                fields = ("id", "label")
+
+            def get_label(self, task):
+                return str(task)
+
+        assert compile_plan(WithMethodField()) is None
+        assert compile_plan(TaskSerializer()) is not None
+
+    def test_plan_cache_is_bounded(self, settings):
+        settings.API_FAST_PLAN_CACHE_SIZE = 2
+        fastpath._plans.clear()
+        plans = []
+        for name in ("title", "status", "priority"):
+            serializer = TaskSerializer()
+            serializer.fields.pop(name)
+            plans.append(compile_plan(serializer))
+        assert len(fastpath._plans) == 2
+
+        # The most recent shapes are reused, the oldest one was dropped.
+        serializer = TaskSerializer()
+        serializer.fields.pop("priority")
+        assert compile_plan(serializer) is plans[2]
+        serializer = TaskSerializer()
+        serializer.fields.pop("title")
+        assert compile_plan(serializer) is not plans[0]
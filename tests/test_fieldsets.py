@@ -0,0 +1,160 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import AccessToken
+
+from tests.fixtures import (  # noqa: F401
+    admin_client,
+    admin_user,
+    project_1,
+    sprint_1,
+    task_1,
+)
+from tracker.fieldsets import parse_fieldset
+from tracker.models import Project, Sprint, Task
+
+
+def get(client, url):
+    with CaptureQueriesContext(connection) as ctx:
+        response = client.get(url)
+    return response, [query["sql"] for query in ctx.captured_queries]
+
+
+def test_parse_fieldset():
+    assert parse_fieldset(["id, title", "tasks.status,tasks.title"]) == {
+        "id": None,
+        "title": None,
+        "tasks": {"status": None, "title": None},
+    }
+    assert parse_fieldset(["tasks.title,tasks"]) == {"tasks": None}
+    assert parse_fieldset(["tasks,tasks.title"]) == {"tasks": None}
+
+
+@pytest.mark.django_db
+class TestSparseFieldsets:
+    def test_task_list_fields(
+        self,
+        admin_client: APIClient,  # noqa: F811
+        task_1: Task,  # noqa: F811
+    ):
+        response, queries = get(
+            admin_client, "/api/tasks/?fields=id,title,status,assignee"
+        )
+        assert response.status_code == 200
+        assert response.data["results"] == [
+            {
+                "id": task_1.id,
+                "title": task_1.title,
+                "status": task_1.status,
+                "assignee": None,
+            }
+        ]
+        assert len(queries) == 1
+        assert "description" not in queries[0]
+        # Only the visibility join, the assignee and sprint are not loaded.
+        assert '"auth_user"' not in queries[0]
+        assert '"tracker_sprint"."name"' not in queries[0]
+
+    def test_task_detail_exclude(
+        self,
+        admin_client: APIClient,  # noqa: F811
+        task_1: Task,  # noqa: F811
+    ):
+        full = admin_client.get(f"/api/tasks/{task_1.id}/").data
+        response, queries = get(
+            admin_client, f"/api/tasks/{task_1.id}/?exclude=description"
+        )
+        assert response.data == {k: v for k, v in full.items() if k != "description"}
+        assert "description" not in queries[0]
+
+    def test_cursor_pagination_with_fields(
+        self,
+        admin_client: APIClient,  # noqa: F811
+        project_1: Project,  # noqa: F811
+    ):
+        Task.objects.bulk_create(
+            Task(project=project_1, title=f"Task {i}") for i in range(3)
+        )
+        first = admin_client.get("/api/tasks/?fields=title&page_size=2").data
+        second = admin_client.get(first["next"]).data
+        titles = [task["title"] for task in first["results"] + second["results"]]
+        assert sorted(titles) == ["Task 0", "Task 1", "Task 2"]
+
+    def test_sprint_nested_fields(
+        self,
+        admin_client: APIClient,  # noqa: F811
+        task_1: Task,  # noqa: F811
+    ):
+        response, queries = get(
+            admin_client,
+            f"/api/sprints/{task_1.sprint_id}/?fields=id,name,tasks.id,tasks.title",
+        )
+        assert response.data == {
+            "id": task_1.sprint_id,
+            "name": "Sprint 1",
+            "tasks": [{"id": task_1.id, "title": task_1.title}],
+        }
+        assert len(queries) == 2
+        assert not any("description" in sql for sql in queries)
+
+    def test_sprint_without_tasks_skips_prefetch(
+        self,
+        admin_client: APIClient,  # noqa: F811
+        task_1: Task,  # noqa: F811
+    ):
+        response, queries = get(admin_client, "/api/sprints/?exclude=tasks")
+        assert "tasks" not in response.data["results"][0]
+        assert len(queries) == 1
+
+    def test_async_board_fields(
+        self,
+        admin_client: APIClient,  # noqa: F811
+        admin_user,  # noqa: F811
+        task_1: Task,  # noqa: F811
+    ):
+        expected = admin_client.get(
+            f"/api/sprints/{task_1.sprint_id}/?fields=name,tasks.status"
+        ).data
+        client = APIClient()
+        client.credentials(
+            HTTP_AUTHORIZATION=f"Bearer {AccessToken.for_user(admin_user)}"
+        )
+        response = client.get(
+            f"/api/async/sprints/{task_1.sprint_id}/board/?fields=name,tasks.status"
+        )
+        assert (
+            response.json()
+            == expected
+            == {"name": "Sprint 1", "tasks": [{"status": 0}]}
+        )
+
+    def test_etag_depends_on_fieldset(
+        self,
+        admin_client: APIClient,  # noqa: F811
+        task_1: Task,  # noqa: F811
+    ):
+        full = admin_client.get(f"/api/tasks/{task_1.id}/")
+        narrow = admin_client.get(f"/api/tasks/{task_1.id}/?fields=id")
+        assert full["ETag"] != narrow["ETag"]
+
+    def test_unknown_field(
+        self,
+        admin_client: APIClient,  # noqa: F811
+        sprint_1: Sprint,  # noqa: F811
+    ):
+        response = admin_client.get("/api/sprints/?fields=id,nope,tasks.bogus")
+        assert response.status_code == 400
+        assert response.data == {"fields": ["Unknown field: nope"]}
+
+    def test_writes_ignore_fieldset(
+        self,
+        admin_client: APIClient,  # noqa: F811
+        task_1: Task,  # noqa: F811
+    ):
+        response = admin_client.patch(
+            f"/api/tasks/{task_1.id}/?fields=id", {"title": "Renamed"}, format="json"
+        )
+        assert response.status_code == 200
+        assert response.data["title"] == "Renamed"
+        assert "description" in response.data
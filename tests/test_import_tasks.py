@@ -0,0 +1,178 @@
+import json
+from io import StringIO
+
+import pytest
+from django.core.management import CommandError, call_command
+
+from tests.fixtures import (  # noqa: F401
+    admin_client,
+    project_1,
+    sprint_1,
+    user,
+)
+from tracker.importer import TaskImporter
+from tracker.models import ImportCheckpoint, Project, Sprint, Task, TaskStatusChoices
+
+CSV_HEADER = "project,sprint,assignee,title,description,status,priority,due_date\n"
+
+
+def run_import(path, **options):
+    out = StringIO()
+    call_command("import_tasks", str(path), stdout=out, **options)
+    return out.getvalue()
+
+
+@pytest.mark.django_db
+class TestImportTasks:
+    def test_ok_csv(
+        self,
+        tmp_path,
+        project_1: Project,  # noqa: F811
+        sprint_1: Sprint,  # noqa: F811
+        user,  # noqa: F811
+    ):
+        path = tmp_path / "tasks.csv"
+        path.write_text(
+            CSV_HEADER
+            + f"{project_1.id},{sprint_1.id},{user.username},A,Desc,2,3,2023-01-05\n"
+            + f"{project_1.id},,{user.id},B,,,,\n"
+        )
+        output = run_import(path)
+        assert "Imported 2 tasks" in output
+        assert "rows/s" in output
+
+        a, b = Task.objects.order_by("title")
+        assert (a.sprint, a.assignee, a.status, a.priority) == (sprint_1, user, 2, 3)
+        assert str(a.due_date) == "2023-01-05"
+        assert (b.sprint, b.assignee, b.status) == (None, user, TaskStatusChoices.TO_DO)
+        project_1.refresh_from_db()
+        sprint_1.refresh_from_db()
+        assert (project_1.todo_count, project_1.done_count) == (1, 1)
+        assert (sprint_1.todo_count, sprint_1.done_count) == (0, 1)
+
+    def test_ok_ndjson(self, tmp_path, project_1: Project):  # noqa: F811
+        path = tmp_path / "tasks.ndjson"
+        path.write_text(
+            "\n".join(
+                json.dumps({"project": project_1.id, "title": f"T{i}"})
+                for i in range(25)
+            )
+        )
+        run_import(path, batch_size=4, transaction_size=10)
+        assert Task.objects.filter(project=project_1).count() == 25
+
+    def test_ok_roundtrip_export(
+        self,
+        tmp_path,
+        admin_client,  # noqa: F811
+        project_1: Project,  # noqa: F811
+        sprint_1: Sprint,  # noqa: F811
+    ):
+        Task.objects.bulk_create(
+            Task(project=project_1, sprint=sprint_1, title=f"T{i}") for i in range(5)
+        )
+        response = admin_client.get(f"/api/projects/{project_1.id}/export/")
+        path = tmp_path / "export.csv"
+        path.write_bytes(b"".join(response.streaming_content))
+
+        run_import(path)
+        assert Task.objects.filter(sprint=sprint_1).count() == 10
+
+    def test_fail_and_resume(self, tmp_path, project_1: Project):  # noqa: F811
+        path = tmp_path / "tasks.csv"
+        rows = [f"{project_1.id},,,T{i},,,,\n" for i in range(6)]
+        rows[4] = "999,,,Broken,,,,\n"
+        path.write_text(CSV_HEADER + "".join(rows))
+
+        with pytest.raises(CommandError, match="row 5: project"):
+            run_import(path, transaction_size=2)
+        assert Task.objects.count() == 4
+        checkpoint = ImportCheckpoint.objects.get(name=str(path))
+        assert checkpoint.position == 4
+
+        rows[4] = f"{project_1.id},,,T4,,,,\n"
+        path.write_text(CSV_HEADER + "".join(rows))
+        run_import(path, transaction_size=2, resume=True)
+
+        titles = sorted(Task.objects.values_list("title", flat=True))
+        assert titles == [f"T{i}" for i in range(6)]
+
+    def test_checkpoint_commits_with_rows(
+        self,
+        monkeypatch,
+        tmp_path,
+        project_1: Project,  # noqa: F811
+    ):
+        path = tmp_path / "tasks.csv"
+        path.write_text(
+            CSV_HEADER + "".join(f"{project_1.id},,,T{i},,,,\n" for i in range(6))
+        )
+        write_checkpoint = TaskImporter.write_checkpoint
+
+        def crash_at_4(importer, position):
+            write_checkpoint(importer, position)
+            if position == 4:
+                raise RuntimeError("crash")
+
+        monkeypatch.setattr(TaskImporter, "write_checkpoint", crash_at_4)
+        with pytest.raises(RuntimeError):
+            run_import(path, transaction_size=2)
+        # The chunk that crashed is rolled back together with its checkpoint.
+        assert Task.objects.count() == 2
+        assert ImportCheckpoint.objects.get().position == 2
+
+        monkeypatch.undo()
+        run_import(path, transaction_size=2, resume=True)
+        titles = sorted(Task.objects.values_list("title", flat=True))
+        assert titles == [f"T{i}" for i in range(6)]
+
+    def test_skip_invalid(
+        self,
+        tmp_path,
+        project_1: Project,  # noqa: F811
+        sprint_1: Sprint,  # noqa: F811
+    ):
+        other = Project.objects.create(name="Other")
+        path = tmp_path / "tasks.csv"
+        path.write_text(
+            CSV_HEADER
+            + f"{project_1.id},,,Ok,,,,\n"
+            + f"{other.id},{sprint_1.id},,Wrong sprint,,,,\n"
+            + f"{project_1.id},,,Bad status,,9,,\n"
+            + f"{project_1.id},,,Bad date,,,,2023-02-30\n"
+            + f"{project_1.id},,nobody,Bad user,,,,\n"
+        )
+        output = run_import(path, skip_invalid=True)
+        assert "skipped 4" in output
+        assert list(Task.objects.values_list("title", flat=True)) == ["Ok"]
+
+    def test_skip_invalid_ndjson(self, tmp_path, project_1: Project):  # noqa: F811
+        path = tmp_path / "tasks.ndjson"
+        path.write_text(
+            "\n".join(
+                [
+                    json.dumps({"project": project_1.id, "title": "Ok"}),
+                    '{"project": 1, "title": ',
+                    json.dumps([project_1.id, "List"]),
+                    json.dumps({"project": project_1.id, "title": 5}),
+                    json.dumps(
+                        {"project": project_1.id, "title": "D", "description": ["x"]}
+                    ),
+                    json.dumps({"project": project_1.id, "title": "A", "assignee": []}),
+                ]
+            )
+        )
+        with pytest.raises(CommandError, match="row 2: invalid JSON"):
+            run_import(path)
+
+        output = run_import(path, skip_invalid=True)
+        assert "skipped 5" in output
+        assert "Skipping row 3: expected an object, got list" in output
+        assert "Skipping row 4: title: expected a string" in output
+        assert list(Task.objects.values_list("title", flat=True)) == ["Ok"]
+
+    def test_fail_unknown_format(self, tmp_path):
+        path = tmp_path / "tasks.txt"
+        path.write_text("")
+        with pytest.raises(CommandError, match="--format"):
+            run_import(path)
@@ -0,0 +1,249 @@
+from datetime import timedelta
+from importlib import import_module
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from tests.fixtures import (  # noqa: F401
+    admin_client,
+    admin_user,
+    project_1,
+    sprint_1,
+    task_1,
+    user,
+    user_client,
+)
+from tracker import jobs
+from tracker.jobs import claim_job, enqueue, run_job
+from tracker.models import Job, JobStatusChoices, Project, Sprint, Task
+
+calls = []
+
+
+def flaky(fail_times):
+    calls.append(fail_times)
+    if len(calls) <= fail_times:
+        raise RuntimeError("Temporary failure")
+    return {"calls": len(calls)}
+
+
+@pytest.fixture
+def flaky_job(settings, monkeypatch):
+    settings.API_JOBS_MAX_ATTEMPTS = 3
+    settings.API_JOBS_RETRY_SECONDS = 10
+    monkeypatch.setitem(jobs.JOB_HANDLERS, "flaky", "tests.test_jobs.flaky")
+    # The worker imports the handler by name, maybe not as this module.
+    import_module("tests.test_jobs").calls.clear()
+
+
+def run_worker():
+    out = StringIO()
+    call_command("run_jobs", "--once", stdout=out)
+    return out.getvalue()
+
+
+@pytest.mark.django_db
+class TestJobs:
+    def test_run(self, task_1: Task):  # noqa: F811
+        Sprint.objects.update(todo_count=5)
+        job = enqueue("reconcile_task_counts")
+
+        assert "Ran 1 jobs" in run_worker()
+        job.refresh_from_db()
+        assert job.status == JobStatusChoices.SUCCEEDED
+        assert job.attempts == 1
+        assert job.result == {"sprint": 1, "project": 0}
+        assert job.finished_at is not None
+        assert Sprint.objects.get().todo_count == 1
+
+    def test_retries_with_backoff(self, flaky_job):
+        enqueue("flaky", {"fail_times": 2})
+
+        job = run_job(claim_job())
+        assert job.status == JobStatusChoices.QUEUED
+        assert "Temporary failure" in job.error
+        delay = job.run_at - timezone.now()
+        assert timedelta(seconds=8) < delay <= timedelta(seconds=10)
+        # Not due before its backoff passed.
+        assert claim_job() is None
+
+        Job.objects.update(run_at=timezone.now())
+        job = run_job(claim_job())
+        assert job.run_at - timezone.now() > timedelta(seconds=18)
+
+        Job.objects.update(run_at=timezone.now())
+        job = run_job(claim_job())
+        assert job.status == JobStatusChoices.SUCCEEDED
+        assert job.attempts == 3
+        assert job.result == {"calls": 3}
+        assert job.error == ""
+
+    def test_fails_after_max_attempts(self, flaky_job):
+        enqueue("flaky", {"fail_times": 5})
+        for _ in range(3):
+            job = run_job(claim_job())
+            Job.objects.filter(status=JobStatusChoices.QUEUED).update(
+                run_at=timezone.now()
+            )
+        assert job.status == JobStatusChoices.FAILED
+        assert job.attempts == 3
+        assert claim_job() is None
+
+    def test_claims_each_job_once(self):
+        first = enqueue("reconcile_task_counts")
+        second = enqueue("reconcile_task_counts")
+        assert claim_job().pk == first.pk
+        assert claim_job().pk == second.pk
+        assert claim_job() is None
+
+    def test_reclaims_stale_jobs(self, settings):
+        settings.API_JOBS_TIMEOUT_SECONDS = 60
+        enqueue("reconcile_task_counts")
+        claim_job()
+        assert claim_job() is None
+
+        Job.objects.update(started_at=timezone.now() - timedelta(minutes=2))
+        job = claim_job()
+        assert job.attempts == 2
+
+    def test_stale_job_fails_after_max_attempts(self, settings):
+        settings.API_JOBS_TIMEOUT_SECONDS = 60
+        job = enqueue("reconcile_task_counts")
+        Job.objects.update(
+            status=JobStatusChoices.RUNNING,
+            attempts=job.max_attempts,
+            started_at=timezone.now() - timedelta(minutes=2),
+        )
+        assert claim_job() is None
+        job.refresh_from_db()
+        assert job.status == JobStatusChoices.FAILED
+        assert job.attempts == job.max_attempts
+        assert "Timed out" in job.error
+        assert job.finished_at is not None
+
+    def test_unknown_job(self):
+        with pytest.raises(ValueError):
+            enqueue("missing")
+
+    def test_background_reconcile_command(self):
+        call_command("reconcile_task_counts", "--background", stdout=StringIO())
+        assert Job.objects.get().name == "reconcile_task_counts"
+
+    def test_project_deletion_runs_as_job(
+        self,
+        admin_client: APIClient,  # noqa: F811
+        project_1: Project,  # noqa: F811
+        task_1: Task,  # noqa: F811
+    ):
+        admin_client.delete(f"/api/projects/{project_1.id}/")
+        assert Job.objects.get().name == "delete"
+
+        run_worker()
+        assert Job.objects.get().result == {"deleted_tasks": 1}
+        assert not Project.all_objects.exists()
+        assert not Task.objects.exists()
+
+
+@pytest.mark.django_db
+class TestJobEndpoints:
+    def test_background_export(
+        self,
+        settings,
+        tmp_path,
+        admin_client: APIClient,  # noqa: F811
+        project_1: Project,  # noqa: F811
+        task_1: Task,  # noqa: F811
+    ):
+        settings.MEDIA_ROOT = tmp_path
+        response = admin_client.post(
+            f"/api/projects/{project_1.id}/export/?type=ndjson"
+        )
+        assert response.status_code == 202
+        job_id = response.data["id"]
+        assert response.data["status"] == JobStatusChoices.QUEUED
+        assert admin_client.get(f"/api/jobs/{job_id}/download/").status_code == 404
+
+        run_worker()
+        response = admin_client.get(f"/api/jobs/{job_id}/")
+        assert response.data["status"] == JobStatusChoices.SUCCEEDED
+        response = admin_client.get(f"/api/jobs/{job_id}/download/")
+        assert response.status_code == 200
+        assert response["Content-Type"] == "application/x-ndjson"
+        assert f"project-{project_1.id}-tasks" in response["Content-Disposition"]
+        content = b"".join(response.streaming_content).decode()
+        assert '"title": "Task 1"' in content
+
+    def test_background_export_by_user(
+        self,
+        settings,
+        tmp_path,
+        user_client: APIClient,  # noqa: F811
+        user,  # noqa: F811
+        project_1: Project,  # noqa: F811
+        sprint_1: Sprint,  # noqa: F811
+    ):
+        settings.MEDIA_ROOT = tmp_path
+        response = user_client.post(f"/api/sprints/{sprint_1.id}/export/")
+        assert response.status_code == 202
+        assert Job.objects.get().created_by == user
+
+        run_worker()
+        job_id = response.data["id"]
+        response = user_client.get(f"/api/jobs/{job_id}/download/")
+        assert response.status_code == 200
+        # Exporting does not open up the other writes.
+        response = user_client.delete(f"/api/projects/{project_1.id}/")
+        assert response.status_code == 403
+
+    def test_prune(
+        self,
+        settings,
+        tmp_path,
+        admin_client: APIClient,  # noqa: F811
+        project_1: Project,  # noqa: F811
+    ):
+        settings.MEDIA_ROOT = tmp_path
+        admin_client.post(f"/api/projects/{project_1.id}/export/")
+        queued = enqueue("reconcile_task_counts")
+        run_worker()
+        export = Job.objects.get(name="export_tasks")
+        recent = enqueue("reconcile_task_counts")
+        run_worker()
+        Job.objects.exclude(pk=recent.pk).update(
+            finished_at=timezone.now() - timedelta(days=8)
+        )
+        Job.objects.filter(pk=queued.pk).update(status=JobStatusChoices.QUEUED)
+        assert (tmp_path / export.result["file"]).exists()
+
+        out = StringIO()
+        call_command("prune_jobs", stdout=out)
+        assert "Pruned 1 jobs" in out.getvalue()
+        assert not (tmp_path / export.result["file"]).exists()
+        assert set(Job.objects.values_list("id", flat=True)) == {queued.pk, recent.pk}
+
+    def test_bad_export_type(
+        self,
+        admin_client: APIClient,  # noqa: F811
+        project_1: Project,  # noqa: F811
+    ):
+        response = admin_client.post(f"/api/projects/{project_1.id}/export/?type=xml")
+        assert response.status_code == 400
+        assert not Job.objects.exists()
+
+    def test_status_visible_to_owner_and_staff(
+        self,
+        admin_client: APIClient,  # noqa: F811
+        user_client: APIClient,  # noqa: F811
+        user,  # noqa: F811
+        admin_user,  # noqa: F811
+    ):
+        own = enqueue("reconcile_task_counts", user=user)
+        other = enqueue("reconcile_task_counts", user=admin_user)
+
+        assert user_client.get(f"/api/jobs/{own.id}/").status_code == 200
+        assert user_client.get(f"/api/jobs/{other.id}/").status_code == 404
+        assert admin_client.get(f"/api/jobs/{own.id}/").status_code == 200
+        assert APIClient().get(f"/api/jobs/{own.id}/").status_code == 401
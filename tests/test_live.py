@@ -0,0 +1,296 @@
+import asyncio
+import json
+import queue
+
+import pytest
+from asgiref.sync import async_to_sync, sync_to_async
+from django.db import connection
+from django.test import AsyncClient
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import AccessToken
+
+from tests.fixtures import (  # noqa: F401
+    admin_client,
+    admin_user,
+    project_1,
+    sprint_1,
+    task_1,
+    user,
+)
+from tracker import live
+from tracker.models import Project, Sprint, Task
+
+
+@pytest.fixture(autouse=True)
+def live_enabled(settings):
+    settings.API_LIVE_ENABLED = True
+    settings.API_LIVE_BROKER = "tracker.live.InMemoryBroker"
+    live.reset_broker()
+    yield
+    live.reset_broker()
+
+
+@pytest.fixture
+def auth_headers(user):  # noqa: F811
+    return {"Authorization": f"Bearer {AccessToken.for_user(user)}"}
+
+
+def parse(chunk):
+    chunk = chunk.decode() if isinstance(chunk, bytes) else chunk
+    lines = dict(line.split(": ", 1) for line in chunk.strip().splitlines())
+    return lines["event"], json.loads(lines["data"])
+
+
+def get(url, headers=None):
+    return async_to_sync(AsyncClient().get)(url, headers=headers)
+
+
+def listen(url, headers, write, events=1):
+    """Open the stream at ``url``, run ``write`` and return the next events."""
+
+    async def scenario():
+        response = await AsyncClient().get(url, headers=headers)
+        assert response.status_code == 200
+        assert response["Content-Type"] == "text/event-stream"
+        chunks = aiter(response.streaming_content)
+        assert b"retry:" in await anext(chunks)
+        await sync_to_async(write)()
+        # A missing event fails the test instead of hanging it.
+        received = [
+            parse(await asyncio.wait_for(anext(chunks), 5)) for _ in range(events)
+        ]
+        await chunks.aclose()
+        return received
+
+    return async_to_sync(scenario)()
+
+
+@pytest.mark.django_db
+class TestLiveEvents:
+    def test_task_events_reach_the_sprint_board(
+        self,
+        auth_headers: dict,
+        admin_client: APIClient,  # noqa: F811
+        sprint_1: Sprint,  # noqa: F811
+        task_1: Task,  # noqa: F811
+        django_capture_on_commit_callbacks,
+    ):
+        def write():
+            with django_capture_on_commit_callbacks(execute=True):
+                admin_client.patch(f"/api/tasks/{task_1.id}/", {"title": "Renamed"})
+                admin_client.delete(f"/api/tasks/{task_1.id}/")
+
+        (updated, data), (deleted, gone) = listen(
+            f"/api/live/sprints/{sprint_1.id}/", auth_headers, write, events=2
+        )
+        assert updated == "task.updated"
+        assert data["data"]["title"] == "Renamed"
+        assert data["data"] == {**data["data"], "id": task_1.id}
+        assert deleted == "task.deleted"
+        assert gone == {
+            "type": "task.deleted",
+            "id": task_1.id,
+            "sprint": sprint_1.id,
+            "project": sprint_1.project_id,
+        }
+        assert live.hub.subscriber_count() == 0
+
+    def test_moved_task_leaves_old_board(
+        self,
+        auth_headers: dict,
+        admin_client: APIClient,  # noqa: F811
+        sprint_1: Sprint,  # noqa: F811
+        task_1: Task,  # noqa: F811
+        django_capture_on_commit_callbacks,
+    ):
+        other = Sprint.objects.create(
+            project=sprint_1.project,
+            name="Sprint 2",
+            start_date="2023-01-16",
+            end_date="2023-01-31",
+        )
+
+        def write():
+            with django_capture_on_commit_callbacks(execute=True):
+                admin_client.patch(f"/api/tasks/{task_1.id}/", {"sprint": other.id})
+
+        [(event, data)] = listen(
+            f"/api/live/sprints/{sprint_1.id}/", auth_headers, write
+        )
+        assert event == "task.updated"
+        assert data["sprint"] == other.id
+
+    def test_bulk_create_and_close_reach_the_project(
+        self,
+        auth_headers: dict,
+        admin_client: APIClient,  # noqa: F811
+        project_1: Project,  # noqa: F811
+        sprint_1: Sprint,  # noqa: F811
+        task_1: Task,  # noqa: F811
+        django_capture_on_commit_callbacks,
+    ):
+        def write():
+            with django_capture_on_commit_callbacks(execute=True):
+                admin_client.post(
+                    "/api/tasks/bulk/",
+                    [{"project": project_1.id, "title": "Bulk"}],
+                    format="json",
+                )
+                admin_client.post(f"/api/sprints/{sprint_1.id}/close/")
+
+        (changed, data), (moved, summary) = listen(
+            f"/api/live/projects/{project_1.id}/", auth_headers, write, events=2
+        )
+        # One event for the whole bulk write, not one per task.
+        assert changed == "tasks.changed"
+        assert data == {
+            "type": "tasks.changed",
+            "sprints": [],
+            "projects": [project_1.id],
+            "count": 1,
+        }
+        assert moved == "tasks.moved"
+        assert summary["sprint"] == sprint_1.id
+        assert summary["count"] == 1
+
+    def test_slow_client_gets_resync(self, settings):
+        settings.API_LIVE_QUEUE_SIZE = 1
+        event = live.task_event(live.TASK_DELETED, Task(id=1, project_id=1))
+
+        async def scenario():
+            chunks = live.stream([live.project_channel(1)])
+            await anext(chunks)
+            for _ in range(3):
+                live.get_broker().publish(event)
+            received = await anext(chunks)
+            with pytest.raises(StopAsyncIteration):
+                await anext(chunks)
+            return received
+
+        assert async_to_sync(scenario)().startswith("event: resync")
+        assert live.hub.subscriber_count() == 0
+
+    def test_only_streams_listen(
+        self,
+        monkeypatch,
+        task_1: Task,  # noqa: F811
+        django_capture_on_commit_callbacks,
+    ):
+        started = []
+        monkeypatch.setattr(
+            live.InMemoryBroker, "start", lambda broker, deliver: started.append(broker)
+        )
+        with django_capture_on_commit_callbacks(execute=True):
+            task_1.title = "Renamed"
+            task_1.save()
+        assert started == []
+
+        async def scenario():
+            chunks = live.stream([live.sprint_channel(1)])
+            await anext(chunks)
+            await chunks.aclose()
+
+        async_to_sync(scenario)()
+        async_to_sync(scenario)()
+        assert started == [live.get_broker()]
+
+    def test_heartbeat(self, settings):
+        settings.API_LIVE_HEARTBEAT_SECONDS = 0
+
+        async def scenario():
+            chunks = live.stream([live.sprint_channel(1)])
+            await anext(chunks)
+            received = await anext(chunks)
+            await chunks.aclose()
+            return received
+
+        assert async_to_sync(scenario)() == ": keepalive\n\n"
+
+    @pytest.mark.django_db(transaction=True)
+    def test_stream_releases_database_connection(
+        self,
+        monkeypatch,
+        auth_headers: dict,
+        sprint_1: Sprint,  # noqa: F811
+    ):
+        # SQLite keeps in-memory test databases open on close(), so the
+        # release is observed on the connection wrapper.
+        released = []
+        close = connection.close
+
+        def spy():
+            released.append(connection.connection is not None)
+            close()
+
+        monkeypatch.setattr(connection, "close", spy)
+
+        async def scenario():
+            response = await AsyncClient().get(
+                f"/api/live/sprints/{sprint_1.id}/", headers=auth_headers
+            )
+            chunks = aiter(response.streaming_content)
+            await anext(chunks)
+            open_while_streaming = list(released)
+            await chunks.aclose()
+            return open_while_streaming
+
+        assert async_to_sync(scenario)() == [True]
+
+    def test_unknown_sprint(self, auth_headers: dict):
+        response = get("/api/live/sprints/999/", auth_headers)
+        assert response.status_code == 404
+
+    def test_requires_authentication(self, sprint_1: Sprint):  # noqa: F811
+        response = get(f"/api/live/sprints/{sprint_1.id}/")
+        assert response.status_code == 401
+
+    def test_not_served_under_wsgi(
+        self,
+        user,  # noqa: F811
+        sprint_1: Sprint,  # noqa: F811
+    ):
+        client = APIClient()
+        client.credentials(HTTP_AUTHORIZATION=f"Bearer {AccessToken.for_user(user)}")
+        response = client.get(f"/api/live/sprints/{sprint_1.id}/")
+        assert response.status_code == 501
+
+    def test_disabled(self, settings, auth_headers: dict, sprint_1: Sprint):  # noqa: F811
+        settings.API_LIVE_ENABLED = False
+        response = get(f"/api/live/sprints/{sprint_1.id}/", auth_headers)
+        assert response.status_code == 404
+
+
+class TestPostgresBroker:
+    def test_large_event_becomes_changed(self):
+        task = Task(id=1, project_id=2, sprint_id=3)
+        broker = live.PostgresBroker()
+        event = live.task_event(live.TASK_UPDATED, task, {"title": "Small"})
+        assert json.loads(broker.payload(event)) == json.loads(json.dumps(event))
+
+        event = live.task_event(live.TASK_UPDATED, task, {"title": "x" * 8000})
+        assert json.loads(broker.payload(event)) == {
+            "type": live.TASKS_CHANGED,
+            "sprints": [3],
+            "projects": [2],
+            "count": 1,
+            "channels": ["project:2", "sprint:3"],
+        }
+
+    @pytest.mark.skipif(
+        connection.vendor != "postgresql", reason="LISTEN/NOTIFY is PostgreSQL only"
+    )
+    @pytest.mark.django_db(transaction=True)
+    def test_delivers_between_connections(self):
+        received = queue.Queue()
+        broker = live.PostgresBroker()
+        broker.start(received.put)
+        event = live.task_event(live.TASK_DELETED, Task(id=1, project_id=1))
+        # The listener may not be subscribed yet when the first event goes out.
+        for _ in range(50):
+            broker.publish(event)
+            try:
+                assert received.get(timeout=0.1) == event
+                return
+            except queue.Empty:
+                pass
+        pytest.fail("No event received.")
@@ -0,0 +1,161 @@
+import re
+import time
+
+import pytest
+from django.test import Client
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import AccessToken
+
+from tests.fixtures import (  # noqa: F401
+    admin_client,
+    admin_user,
+    project_1,
+    sprint_1,
+    task_1,
+    user,
+    user_client,
+)
+from tracker.fastpath import RowPlan
+from tracker.metrics import Histogram, reset_metrics
+from tracker.models import Task
+
+
+@pytest.fixture(autouse=True)
+def clean_metrics(settings):
+    settings.API_METRICS_ENABLED = True
+    reset_metrics()
+    yield
+    reset_metrics()
+
+
+def server_timing(response):
+    return {
+        name: entry
+        for name, _, entry in (
+            item.strip().partition(";") for item in response["Server-Timing"].split(",")
+        )
+    }
+
+
+@pytest.mark.django_db
+class TestRequestMetrics:
+    def test_server_timing_header(
+        self,
+        admin_client: APIClient,  # noqa: F811
+        task_1: Task,  # noqa: F811
+        django_assert_num_queries,
+    ):
+        with django_assert_num_queries(1):
+            response = admin_client.get("/api/tasks/")
+
+        timing = server_timing(response)
+        assert set(timing) == {"db", "serialize", "auth", "total"}
+        assert 'desc="1 queries"' in timing["db"]
+        assert float(re.search(r"dur=([\d.]+)", timing["total"])[1]) > 0
+
+    def test_fast_list_render_is_timed(
+        self,
+        monkeypatch,
+        admin_client: APIClient,  # noqa: F811
+        task_1: Task,  # noqa: F811
+    ):
+        render = RowPlan.render
+
+        def slow_render(plan, rows):
+            time.sleep(0.01)
+            return render(plan, rows)
+
+        monkeypatch.setattr(RowPlan, "render", slow_render)
+        response = admin_client.get("/api/tasks/")
+
+        timing = server_timing(response)
+        assert float(re.search(r"dur=([\d.]+)", timing["serialize"])[1]) >= 10
+
+    def test_metrics_histograms_per_action(
+        self,
+        admin_client: APIClient,  # noqa: F811
+        task_1: Task,  # noqa: F811
+    ):
+        admin_client.get("/api/tasks/")
+        admin_client.get("/api/tasks/")
+        admin_client.get(f"/api/tasks/{task_1.id}/")
+
+        response = admin_client.get("/metrics")
+        assert response.status_code == 200
+        assert response["Content-Type"].startswith("text/plain")
+        body = response.content.decode()
+        assert "# TYPE tracker_request_duration_seconds histogram" in body
+        assert (
+            'tracker_request_duration_seconds_count{view="task-list",action="list"} 2'
+            in body
+        )
+        assert (
+            'tracker_request_queries_bucket{view="task-detail",action="retrieve",'
+            'le="1"} 1' in body
+        )
+        assert (
+            'tracker_request_serializer_duration_seconds_count{view="task-list"' in body
+        )
+        assert 'view="metrics"' not in body
+
+    def test_async_views_are_instrumented(
+        self,
+        admin_client: APIClient,  # noqa: F811
+        admin_user,  # noqa: F811
+        task_1: Task,  # noqa: F811
+    ):
+        # The async views authenticate the token themselves.
+        client = APIClient()
+        client.credentials(
+            HTTP_AUTHORIZATION=f"Bearer {AccessToken.for_user(admin_user)}"
+        )
+        response = client.get(f"/api/async/tasks/{task_1.id}/")
+        assert response.status_code == 200
+        assert "db;dur=" in response["Server-Timing"]
+        body = admin_client.get("/metrics").content.decode()
+        assert 'view="async_task_detail",action="get"' in body
+
+    def test_server_timing_staff_only(
+        self,
+        user_client: APIClient,  # noqa: F811
+    ):
+        assert "Server-Timing" not in user_client.get("/api/sprints/")
+        assert "Server-Timing" not in APIClient().get("/api/tasks/")
+
+    def test_metrics_restricted(
+        self,
+        settings,
+        admin_user,  # noqa: F811
+    ):
+        settings.API_METRICS_ALLOWED_IPS = "10.0.0.5,10.0.0.6"
+        client = Client(REMOTE_ADDR="10.0.0.5")
+        assert client.get("/metrics").status_code == 200
+        client = Client(REMOTE_ADDR="203.0.113.9")
+        assert client.get("/metrics").status_code == 403
+        client.force_login(admin_user)
+        assert client.get("/metrics").status_code == 200
+
+    def test_disabled(self, settings, admin_user):  # noqa: F811
+        settings.API_METRICS_ENABLED = False
+        client = APIClient()
+        client.force_authenticate(admin_user)
+
+        assert "Server-Timing" not in client.get("/api/tasks/")
+        assert client.get("/metrics").status_code == 404
+
+
+def test_histogram_render():
+    histogram = Histogram("latency_seconds", "Latency.", (0.1, 1))
+    histogram.observe(("task-list", "list"), 0.05)
+    histogram.observe(("task-list", "list"), 0.5)
+    histogram.observe(("task-list", "list"), 3)
+
+    assert histogram.render().splitlines() == [
+        "# HELP latency_seconds Latency.",
+        "# TYPE latency_seconds histogram",
+        'latency_seconds_bucket{view="task-list",action="list",le="0.1"} 1',
+        'latency_seconds_bucket{view="task-list",action="list",le="1"} 2',
+        'latency_seconds_bucket{view="task-list",action="list",le="+Inf"} 3',
+        'latency_seconds_sum{view="task-list",action="list"} 3.55',
+        'latency_seconds_count{view="task-list",action="list"} 3',
+    ]
@@ -0,0 +1,97 @@
+import os
+
+import pytest
+from rest_framework.test import APIClient
+
+from tests.fixtures import (  # noqa: F401
+    admin_client,
+    project_1,
+    sprint_1,
+    task_1,
+    user,
+    user_client,
+)
+from tracker.models import Task
+
+
+@pytest.fixture
+def profiling(settings, tmp_path):
+    settings.API_PROFILE_DIR = str(tmp_path)
+    settings.API_PROFILE_SAMPLE_RATE = 1.0
+    settings.API_PROFILE_SLOW_MS = 0
+    return settings
+
+
+@pytest.mark.django_db
+class TestRequestProfiling:
+    def test_sampled_request_is_stored(
+        self,
+        profiling,
+        admin_client: APIClient,  # noqa: F811
+        task_1: Task,  # noqa: F811
+    ):
+        assert admin_client.get("/api/tasks/").status_code == 200
+
+        profiles = admin_client.get("/api/profiles/").json()
+        assert len(profiles) == 1
+        summary = profiles[0]
+        assert summary["view"] == "task-list"
+        assert summary["action"] == "list"
+        assert summary["trigger"] == "sampled"
+        assert summary["query_count"] >= 1
+
+        profile = admin_client.get(f"/api/profiles/{summary['id']}/").json()
+        assert profile["profile"]["type"] == "cprofile"
+        assert "list" in profile["profile"]["stats"]
+        assert any("tracker_task" in query["sql"] for query in profile["queries"])
+        assert profile["explain"]
+        assert profile["explain"][0]["plan"]
+
+    def test_slow_request_is_stored(
+        self,
+        profiling,
+        admin_client: APIClient,  # noqa: F811
+        task_1: Task,  # noqa: F811
+    ):
+        profiling.API_PROFILE_SAMPLE_RATE = 0
+        profiling.API_PROFILE_SLOW_MS = 1
+        profiling.API_PROFILE_STACK_INTERVAL_MS = 1
+        admin_client.get(f"/api/tasks/{task_1.id}/")
+
+        profiles = admin_client.get("/api/profiles/").json()
+        assert [profile["trigger"] for profile in profiles] == ["slow"]
+        profile = admin_client.get(f"/api/profiles/{profiles[0]['id']}/").json()
+        assert profile["profile"]["type"] == "stack"
+
+    def test_fast_request_is_not_stored(
+        self,
+        profiling,
+        admin_client: APIClient,  # noqa: F811
+        task_1: Task,  # noqa: F811
+    ):
+        profiling.API_PROFILE_SAMPLE_RATE = 0
+        profiling.API_PROFILE_SLOW_MS = 60_000
+        admin_client.get("/api/tasks/")
+        assert admin_client.get("/api/profiles/").json() == []
+
+    def test_ring_buffer_is_bounded(
+        self,
+        profiling,
+        admin_client: APIClient,  # noqa: F811
+        task_1: Task,  # noqa: F811
+    ):
+        profiling.API_PROFILE_MAX_ENTRIES = 2
+        for _ in range(3):
+            admin_client.get(f"/api/tasks/{task_1.id}/")
+
+        # The listing request itself is profiled too.
+        profiles = admin_client.get("/api/profiles/").json()
+        assert len(profiles) == 2
+        assert len(os.listdir(profiling.API_PROFILE_DIR)) == 2
+
+    def test_staff_only(self, profiling, user_client: APIClient):  # noqa: F811
+        assert user_client.get("/api/profiles/").status_code == 403
+
+    def test_unknown_profile(self, profiling, admin_client: APIClient):  # noqa: F811
+        assert admin_client.get("/api/profiles/missing/").status_code == 404
+        assert admin_client.get("/api/profiles/..%2Fsecret/").status_code == 404
@@ -1,8 +1,21 @@
+import csv
+import io
+import json
+
 import pytest
+from django.db import connection
 from rest_framework.test import APIClient
 
-from tests.fixtures import admin_client, project_1, user, user_client  # noqa: F401
-from tracker.models import Project
+from tests.fixtures import (  # noqa: F401
+    admin_client,
+    project_1,
+    sprint_1,
+    task_1,
+    user,
+    user_client,
+)
+from tracker.export import _rows
+from tracker.models import Project, Task
 
 
 @pytest.mark.django_db
@@ -10,9 +23,9 @@ class TestGetProjects:
     def test_ok(self, admin_client: APIClient, project_1: Project):  # noqa: F811
         response = admin_client.get("/api/projects/")
         assert response.status_code == 200
-        assert len(response.data) == 1
-        assert response.data[0]["name"] == project_1.name
-        assert response.data[0]["description"] == project_1.description
+        assert len(response.data["results"]) == 1
+        assert response.data["results"][0]["name"] == project_1.name
+        assert response.data["results"][0]["description"] == project_1.description
 
     def test_fail_unauthenticated(self):
         client = APIClient()
@@ -136,3 +149,124 @@ class TestUpdateProject:
         response = admin_client.put(f"/api/projects/{project_1.id}/", data)
         assert response.status_code == 400
         assert "name" in response.data
+
+
+@pytest.mark.django_db
+class TestExportProjectTasks:
+    def _content(self, response) -> str:
+        assert response.streaming
+        return b"".join(response.streaming_content).decode()
+
+    def test_ok_csv(
+        self,
+        user_client: APIClient,  # noqa: F811
+        project_1: Project,  # noqa: F811
+        task_1: Task,  # noqa: F811
+    ):
+        Task.objects.create(project=Project.objects.create(name="Other"), title="X")
+        response = user_client.get(f"/api/projects/{project_1.id}/export/")
+        assert response.status_code == 200
+        assert response["Content-Type"] == "text/csv"
+        assert f"project-{project_1.id}-tasks.csv" in response["Content-Disposition"]
+
+        rows = list(csv.DictReader(io.StringIO(self._content(response))))
+        assert len(rows) == 1
+        assert rows[0]["id"] == str(task_1.id)
+        assert rows[0]["title"] == task_1.title
+        assert rows[0]["sprint"] == str(task_1.sprint_id)
+        assert rows[0]["assignee"] == ""
+
+    def test_ok_ndjson_matches_api(
+        self,
+        admin_client: APIClient,  # noqa: F811
+        project_1: Project,  # noqa: F811
+        task_1: Task,  # noqa: F811
+    ):
+        response = admin_client.get(f"/api/projects/{project_1.id}/export/?type=ndjson")
+        assert response.status_code == 200
+        assert response["Content-Type"] == "application/x-ndjson"
+
+        rows = [json.loads(line) for line in self._content(response).splitlines()]
+        detail = admin_client.get(f"/api/tasks/{task_1.id}/").json()
+        assert rows == [detail]
+
+    def test_ok_many_rows(
+        self,
+        admin_client: APIClient,  # noqa: F811
+        project_1: Project,  # noqa: F811
+    ):
+        Task.objects.bulk_create(
+            Task(project=project_1, title=f"Task {i}") for i in range(2500)
+        )
+        response = admin_client.get(f"/api/projects/{project_1.id}/export/?type=ndjson")
+        lines = self._content(response).splitlines()
+        assert len(lines) == 2500
+        assert len({json.loads(line)["id"] for line in lines}) == 2500
+
+    @pytest.mark.django_db(transaction=True)
+    def test_reads_in_a_transaction(self, task_1: Task):  # noqa: F811
+        rows = _rows(Task.objects.all())
+        assert not connection.in_atomic_block
+        next(rows)
+        # Keeps the PostgreSQL cursor from being materialized WITH HOLD.
+        assert connection.in_atomic_block
+        list(rows)
+        assert not connection.in_atomic_block
+
+    def test_fail_too_many_rows(
+        self,
+        settings,
+        admin_client: APIClient,  # noqa: F811
+        project_1: Project,  # noqa: F811
+        task_1: Task,  # noqa: F811
+    ):
+        settings.API_EXPORT_SYNC_MAX_ROWS = 0
+        response = admin_client.get(f"/api/projects/{project_1.id}/export/")
+        assert response.status_code == 400
+        assert "POST" in response.data["error"]
+        response = admin_client.post(f"/api/projects/{project_1.id}/export/")
+        assert response.status_code == 202
+
+    def test_fail_unknown_type(
+        self,
+        admin_client: APIClient,  # noqa: F811
+        project_1: Project,  # noqa: F811
+    ):
+        response = admin_client.get(f"/api/projects/{project_1.id}/export/?type=xml")
+        assert response.status_code == 400
+
+    def test_fail_nonexistent_project(self, admin_client: APIClient):  # noqa: F811
+        response = admin_client.get("/api/projects/999/export/")
+        assert response.status_code == 404
+
+    def test_fail_unauthenticated(self, project_1: Project):  # noqa: F811
+        client = APIClient()
+        response = client.get(f"/api/projects/{project_1.id}/export/")
+        assert response.status_code == 401
+
+
+@pytest.mark.django_db
+class TestConditionalGetProjects:
+    def test_list_not_modified(
+        self,
+        admin_client: APIClient,  # noqa: F811
+        project_1: Project,  # noqa: F811
+    ):
+        response = admin_client.get("/api/projects/")
+        assert response.data["results"][0]["updated_at"]
+        response = admin_client.get(
+            "/api/projects/", HTTP_IF_NONE_MATCH=response["ETag"]
+        )
+        assert response.status_code == 304
+
+    def test_detail_modified_after_update(
+        self,
+        admin_client: APIClient,  # noqa: F811
+        project_1: Project,  # noqa: F811
+    ):
+        url = f"/api/projects/{project_1.id}/"
+        etag = admin_client.get(url)["ETag"]
+        admin_client.patch(url, {"name": "Renamed"})
+        response = admin_client.get(url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == 200
+        assert response.data["name"] == "Renamed"
@@ -0,0 +1,108 @@
+from importlib import import_module
+
+import pytest
+from django.test import Client
+from rest_framework.test import APIClient
+
+from tests.fixtures import (  # noqa: F401
+    admin_client,
+    admin_user,
+    project_1,
+    user,
+    user_client,
+)
+from tracker import search
+from tracker.models import Project, Task, TaskStatusChoices
+
+
+@pytest.fixture
+def tasks(project_1: Project):  # noqa: F811
+    other = Project.objects.create(name="Project 2")
+    return {
+        "description": Task.objects.create(
+            project=project_1, title="Session bug", description="Login times out"
+        ),
+        "title": Task.objects.create(
+            project=project_1, title="Fix login timeout", description=""
+        ),
+        "done": Task.objects.create(
+            project=project_1,
+            title="Login page",
+            status=TaskStatusChoices.DONE,
+        ),
+        "other_project": Task.objects.create(project=other, title="Login audit"),
+        "unrelated": Task.objects.create(project=project_1, title="Refactor"),
+    }
+
+
+def result_ids(response):
+    assert response.status_code == 200, response.data
+    return [task["id"] for task in response.data["results"]]
+
+
+@pytest.mark.django_db
+class TestTaskSearch:
+    def test_ranks_title_matches_first(
+        self,
+        user_client: APIClient,  # noqa: F811
+        tasks: dict,
+    ):
+        response = user_client.get("/api/tasks/search/", {"q": "login time"})
+        assert result_ids(response) == [tasks["title"].id, tasks["description"].id]
+        first, second = response.data["results"]
+        assert first["rank"] > second["rank"]
+        assert first["title"] == "Fix login timeout"
+
+    def test_scoped_and_filtered(
+        self,
+        user_client: APIClient,  # noqa: F811
+        project_1: Project,  # noqa: F811
+        tasks: dict,
+    ):
+        response = user_client.get(
+            "/api/tasks/search/", {"q": "login", "project": project_1.id}
+        )
+        assert set(result_ids(response)) == {
+            tasks["description"].id,
+            tasks["title"].id,
+            tasks["done"].id,
+        }
+        response = user_client.get(
+            "/api/tasks/search/",
+            {"q": "login", "project": project_1.id, "status": TaskStatusChoices.DONE},
+        )
+        assert result_ids(response) == [tasks["done"].id]
+
+    def test_page_size(
+        self,
+        user_client: APIClient,  # noqa: F811
+        tasks: dict,
+    ):
+        response = user_client.get("/api/tasks/search/", {"q": "login", "page_size": 2})
+        assert len(result_ids(response)) == 2
+
+    def test_fail_without_query(
+        self,
+        user_client: APIClient,  # noqa: F811
+    ):
+        response = user_client.get("/api/tasks/search/")
+        assert response.status_code == 400
+        assert "q" in response.data
+
+    def test_fail_unauthenticated(self):
+        response = APIClient().get("/api/tasks/search/", {"q": "login"})
+        assert response.status_code == 401
+
+    def test_admin_search(self, admin_user, tasks: dict):  # noqa: F811
+        admin_user.is_superuser = True
+        admin_user.save()
+        client = Client()
+        client.force_login(admin_user)
+        response = client.get("/admin/tracker/task/", {"q": "timeout"})
+        assert response.status_code == 200
+        assert list(response.context["cl"].result_list) == [tasks["title"]]
+
+
+def test_query_matches_index_expression():
+    migration = import_module("tracker.migrations.0008_task_search_index")
+    assert migration.SEARCH_INDEX.expressions[0] == search.search_vector()
@@ -1,14 +1,20 @@
+from io import StringIO
+
 import pytest
+from django.core.management import call_command
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
 from rest_framework.test import APIClient
 
 from tests.fixtures import (  # noqa: F401
     admin_client,
     project_1,
     sprint_1,
+    task_1,
     user,
     user_client,
 )
-from tracker.models import Project, Sprint, SprintStatusChoices
+from tracker.models import Project, Sprint, SprintStatusChoices, Task, TaskStatusChoices
 
 
 @pytest.mark.django_db
@@ -17,9 +23,9 @@ class TestGetSprints:
         # Create a sprint for the project
         response = admin_client.get("/api/sprints/")
         assert response.status_code == 200
-        assert len(response.data) == 1
-        assert response.data[0]["name"] == sprint_1.name
-        assert response.data[0]["status"] == sprint_1.status
+        assert len(response.data["results"]) == 1
+        assert response.data["results"][0]["name"] == sprint_1.name
+        assert response.data["results"][0]["status"] == sprint_1.status
 
     def test_fail_unauthenticated(self):
         client = APIClient()
@@ -31,6 +37,59 @@ class TestGetSprints:
         assert response.status_code == 200
 
 
+@pytest.mark.django_db
+class TestSprintQueryCount:
+    def _seed(self, project: Project, sprints: int, tasks_per_sprint: int):
+        created = Sprint.objects.bulk_create(
+            Sprint(
+                project=project,
+                name=f"Sprint {i}",
+                start_date="2023-01-01",
+                end_date="2023-01-15",
+            )
+            for i in range(sprints)
+        )
+        Task.objects.bulk_create(
+            Task(project=project, sprint=sprint, title=f"Task {sprint.id}-{i}")
+            for sprint in created
+            for i in range(tasks_per_sprint)
+        )
+
+    def _count_list_queries(self, client: APIClient) -> int:
+        with CaptureQueriesContext(connection) as ctx:
+            response = client.get("/api/sprints/?page_size=500")
+        assert response.status_code == 200
+        return len(ctx.captured_queries)
+
+    def test_list_query_count_is_flat(
+        self,
+        admin_client: APIClient,  # noqa: F811
+        project_1: Project,  # noqa: F811
+    ):
+        self._seed(project_1, sprints=5, tasks_per_sprint=2)
+        small = self._count_list_queries(admin_client)
+
+        self._seed(project_1, sprints=300, tasks_per_sprint=3)
+        large = self._count_list_queries(admin_client)
+
+        assert small == large
+
+    def test_detail_prefetches_tasks(
+        self,
+        admin_client: APIClient,  # noqa: F811
+        sprint_1: Sprint,  # noqa: F811
+        django_assert_num_queries,
+    ):
+        Task.objects.bulk_create(
+            Task(project_id=sprint_1.project_id, sprint=sprint_1, title=f"Task {i}")
+            for i in range(20)
+        )
+        with django_assert_num_queries(2):
+            response = admin_client.get(f"/api/sprints/{sprint_1.id}/")
+        assert response.status_code == 200
+        assert len(response.data["tasks"]) == 20
+
+
 @pytest.mark.django_db
 class TestGetSprintDetail:
     def test_ok(self, admin_client: APIClient, sprint_1: Sprint):  # noqa: F811
@@ -168,3 +227,251 @@ class TestUpdateSprint:
         response = admin_client.patch(f"/api/sprints/{sprint_1.id}/", data)
         assert response.status_code == 400
         assert "name" in response.data
+
+
+@pytest.mark.django_db
+class TestCloseSprint:
+    @pytest.fixture
+    def sprint_2(self, project_1: Project):  # noqa: F811
+        return Sprint.objects.create(
+            project=project_1,
+            name="Sprint 2",
+            start_date="2023-01-16",
+            end_date="2023-01-31",
+        )
+
+    @pytest.fixture
+    def done_task(self, sprint_1: Sprint):  # noqa: F811
+        return Task.objects.create(
+            project_id=sprint_1.project_id,
+            sprint=sprint_1,
+            title="Done",
+            status=TaskStatusChoices.DONE,
+        )
+
+    def test_ok_rollover_to_backlog(
+        self,
+        admin_client: APIClient,  # noqa: F811
+        sprint_1: Sprint,  # noqa: F811
+        task_1: Task,  # noqa: F811
+        done_task: Task,
+    ):
+        response = admin_client.post(f"/api/sprints/{sprint_1.id}/close/")
+        assert response.status_code == 200
+        assert response.data["moved_tasks"] == 1
+        assert response.data["rollover_to"] is None
+
+        sprint_1.refresh_from_db()
+        task_1.refresh_from_db()
+        done_task.refresh_from_db()
+        assert sprint_1.status == SprintStatusChoices.COMPLETED
+        assert task_1.sprint is None
+        assert done_task.sprint == sprint_1
+
+    def test_ok_rollover_to_sprint(
+        self,
+        admin_client: APIClient,  # noqa: F811
+        sprint_1: Sprint,  # noqa: F811
+        sprint_2: Sprint,
+        task_1: Task,  # noqa: F811
+        done_task: Task,
+    ):
+        data = {"rollover_to": sprint_2.id}
+        response = admin_client.post(f"/api/sprints/{sprint_1.id}/close/", data)
+        assert response.status_code == 200
+        assert response.data["rollover_to"] == sprint_2.id
+
+        task_1.refresh_from_db()
+        assert task_1.sprint == sprint_2
+        assert list(sprint_1.tasks.all()) == [done_task]
+
+    def test_moves_tasks_in_one_update(
+        self,
+        admin_client: APIClient,  # noqa: F811
+        sprint_1: Sprint,  # noqa: F811
+        sprint_2: Sprint,
+    ):
+        Task.objects.bulk_create(
+            Task(project_id=sprint_1.project_id, sprint=sprint_1, title=f"Task {i}")
+            for i in range(50)
+        )
+        with CaptureQueriesContext(connection) as ctx:
+            response = admin_client.post(
+                f"/api/sprints/{sprint_1.id}/close/", {"rollover_to": sprint_2.id}
+            )
+        assert response.status_code == 200
+        assert response.data["moved_tasks"] == 50
+        updates = [q for q in ctx.captured_queries if q["sql"].startswith("UPDATE")]
+        # The tasks, the sprint status and the counters of both sprints.
+        assert len(updates) == 4
+        assert sprint_2.tasks.count() == 50
+
+    def test_fail_rollover_to_closed_sprint(
+        self,
+        admin_client: APIClient,  # noqa: F811
+        sprint_1: Sprint,  # noqa: F811
+        sprint_2: Sprint,
+    ):
+        sprint_2.status = SprintStatusChoices.COMPLETED
+        sprint_2.save()
+        data = {"rollover_to": sprint_2.id}
+        response = admin_client.post(f"/api/sprints/{sprint_1.id}/close/", data)
+        assert response.status_code == 400
+        assert "Cannot add or move tasks to a closed sprint." in str(response.data)
+
+    def test_fail_rollover_to_other_project(
+        self,
+        admin_client: APIClient,  # noqa: F811
+        sprint_1: Sprint,  # noqa: F811
+    ):
+        other = Sprint.objects.create(
+            project=Project.objects.create(name="Project 2"),
+            name="Other",
+            start_date="2023-01-16",
+            end_date="2023-01-31",
+        )
+        data = {"rollover_to": other.id}
+        response = admin_client.post(f"/api/sprints/{sprint_1.id}/close/", data)
+        assert response.status_code == 400
+
+    def test_fail_already_closed(
+        self,
+        admin_client: APIClient,  # noqa: F811
+        sprint_1: Sprint,  # noqa: F811
+    ):
+        sprint_1.status = SprintStatusChoices.COMPLETED
+        sprint_1.save()
+        response = admin_client.post(f"/api/sprints/{sprint_1.id}/close/")
+        assert response.status_code == 400
+
+    def test_fail_non_admin_user(
+        self,
+        user_client: APIClient,  # noqa: F811
+        sprint_1: Sprint,  # noqa: F811
+    ):
+        response = user_client.post(f"/api/sprints/{sprint_1.id}/close/")
+        assert response.status_code == 403
+
+
+@pytest.mark.django_db
+class TestCloseExpiredSprints:
+    def test_closes_only_expired_sprints(
+        self,
+        project_1: Project,  # noqa: F811
+        sprint_1: Sprint,  # noqa: F811
+        task_1: Task,  # noqa: F811
+    ):
+        future = Sprint.objects.create(
+            project=project_1,
+            name="Future",
+            start_date="2999-01-01",
+            end_date="2999-01-15",
+        )
+        call_command("close_expired_sprints", batch_size=1, stdout=StringIO())
+
+        sprint_1.refresh_from_db()
+        future.refresh_from_db()
+        task_1.refresh_from_db()
+        assert sprint_1.status == SprintStatusChoices.COMPLETED
+        assert future.status == SprintStatusChoices.PLANNED
+        assert task_1.sprint is None
+
+    def test_rollover_to_next_sprint(
+        self,
+        project_1: Project,  # noqa: F811
+        sprint_1: Sprint,  # noqa: F811
+        task_1: Task,  # noqa: F811
+    ):
+        future = Sprint.objects.create(
+            project=project_1,
+            name="Future",
+            start_date="2999-01-01",
+            end_date="2999-01-15",
+        )
+        call_command("close_expired_sprints", to_next=True, stdout=StringIO())
+
+        task_1.refresh_from_db()
+        assert task_1.sprint == future
+
+
+@pytest.mark.django_db
+class TestExportSprintTasks:
+    def test_ok(
+        self,
+        admin_client: APIClient,  # noqa: F811
+        sprint_1: Sprint,  # noqa: F811
+        task_1: Task,  # noqa: F811
+    ):
+        Task.objects.create(project_id=sprint_1.project_id, title="Backlog")
+        response = admin_client.get(f"/api/sprints/{sprint_1.id}/export/")
+        assert response.status_code == 200
+        lines = b"".join(response.streaming_content).decode().splitlines()
+        assert len(lines) == 2
+        assert lines[1].startswith(f"{task_1.id},")
+
+    def test_does_not_load_tasks(
+        self,
+        admin_client: APIClient,  # noqa: F811
+        sprint_1: Sprint,  # noqa: F811
+        task_1: Task,  # noqa: F811
+        django_assert_num_queries,
+    ):
+        with django_assert_num_queries(2):
+            response = admin_client.get(f"/api/sprints/{sprint_1.id}/export/")
+            b"".join(response.streaming_content)
+
+
+@pytest.mark.django_db
+class TestConditionalGetSprints:
+    def test_detail_not_modified(
+        self,
+        admin_client: APIClient,  # noqa: F811
+        sprint_1: Sprint,  # noqa: F811
+        task_1: Task,  # noqa: F811
+    ):
+        url = f"/api/sprints/{sprint_1.id}/"
+        etag = admin_client.get(url)["ETag"]
+        response = admin_client.get(url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == 304
+
+    def test_task_update_invalidates_sprint(
+        self,
+        admin_client: APIClient,  # noqa: F811
+        sprint_1: Sprint,  # noqa: F811
+        task_1: Task,  # noqa: F811
+    ):
+        detail_etag = admin_client.get(f"/api/sprints/{sprint_1.id}/")["ETag"]
+        list_etag = admin_client.get("/api/sprints/")["ETag"]
+        task_1.status = TaskStatusChoices.DONE
+        task_1.save()
+
+        response = admin_client.get(
+            f"/api/sprints/{sprint_1.id}/", HTTP_IF_NONE_MATCH=detail_etag
+        )
+        assert response.status_code == 200
+        response = admin_client.get("/api/sprints/", HTTP_IF_NONE_MATCH=list_etag)
+        assert response.status_code == 200
+
+    def test_task_delete_invalidates_sprint(
+        self,
+        admin_client: APIClient,  # noqa: F811
+        sprint_1: Sprint,  # noqa: F811
+        task_1: Task,  # noqa: F811
+    ):
+        etag = admin_client.get(f"/api/sprints/{sprint_1.id}/")["ETag"]
+        task_1.delete()
+        response = admin_client.get(
+            f"/api/sprints/{sprint_1.id}/", HTTP_IF_NONE_MATCH=etag
+        )
+        assert response.status_code == 200
+        assert response.data["tasks"] == []
+
+    def test_close_bumps_updated_at(
+        self,
+        admin_client: APIClient,  # noqa: F811
+        sprint_1: Sprint,  # noqa: F811
+    ):
+        before = sprint_1.updated_at
+        admin_client.post(f"/api/sprints/{sprint_1.id}/close/")
+        sprint_1.refresh_from_db()
+        assert sprint_1.updated_at > before
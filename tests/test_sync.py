@@ -0,0 +1,211 @@
+from datetime import timedelta
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+from django.db import connection
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from tests.fixtures import (  # noqa: F401
+    admin_client,
+    project_1,
+    sprint_1,
+    task_1,
+    user,
+    user_client,
+)
+from tracker import sync as sync_module
+from tracker.models import Project, Sprint, Task, Tombstone
+from tracker.sync import make_token
+
+
+@pytest.fixture(autouse=True)
+def no_settle(settings):
+    settings.API_SYNC_SETTLE_SECONDS = 0
+
+
+def sync(client, token=None, **params):
+    if token:
+        params["since"] = token
+    response = client.get("/api/sync/", params)
+    assert response.status_code == 200, response.data
+    return response.data
+
+
+def ids(data, key):
+    return [row["id"] for row in data["changes"][key]]
+
+
+@pytest.mark.django_db
+class TestSync:
+    def test_initial_sync(
+        self,
+        user_client: APIClient,  # noqa: F811
+        task_1: Task,  # noqa: F811
+    ):
+        data = sync(user_client)
+        assert ids(data, "projects") == [task_1.project_id]
+        assert ids(data, "sprints") == [task_1.sprint_id]
+        assert data["changes"]["tasks"] == [
+            user_client.get(f"/api/tasks/{task_1.id}/").data
+        ]
+        assert "tasks" not in data["changes"]["sprints"][0]
+        assert data["deleted"] == {"projects": [], "sprints": [], "tasks": []}
+        assert data["has_more"] is False
+
+    def test_only_changes_since_token(
+        self,
+        user_client: APIClient,  # noqa: F811
+        admin_client: APIClient,  # noqa: F811
+        task_1: Task,  # noqa: F811
+        project_1: Project,  # noqa: F811
+    ):
+        token = sync(user_client)["sync_token"]
+        assert sync(user_client, token)["changes"] == {
+            "projects": [],
+            "sprints": [],
+            "tasks": [],
+        }
+
+        other = Task.objects.create(project=project_1, title="New")
+        admin_client.patch(f"/api/tasks/{task_1.id}/", {"title": "Renamed"})
+        data = sync(user_client, token)
+        assert ids(data, "tasks") == [other.id, task_1.id]
+        assert data["changes"]["tasks"][1]["title"] == "Renamed"
+        # The new task changed the project's counters, the rename changed none.
+        assert ids(data, "projects") == [project_1.id]
+        assert data["changes"]["projects"][0]["todo_count"] == 2
+        assert ids(data, "sprints") == []
+
+    def test_deletes_are_tombstones(
+        self,
+        user_client: APIClient,  # noqa: F811
+        admin_client: APIClient,  # noqa: F811
+        task_1: Task,  # noqa: F811
+    ):
+        token = sync(user_client)["sync_token"]
+        admin_client.delete(f"/api/sprints/{task_1.sprint_id}/")
+
+        # The sprint is gone at once, its tasks once the deletion ran.
+        data = sync(user_client, token)
+        assert data["deleted"] == {
+            "projects": [],
+            "sprints": [task_1.sprint_id],
+            "tasks": [],
+        }
+        call_command("run_deletions", stdout=StringIO())
+        data = sync(user_client, data["sync_token"])
+        assert data["deleted"] == {
+            "projects": [],
+            "sprints": [],
+            "tasks": [task_1.id],
+        }
+        data = sync(user_client, data["sync_token"])
+        assert data["deleted"] == {"projects": [], "sprints": [], "tasks": []}
+
+    def test_initial_sync_skips_old_tombstones(
+        self,
+        user_client: APIClient,  # noqa: F811
+        task_1: Task,  # noqa: F811
+    ):
+        task_1.delete()
+        token = sync(user_client)["sync_token"]
+        assert sync(user_client, token)["deleted"]["tasks"] == []
+
+    def test_pages_with_stable_tie_break(
+        self,
+        user_client: APIClient,  # noqa: F811
+        project_1: Project,  # noqa: F811
+    ):
+        created = Task.objects.bulk_create(
+            Task(project=project_1, title=f"Task {i}") for i in range(5)
+        )
+        # Same timestamp for every row, the id breaks the tie.
+        Task.objects.update(updated_at=timezone.now() - timedelta(minutes=1))
+
+        seen, token, has_more = [], None, True
+        while has_more:
+            data = sync(user_client, token, limit=2)
+            seen += ids(data, "tasks")
+            token, has_more = data["sync_token"], data["has_more"]
+        assert seen == [task.id for task in created]
+
+    def test_settle_window(
+        self,
+        settings,
+        user_client: APIClient,  # noqa: F811
+        task_1: Task,  # noqa: F811
+    ):
+        settings.API_SYNC_SETTLE_SECONDS = 60
+        assert ids(sync(user_client), "tasks") == []
+        Task.objects.update(updated_at=timezone.now() - timedelta(minutes=2))
+        assert ids(sync(user_client), "tasks") == [task_1.id]
+
+    def test_waits_for_open_transactions(
+        self,
+        monkeypatch,
+        user_client: APIClient,  # noqa: F811
+        task_1: Task,  # noqa: F811
+    ):
+        started = timezone.now() - timedelta(minutes=1)
+        monkeypatch.setattr(sync_module, "oldest_transaction_start", lambda: started)
+        assert ids(sync(user_client), "tasks") == []
+        Task.objects.update(updated_at=started - timedelta(seconds=1))
+        assert ids(sync(user_client), "tasks") == [task_1.id]
+
+    def test_hold_back_is_capped(
+        self,
+        settings,
+        monkeypatch,
+        caplog,
+        user_client: APIClient,  # noqa: F811
+        task_1: Task,  # noqa: F811
+    ):
+        settings.API_SYNC_MAX_HOLD_SECONDS = 60
+        started = timezone.now() - timedelta(hours=1)
+        monkeypatch.setattr(sync_module, "oldest_transaction_start", lambda: started)
+        Task.objects.update(updated_at=timezone.now() - timedelta(minutes=2))
+        assert ids(sync(user_client), "tasks") == [task_1.id]
+        assert "API_SYNC_MAX_HOLD_SECONDS" in caplog.text
+
+    def test_invalid_and_expired_tokens(
+        self,
+        user_client: APIClient,  # noqa: F811
+    ):
+        response = user_client.get("/api/sync/", {"since": "garbage"})
+        assert response.status_code == 400
+
+        expired = make_token({}, timezone.now() - timedelta(days=31))
+        response = user_client.get("/api/sync/", {"since": expired})
+        assert response.status_code == 410
+        assert response.data["detail"].code == "sync_token_expired"
+
+    def test_requires_authentication(self):
+        assert APIClient().get("/api/sync/").status_code == 401
+
+    def test_sync_queries(
+        self,
+        user_client: APIClient,  # noqa: F811
+        sprint_1: Sprint,  # noqa: F811
+        django_assert_num_queries,
+    ):
+        token = sync(user_client)["sync_token"]
+        # One query per model and one for the tombstones, plus the open
+        # transactions on PostgreSQL.
+        with django_assert_num_queries(4 + (connection.vendor == "postgresql")):
+            sync(user_client, token)
+
+
+@pytest.mark.django_db
+def test_prune_tombstones(task_1: Task):  # noqa: F811
+    task_id = task_1.id
+    task_1.delete()
+    old = Tombstone.objects.create(
+        model="task", object_id=0, deleted_at=timezone.now() - timedelta(days=40)
+    )
+    out = StringIO()
+    call_command("prune_tombstones", stdout=out)
+    assert "Pruned 1 tombstones" in out.getvalue()
+    assert not Tombstone.objects.filter(pk=old.pk).exists()
+    assert Tombstone.objects.filter(model="task", object_id=task_id).exists()
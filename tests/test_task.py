@@ -1,4 +1,10 @@
+import time
+from unittest.mock import patch
+
 import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.utils.http import http_date
 from rest_framework.test import APIClient
 
 from tests.fixtures import (  # noqa: F401
@@ -10,7 +16,17 @@ from tests.fixtures import (  # noqa: F401
     user,
     user_client,
 )
-from tracker.models import Project, Sprint, SprintStatusChoices, Task, TaskStatusChoices
+from tracker.models import (
+    Project,
+    Sprint,
+    SprintStatusChoices,
+    Task,
+    TaskPriorityChoices,
+    TaskStatusChoices,
+    Tombstone,
+)
+from tracker.pagination import TrackerCursorPagination
+from tracker.serializers import TaskSerializer
 
 
 @pytest.mark.django_db
@@ -19,9 +35,9 @@ class TestGetTasks:
         # Create a task for the project
         response = admin_client.get("/api/tasks/")
         assert response.status_code == 200
-        assert len(response.data) == 1
-        assert response.data[0]["title"] == task_1.title
-        assert response.data[0]["status"] == task_1.status
+        assert len(response.data["results"]) == 1
+        assert response.data["results"][0]["title"] == task_1.title
+        assert response.data["results"][0]["status"] == task_1.status
 
     def test_fail_unauthenticated(self):
         client = APIClient()
@@ -33,6 +49,152 @@ class TestGetTasks:
         assert response.status_code == 200
 
 
+@pytest.mark.django_db
+class TestPaginateTasks:
+    def _create_tasks(self, project: Project, count: int):
+        return Task.objects.bulk_create(
+            Task(project=project, title=f"Task {i}") for i in range(count)
+        )
+
+    def test_pages_cover_all_tasks_once(
+        self,
+        admin_client: APIClient,  # noqa: F811
+        project_1: Project,  # noqa: F811
+    ):
+        tasks = self._create_tasks(project_1, 7)
+        seen = []
+        url = "/api/tasks/?page_size=3"
+        while url:
+            response = admin_client.get(url)
+            assert response.status_code == 200
+            assert "count" not in response.data
+            seen.extend(item["id"] for item in response.data["results"])
+            url = response.data["next"]
+
+        assert sorted(seen) == sorted(task.id for task in tasks)
+        assert len(seen) == len(set(seen))
+
+    def test_newest_first(
+        self,
+        admin_client: APIClient,  # noqa: F811
+        project_1: Project,  # noqa: F811
+    ):
+        tasks = self._create_tasks(project_1, 3)
+        response = admin_client.get("/api/tasks/")
+        assert response.status_code == 200
+        assert [item["id"] for item in response.data["results"]] == sorted(
+            (task.id for task in tasks), reverse=True
+        )
+
+    def test_page_size_capped(
+        self,
+        admin_client: APIClient,  # noqa: F811
+        project_1: Project,  # noqa: F811
+    ):
+        self._create_tasks(project_1, 5)
+        with patch.object(TrackerCursorPagination, "max_page_size", 2):
+            response = admin_client.get("/api/tasks/?page_size=100")
+        assert response.status_code == 200
+        assert len(response.data["results"]) == 2
+        assert response.data["next"] is not None
+
+    def test_fail_invalid_cursor(self, admin_client: APIClient):  # noqa: F811
+        response = admin_client.get("/api/tasks/?cursor=not-a-cursor")
+        assert response.status_code == 404
+
+
+@pytest.mark.django_db
+class TestFilterTasks:
+    @pytest.fixture
+    def board(self, project_1: Project, sprint_1: Sprint, user: User):  # noqa: F811 # type: ignore
+        other = Project.objects.create(name="Project 2")
+        return {
+            "todo": Task.objects.create(
+                project=project_1,
+                sprint=sprint_1,
+                assignee=user,
+                title="To do",
+                due_date="2023-01-05",
+            ),
+            "doing": Task.objects.create(
+                project=project_1,
+                sprint=sprint_1,
+                title="Doing",
+                status=TaskStatusChoices.IN_PROGRESS,
+                priority=TaskPriorityChoices.HIGH,
+                due_date="2023-01-10",
+            ),
+            "backlog": Task.objects.create(project=project_1, title="Backlog"),
+            "other": Task.objects.create(project=other, title="Other project"),
+        }
+
+    def _ids(self, client: APIClient, query: str) -> set[int]:
+        response = client.get(f"/api/tasks/?{query}")
+        assert response.status_code == 200
+        return {item["id"] for item in response.data["results"]}
+
+    def test_filter_by_project_and_status(
+        self,
+        admin_client: APIClient,  # noqa: F811
+        project_1: Project,  # noqa: F811
+        board: dict,
+    ):
+        ids = self._ids(admin_client, f"project={project_1.id}&status=0")
+        assert ids == {board["todo"].id, board["backlog"].id}
+
+    def test_filter_by_sprint_and_status_in(
+        self,
+        admin_client: APIClient,  # noqa: F811
+        sprint_1: Sprint,  # noqa: F811
+        board: dict,
+    ):
+        ids = self._ids(admin_client, f"sprint={sprint_1.id}&status__in=0,1")
+        assert ids == {board["todo"].id, board["doing"].id}
+
+    def test_filter_backlog(self, admin_client: APIClient, board: dict):  # noqa: F811
+        ids = self._ids(admin_client, "sprint__isnull=true")
+        assert ids == {board["backlog"].id, board["other"].id}
+
+    def test_filter_by_assignee(
+        self,
+        admin_client: APIClient,  # noqa: F811
+        user: User,  # noqa: F811 # type: ignore
+        board: dict,
+    ):
+        assert self._ids(admin_client, f"assignee={user.id}") == {board["todo"].id}
+
+    def test_filter_by_priority(self, admin_client: APIClient, board: dict):  # noqa: F811
+        ids = self._ids(admin_client, f"priority={TaskPriorityChoices.HIGH}")
+        assert ids == {board["doing"].id}
+
+    def test_filter_by_due_date_range(self, admin_client: APIClient, board: dict):  # noqa: F811
+        ids = self._ids(
+            admin_client, "due_date__gte=2023-01-06&due_date__lte=2023-01-31"
+        )
+        assert ids == {board["doing"].id}
+
+    def test_order_by_updated_at(self, admin_client: APIClient, board: dict):  # noqa: F811
+        board["todo"].save()
+        response = admin_client.get("/api/tasks/?ordering=-updated_at")
+        assert response.status_code == 200
+        assert response.data["results"][0]["id"] == board["todo"].id
+
+    def test_filter_is_single_query(
+        self,
+        admin_client: APIClient,  # noqa: F811
+        project_1: Project,  # noqa: F811
+        board: dict,
+        django_assert_num_queries,
+    ):
+        with django_assert_num_queries(1):
+            response = admin_client.get(f"/api/tasks/?project={project_1.id}&status=0")
+        assert response.status_code == 200
+
+    def test_fail_invalid_filter(self, admin_client: APIClient):  # noqa: F811
+        response = admin_client.get("/api/tasks/?due_date__gte=not-a-date")
+        assert response.status_code == 400
+
+
 @pytest.mark.django_db
 class TestGetTaskDetail:
     def test_ok(self, admin_client: APIClient, task_1: Task):  # noqa: F811
@@ -277,3 +439,458 @@ class TestAssignTask:
         data = {"user": 99999}
         response = user_client.patch(f"/api/tasks/{task_1.id}/assign/", data)
         assert response.status_code == 403
+
+    def test_writes_only_assignee(
+        self,
+        admin_client: APIClient,  # noqa: F811
+        task_1: Task,  # noqa: F811
+        user: User,  # noqa: F811 # type: ignore
+    ):
+        with CaptureQueriesContext(connection) as ctx:
+            admin_client.patch(f"/api/tasks/{task_1.id}/assign/", {"user": user.id})
+        [update] = [q["sql"] for q in ctx.captured_queries if "UPDATE" in q["sql"]]
+        assert '"assignee_id"' in update and '"updated_at"' in update
+        assert '"title"' not in update
+
+
+@pytest.mark.django_db
+class TestBulkAssignTasks:
+    URL = "/api/tasks/bulk/assign/"
+
+    def _tasks(self, project: Project, count: int, **kwargs):
+        return Task.objects.bulk_create(
+            Task(project=project, title=f"Task {i}", **kwargs) for i in range(count)
+        )
+
+    def test_ids(
+        self,
+        admin_client: APIClient,  # noqa: F811
+        project_1: Project,  # noqa: F811
+        user: User,  # noqa: F811 # type: ignore
+    ):
+        tasks = self._tasks(project_1, 3)
+        data = {"ids": [tasks[0].id, tasks[1].id], "user": user.id}
+        with CaptureQueriesContext(connection) as ctx:
+            response = admin_client.post(self.URL, data, format="json")
+        assert response.status_code == 200
+        assert response.data == {"updated": 2}
+
+        updates = [q["sql"] for q in ctx.captured_queries if "UPDATE" in q["sql"]]
+        assert len(updates) == 1
+        assert '"updated_at"' in updates[0]
+        assert set(Task.objects.filter(assignee=user).values_list("id", flat=True)) == {
+            tasks[0].id,
+            tasks[1].id,
+        }
+
+    def test_query_count_is_flat(
+        self,
+        admin_client: APIClient,  # noqa: F811
+        project_1: Project,  # noqa: F811
+        user: User,  # noqa: F811 # type: ignore
+    ):
+        def count(tasks):
+            data = {"ids": [task.id for task in tasks], "user": user.id}
+            with CaptureQueriesContext(connection) as ctx:
+                admin_client.post(self.URL, data, format="json")
+            return len(ctx.captured_queries)
+
+        assert count(self._tasks(project_1, 2)) == count(self._tasks(project_1, 50))
+
+    def test_filter(
+        self,
+        admin_client: APIClient,  # noqa: F811
+        project_1: Project,  # noqa: F811
+        user: User,  # noqa: F811 # type: ignore
+    ):
+        self._tasks(project_1, 2, status=TaskStatusChoices.DONE)
+        self._tasks(project_1, 1)
+        data = {"filter": {"status": TaskStatusChoices.DONE}, "user": user.id}
+        response = admin_client.post(self.URL, data, format="json")
+        assert response.data == {"updated": 2}
+        assert Task.objects.filter(assignee=user).count() == 2
+
+    def test_unassign(
+        self,
+        admin_client: APIClient,  # noqa: F811
+        project_1: Project,  # noqa: F811
+        user: User,  # noqa: F811 # type: ignore
+    ):
+        tasks = self._tasks(project_1, 2, assignee=user)
+        data = {"ids": [task.id for task in tasks], "user": None}
+        response = admin_client.post(self.URL, data, format="json")
+        assert response.status_code == 200
+        assert not Task.objects.filter(assignee__isnull=False).exists()
+
+    def test_non_admin_needs_every_task(
+        self,
+        user_client: APIClient,  # noqa: F811
+        project_1: Project,  # noqa: F811
+        user: User,  # noqa: F811 # type: ignore
+    ):
+        own = self._tasks(project_1, 2, assignee=user)
+        other = self._tasks(project_1, 1)
+        data = {"ids": [own[0].id, other[0].id], "user": None}
+        response = user_client.post(self.URL, data, format="json")
+        assert response.status_code == 403
+        assert Task.objects.filter(assignee=user).count() == 2
+
+        data = {"ids": [task.id for task in own], "user": None}
+        response = user_client.post(self.URL, data, format="json")
+        assert response.status_code == 200
+
+    def test_fail_unknown_task(
+        self,
+        admin_client: APIClient,  # noqa: F811
+        task_1: Task,  # noqa: F811
+        user: User,  # noqa: F811 # type: ignore
+    ):
+        data = {"ids": [task_1.id, 999], "user": user.id}
+        response = admin_client.post(self.URL, data, format="json")
+        assert response.status_code == 404
+        assert 999 in response.data["ids"]
+        task_1.refresh_from_db()
+        assert task_1.assignee is None
+
+    @pytest.mark.parametrize(
+        "data",
+        [
+            {"user": 1},
+            {"ids": [1], "filter": {"status": 0}, "user": 1},
+            {"filter": {"status": "nope"}, "user": 1},
+            {"filter": {"stauts": 1}, "user": 1},
+            {"filter": {"status": ""}, "user": 1},
+            {"ids": [1], "user": 99999},
+        ],
+    )
+    def test_fail_invalid(
+        self,
+        admin_client: APIClient,  # noqa: F811
+        task_1: Task,  # noqa: F811
+        data: dict,
+    ):
+        response = admin_client.post(self.URL, data, format="json")
+        assert response.status_code == 400
+        task_1.refresh_from_db()
+        assert task_1.assignee is None
+
+    def test_non_admin_updates_only_own_tasks(
+        self,
+        user_client: APIClient,  # noqa: F811
+        project_1: Project,  # noqa: F811
+        user: User,  # noqa: F811 # type: ignore
+    ):
+        self._tasks(project_1, 1, assignee=user)
+        self._tasks(project_1, 1)
+        data = {"filter": {"project": project_1.id}, "user": None}
+        # A task assigned to someone else after the permission check.
+        with patch(
+            "tracker.permissions.IsAssigneeOrAdmin.has_queryset_permission",
+            return_value=True,
+        ):
+            response = user_client.post(self.URL, data, format="json")
+        assert response.data == {"updated": 1}
+
+
+@pytest.mark.django_db
+class TestBulkTasks:
+    def _payload(self, project: Project, sprint: Sprint, count: int):
+        return [
+            {"project": project.id, "sprint": sprint.id, "title": f"Bulk {i}"}
+            for i in range(count)
+        ]
+
+    def _count_queries(self, client: APIClient, payload: list) -> int:
+        with CaptureQueriesContext(connection) as ctx:
+            response = client.post("/api/tasks/bulk/", payload, format="json")
+        assert response.status_code == 201
+        return len(ctx.captured_queries)
+
+    def test_create_ok(
+        self,
+        admin_client: APIClient,  # noqa: F811
+        project_1: Project,  # noqa: F811
+        sprint_1: Sprint,  # noqa: F811
+    ):
+        payload = self._payload(project_1, sprint_1, 3)
+        response = admin_client.post("/api/tasks/bulk/", payload, format="json")
+        assert response.status_code == 201
+        titles = [item["title"] for item in response.data]
+        assert titles == ["Bulk 0", "Bulk 1", "Bulk 2"]
+        assert all(item["id"] for item in response.data)
+        assert Task.objects.filter(sprint=sprint_1).count() == 3
+
+    def test_create_query_count_is_flat(
+        self,
+        admin_client: APIClient,  # noqa: F811
+        project_1: Project,  # noqa: F811
+        sprint_1: Sprint,  # noqa: F811
+    ):
+        small = self._payload(project_1, sprint_1, 2)
+        large = self._payload(project_1, sprint_1, 50)
+        assert self._count_queries(admin_client, small) == self._count_queries(
+            admin_client, large
+        )
+
+    def test_fail_create_reports_errors_per_item(
+        self,
+        admin_client: APIClient,  # noqa: F811
+        project_1: Project,  # noqa: F811
+        sprint_1: Sprint,  # noqa: F811
+    ):
+        closed = Sprint.objects.create(
+            project=project_1,
+            name="Closed",
+            start_date="2023-01-01",
+            end_date="2023-01-15",
+            status=SprintStatusChoices.COMPLETED,
+        )
+        payload = self._payload(project_1, sprint_1, 2)
+        payload.append({"project": project_1.id, "sprint": closed.id, "title": "X"})
+        payload.append({"project": 999, "title": "Y"})
+
+        response = admin_client.post("/api/tasks/bulk/", payload, format="json")
+        assert response.status_code == 400
+        assert response.data[0] == {} and response.data[1] == {}
+        assert "Cannot add or move tasks to a closed sprint." in str(response.data[2])
+        assert "project" in response.data[3]
+        assert not Task.objects.exists()
+
+    def test_update_ok(
+        self,
+        admin_client: APIClient,  # noqa: F811
+        project_1: Project,  # noqa: F811
+        task_1: Task,  # noqa: F811
+    ):
+        task_2 = Task.objects.create(project=project_1, title="Task 2")
+        payload = [
+            {"id": task_1.id, "status": TaskStatusChoices.DONE},
+            {"id": task_2.id, "title": "Renamed"},
+        ]
+        response = admin_client.patch("/api/tasks/bulk/", payload, format="json")
+        assert response.status_code == 200
+
+        task_1.refresh_from_db()
+        task_2.refresh_from_db()
+        assert task_1.status == TaskStatusChoices.DONE
+        assert task_1.title == "Task 1"
+        assert task_2.title == "Renamed"
+
+    def test_fail_update_unknown_task(
+        self,
+        admin_client: APIClient,  # noqa: F811
+        task_1: Task,  # noqa: F811
+    ):
+        payload = [{"id": task_1.id, "title": "Renamed"}, {"id": 999, "title": "X"}]
+        response = admin_client.patch("/api/tasks/bulk/", payload, format="json")
+        assert response.status_code == 400
+        assert "id" in response.data[1]
+        task_1.refresh_from_db()
+        assert task_1.title == "Task 1"
+
+    def test_fail_update_duplicate_task(
+        self,
+        admin_client: APIClient,  # noqa: F811
+        sprint_1: Sprint,  # noqa: F811
+        task_1: Task,  # noqa: F811
+    ):
+        payload = [
+            {"id": task_1.id, "status": TaskStatusChoices.IN_PROGRESS},
+            {"id": task_1.id, "status": TaskStatusChoices.IN_PROGRESS},
+        ]
+        response = admin_client.patch("/api/tasks/bulk/", payload, format="json")
+        assert response.status_code == 400
+        assert response.data[0] == {}
+        assert response.data[1] == {"id": ["Duplicate task."]}
+        sprint_1.refresh_from_db()
+        assert sprint_1.todo_count == 1
+
+    def test_fail_too_many_items(
+        self,
+        settings,
+        admin_client: APIClient,  # noqa: F811
+        project_1: Project,  # noqa: F811
+        sprint_1: Sprint,  # noqa: F811
+        task_1: Task,  # noqa: F811
+    ):
+        settings.API_BULK_MAX_ITEMS = 2
+        payload = self._payload(project_1, sprint_1, 3)
+        updates = [{"id": task_1.id, "title": f"Renamed {i}"} for i in range(3)]
+        for method, data in (("post", payload), ("patch", updates)):
+            with CaptureQueriesContext(connection) as ctx:
+                response = getattr(admin_client, method)(
+                    "/api/tasks/bulk/", data, format="json"
+                )
+            assert response.status_code == 400
+            assert "non_field_errors" in response.data
+            # Neither the related objects nor the tasks were loaded.
+            sql = " ".join(query["sql"] for query in ctx.captured_queries)
+            assert "tracker_task" not in sql and "tracker_sprint" not in sql
+
+    def test_fail_update_non_admin_user_not_assignee(
+        self,
+        user_client: APIClient,  # noqa: F811
+        task_1: Task,  # noqa: F811
+    ):
+        payload = [{"id": task_1.id, "title": "Renamed"}]
+        response = user_client.patch("/api/tasks/bulk/", payload, format="json")
+        assert response.status_code == 403
+
+    def test_delete_ok(
+        self,
+        admin_client: APIClient,  # noqa: F811
+        project_1: Project,  # noqa: F811
+        task_1: Task,  # noqa: F811
+    ):
+        task_2 = Task.objects.create(project=project_1, title="Task 2")
+        data = {"ids": [task_1.id, task_2.id]}
+        response = admin_client.delete("/api/tasks/bulk/", data, format="json")
+        assert response.status_code == 204
+        assert not Task.objects.exists()
+
+    def test_delete_is_set_wise(
+        self,
+        admin_client: APIClient,  # noqa: F811
+        project_1: Project,  # noqa: F811
+        sprint_1: Sprint,  # noqa: F811
+    ):
+        def delete(count):
+            tasks = Task.objects.bulk_create(
+                Task(project=project_1, sprint=sprint_1, title=f"Task {i}")
+                for i in range(count)
+            )
+            data = {"ids": [task.id for task in tasks]}
+            with CaptureQueriesContext(connection) as ctx:
+                response = admin_client.delete("/api/tasks/bulk/", data, format="json")
+            assert response.status_code == 204
+            return len(ctx.captured_queries)
+
+        Project.objects.filter(pk=project_1.pk).update(todo_count=53)
+        Sprint.objects.filter(pk=sprint_1.pk).update(todo_count=53)
+        assert delete(3) == delete(50)
+        assert Tombstone.objects.filter(model="task").count() == 53
+        project_1.refresh_from_db()
+        sprint_1.refresh_from_db()
+        assert project_1.todo_count == sprint_1.todo_count == 0
+
+    def test_fail_delete_unknown_task(
+        self,
+        admin_client: APIClient,  # noqa: F811
+        task_1: Task,  # noqa: F811
+    ):
+        data = {"ids": [task_1.id, 999]}
+        response = admin_client.delete("/api/tasks/bulk/", data, format="json")
+        assert response.status_code == 404
+        assert 999 in response.data["ids"]
+        assert Task.objects.filter(pk=task_1.id).exists()
+
+    def test_fail_delete_non_admin_user_not_assignee(
+        self,
+        user_client: APIClient,  # noqa: F811
+        task_1: Task,  # noqa: F811
+    ):
+        data = {"ids": [task_1.id]}
+        response = user_client.delete("/api/tasks/bulk/", data, format="json")
+        assert response.status_code == 403
+        assert Task.objects.filter(pk=task_1.id).exists()
+
+    def test_fail_unauthenticated(self, project_1: Project, sprint_1: Sprint):  # noqa: F811
+        client = APIClient()
+        payload = self._payload(project_1, sprint_1, 1)
+        response = client.post("/api/tasks/bulk/", payload, format="json")
+        assert response.status_code == 401
+
+
+@pytest.mark.django_db
+class TestConditionalGetTasks:
+    def test_detail_not_modified(
+        self,
+        admin_client: APIClient,  # noqa: F811
+        task_1: Task,  # noqa: F811
+    ):
+        response = admin_client.get(f"/api/tasks/{task_1.id}/")
+        assert response.status_code == 200
+        etag = response["ETag"]
+        assert response["Last-Modified"]
+
+        response = admin_client.get(f"/api/tasks/{task_1.id}/", HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == 304
+        assert response["ETag"] == etag
+        assert not response.content
+
+    def test_detail_modified_after_update(
+        self,
+        admin_client: APIClient,  # noqa: F811
+        task_1: Task,  # noqa: F811
+    ):
+        etag = admin_client.get(f"/api/tasks/{task_1.id}/")["ETag"]
+        task_1.title = "Changed"
+        task_1.save()
+
+        response = admin_client.get(f"/api/tasks/{task_1.id}/", HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == 200
+        assert response.data["title"] == "Changed"
+        assert response["ETag"] != etag
+
+    def test_detail_if_modified_since(
+        self,
+        admin_client: APIClient,  # noqa: F811
+        task_1: Task,  # noqa: F811
+    ):
+        last_modified = admin_client.get(f"/api/tasks/{task_1.id}/")["Last-Modified"]
+        response = admin_client.get(
+            f"/api/tasks/{task_1.id}/", HTTP_IF_MODIFIED_SINCE=last_modified
+        )
+        assert response.status_code == 304
+
+    def test_list_if_modified_since_after_delete(
+        self,
+        admin_client: APIClient,  # noqa: F811
+        project_1: Project,  # noqa: F811
+        task_1: Task,  # noqa: F811
+    ):
+        other = Task.objects.create(project=project_1, title="Other")
+        response = admin_client.get("/api/tasks/")
+        # The newest row of a list does not move when another one is deleted.
+        assert "Last-Modified" not in response
+        other.delete()
+
+        response = admin_client.get(
+            "/api/tasks/", HTTP_IF_MODIFIED_SINCE=http_date(time.time() + 60)
+        )
+        assert response.status_code == 200
+        assert [task["id"] for task in response.data["results"]] == [task_1.id]
+
+    def test_list_not_modified_skips_serializer(
+        self,
+        admin_client: APIClient,  # noqa: F811
+        task_1: Task,  # noqa: F811
+    ):
+        etag = admin_client.get("/api/tasks/")["ETag"]
+        with patch.object(TaskSerializer, "to_representation") as to_representation:
+            response = admin_client.get("/api/tasks/", HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == 304
+        to_representation.assert_not_called()
+
+    def test_list_modified_after_delete(
+        self,
+        admin_client: APIClient,  # noqa: F811
+        project_1: Project,  # noqa: F811
+        task_1: Task,  # noqa: F811
+    ):
+        Task.objects.create(project=project_1, title="Task 2")
+        etag = admin_client.get("/api/tasks/")["ETag"]
+        task_1.delete()
+
+        response = admin_client.get("/api/tasks/", HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == 200
+        assert len(response.data["results"]) == 1
+
+    def test_list_etag_depends_on_filters(
+        self,
+        admin_client: APIClient,  # noqa: F811
+        task_1: Task,  # noqa: F811
+    ):
+        etag = admin_client.get("/api/tasks/")["ETag"]
+        response = admin_client.get("/api/tasks/?status=2", HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == 200
@@ -0,0 +1,164 @@
+"""
+Native async read endpoints for deployments under ASGI.
+
+The views reuse the configuration of the DRF viewsets (querysets, filters,
+pagination, serializers and permissions), so their payloads are identical
+to the synchronous endpoints, but they run on the event loop instead of
+being wrapped in a worker thread. Database access goes through Django's
+async ORM; DRF's paginator is not async-aware, so the page fetch of list
+endpoints is awaited through ``sync_to_async``.
+
+The live endpoints stream the task events of a sprint or project as
+Server-Sent Events, see ``tracker.live``. Django only hands the request's
+database connection back in ``response.close()``, so they release it before
+streaming; an open stream would otherwise hold a pooled connection.
+"""
+
+from functools import wraps
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.handlers.asgi import ASGIRequest
+from django.db import connections
+from django.http import Http404, HttpResponse, HttpResponseBase, StreamingHttpResponse
+from django.views.decorators.http import require_GET
+from rest_framework.exceptions import NotAuthenticated
+from rest_framework.renderers import JSONRenderer
+from rest_framework.request import Request
+from rest_framework.views import exception_handler
+
+from tracker import live
+from tracker.authentication import CachedJWTAuthentication
+from tracker.models import Project, Sprint
+from tracker.viewsets import ProjectViewSet, SprintViewSet, TaskViewSet
+
+authentication = CachedJWTAuthentication()
+
+
+def _render(data, status=200, headers=None):
+    return HttpResponse(
+        JSONRenderer().render(data),
+        status=status,
+        content_type="application/json",
+        headers=headers,
+    )
+
+
+def async_api_view(view_func):
+    """
+    Authenticate the request and render the returned data like DRF.
+    Responses returned by the view are passed through.
+    """
+
+    @require_GET
+    @wraps(view_func)
+    async def wrapper(request, *args, **kwargs):
+        try:
+            result = await sync_to_async(authentication.authenticate)(request)
+            if result is None:
+                raise NotAuthenticated()
+            request.user, request.auth = result
+            data = await view_func(request, *args, **kwargs)
+        except Exception as exc:
+            response = exception_handler(exc, {"request": request})
+            if response is None:
+                raise
+            headers = {}
+            if response.status_code == 401:
+                headers["WWW-Authenticate"] = authentication.authenticate_header(
+                    request
+                )
+            return _render(response.data, response.status_code, headers)
+        if isinstance(data, HttpResponseBase):
+            return data
+        return _render(data)
+
+    return wrapper
+
+
+def _viewset(viewset_class, request, action, **kwargs):
+    drf_request = Request(request, authenticators=())
+    drf_request.user = request.user
+    drf_request.auth = request.auth
+    view = viewset_class(
+        request=drf_request,
+        args=(),
+        kwargs=kwargs,
+        action=action,
+        format_kwarg=None,
+        headers={},
+    )
+    view.check_permissions(drf_request)
+    return view
+
+
+async def _list(viewset_class, request):
+    view = _viewset(viewset_class, request, "list")
+    queryset = view.filter_queryset(view.get_queryset())
+    page = await sync_to_async(view.paginate_queryset)(queryset)
+    data = view.get_serializer(page, many=True).data
+    return view.get_paginated_response(data).data
+
+
+async def _retrieve(viewset_class, request, pk):
+    view = _viewset(viewset_class, request, "retrieve", pk=pk)
+    instance = await view.get_queryset().filter(pk=pk).afirst()
+    if instance is None:
+        raise Http404
+    view.check_object_permissions(view.request, instance)
+    return view.get_serializer(instance).data
+
+
+@async_api_view
+async def task_list(request):
+    return await _list(TaskViewSet, request)
+
+
+@async_api_view
+async def task_detail(request, pk: int):
+    return await _retrieve(TaskViewSet, request, pk)
+
+
+@async_api_view
+async def sprint_board(request, pk: int):
+    return await _retrieve(SprintViewSet, request, pk)
+
+
+@async_api_view
+async def project_list(request):
+    return await _list(ProjectViewSet, request)
+
+
+def _release_connections():
+    """``close_old_connections`` outside of transactions, which must not end."""
+    for connection in connections.all(initialized_only=True):
+        if not connection.in_atomic_block:
+            connection.close_if_unusable_or_obsolete()
+
+
+async def _events(request, model, pk, channel):
+    if not settings.API_LIVE_ENABLED:
+        raise Http404
+    if not await model.objects.filter(pk=pk).aexists():
+        raise Http404
+    if not isinstance(request, ASGIRequest):
+        # A WSGI worker would be held for as long as the client listens.
+        return _render(
+            {"detail": "Live updates are only served under ASGI."}, status=501
+        )
+    await sync_to_async(_release_connections)()
+    return StreamingHttpResponse(
+        live.stream([channel]),
+        content_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+@async_api_view
+async def sprint_events(request, pk: int):
+    return await _events(request, Sprint, pk, live.sprint_channel(pk))
+
+
+@async_api_view
+async def project_events(request, pk: int):
+    return await _events(request, Project, pk, live.project_channel(pk))
@@ -0,0 +1,129 @@
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+
+from django.conf import settings
+from django.core.cache import caches
+from django.utils.translation import gettext_lazy as _
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import AuthenticationFailed
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.utils import get_md5_hash_password
+
+from tracker.metrics import timer
+
+USER_KEY_PREFIX = "tracker:auth:user"
+
+# Backends that only live in one process. Eviction runs in the process that
+# saved the user, so the other workers would keep serving stale users.
+PROCESS_LOCAL_CACHES = {
+    "django.core.cache.backends.locmem.LocMemCache",
+    "django.core.cache.backends.dummy.DummyCache",
+}
+
+
+class TokenCache:
+    """Thread-safe LRU of validated tokens, each kept until its ``exp``."""
+
+    def __init__(self, max_size: int):
+        self.max_size = max_size
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            token, expires_at = entry
+            if expires_at <= time.time():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return token
+
+    def set(self, key, token, expires_at):
+        with self._lock:
+            self._entries[key] = (token, expires_at)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+token_cache = TokenCache(settings.API_AUTH_TOKEN_CACHE_SIZE)
+
+
+def user_cache_key(user_id) -> str:
+    return f"{USER_KEY_PREFIX}:{user_id}"
+
+
+def user_cache():
+    """
+    The cache of authenticated users, or ``None`` when ``API_AUTH_CACHE_ALIAS``
+    is not shared between processes and users are loaded on every request.
+    """
+    alias = settings.API_AUTH_CACHE_ALIAS
+    if settings.CACHES[alias]["BACKEND"] in PROCESS_LOCAL_CACHES:
+        return None
+    return caches[alias]
+
+
+def evict_cached_user(user_id):
+    cache = user_cache()
+    if cache is not None:
+        cache.delete(user_cache_key(user_id))
+
+
+class CachedJWTAuthentication(JWTAuthentication):
+    """
+    ``JWTAuthentication`` that skips repeated work for hot tokens.
+
+    Verified tokens are kept in a per-process LRU keyed by the SHA-256 of the
+    raw token until they expire, so the signature is checked once per token.
+    User rows are kept in the ``API_AUTH_CACHE_ALIAS`` cache for
+    ``API_AUTH_USER_CACHE_TTL`` seconds and evicted when the user is saved or
+    deleted (see ``tracker.signals``), but only if that cache is shared by
+    all workers. Writes that send no signal, such as ``QuerySet.update()``,
+    take effect after the TTL. Active-user and revocation checks still run
+    on every request.
+    """
+
+    def authenticate(self, request):
+        with timer("auth"):
+            return super().authenticate(request)
+
+    def get_validated_token(self, raw_token):
+        key = hashlib.sha256(raw_token).digest()
+        token = token_cache.get(key)
+        if token is None:
+            token = super().get_validated_token(raw_token)
+            token_cache.set(key, token, token["exp"])
+        return token
+
+    def get_user(self, validated_token):
+        user_id = validated_token.get(api_settings.USER_ID_CLAIM)
+        cache = user_cache()
+        if user_id is None or cache is None:
+            return super().get_user(validated_token)
+
+        key = user_cache_key(user_id)
+        user = cache.get(key)
+        if user is None:
+            user = super().get_user(validated_token)
+            cache.set(key, user, settings.API_AUTH_USER_CACHE_TTL)
+            return user
+
+        if api_settings.CHECK_USER_IS_ACTIVE and not user.is_active:
+            raise AuthenticationFailed(_("User is inactive"), code="user_inactive")
+        if api_settings.CHECK_REVOKE_TOKEN and validated_token.get(
+            api_settings.REVOKE_TOKEN_CLAIM
+        ) != get_md5_hash_password(user.password):
+            raise AuthenticationFailed(
+                _("The user's password has been changed."), code="password_changed"
+            )
+        return user
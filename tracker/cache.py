@@ -0,0 +1,152 @@
+import hashlib
+import time
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db import transaction
+from django.utils.cache import get_conditional_response
+from django.utils.http import parse_http_date_safe
+from rest_framework.response import Response
+
+KEY_PREFIX = "tracker:api"
+STATS_KEYS = {
+    "hits": f"{KEY_PREFIX}:stats:hits",
+    "misses": f"{KEY_PREFIX}:stats:misses",
+}
+CACHED_HEADERS = ("ETag", "Last-Modified")
+
+
+def cache_enabled() -> bool:
+    return settings.API_CACHE_ENABLED
+
+
+def get_cache():
+    return caches[settings.API_CACHE_ALIAS]
+
+
+def _generation_key(label: str) -> str:
+    return f"{KEY_PREFIX}:gen:{label}"
+
+
+def get_generations(labels) -> list:
+    """
+    Return the current generation of every label. A generation missing from
+    the cache (never set or evicted) is seeded with a fresh value, so keys
+    built before the eviction can never be served again.
+    """
+    cache = get_cache()
+    keys = [_generation_key(label) for label in labels]
+    generations = cache.get_many(keys)
+    for key in keys:
+        if key not in generations:
+            cache.add(key, time.time_ns(), None)
+            generations[key] = cache.get(key)
+    return [generations[key] for key in keys]
+
+
+def bump_generations(labels):
+    cache = get_cache()
+    for label in labels:
+        key = _generation_key(label)
+        try:
+            cache.incr(key)
+        except ValueError:
+            cache.add(key, time.time_ns(), None)
+
+
+def invalidate(*models):
+    """
+    Drop cached responses that depend on ``models``. Runs after the current
+    transaction commits so a concurrent reader cannot re-cache stale rows.
+    """
+    if not cache_enabled():
+        return
+    labels = [model._meta.label_lower for model in models]
+    transaction.on_commit(lambda: bump_generations(labels))
+
+
+def _record(outcome: str):
+    cache = get_cache()
+    try:
+        cache.incr(STATS_KEYS[outcome])
+    except ValueError:
+        cache.add(STATS_KEYS[outcome], 0, None)
+        cache.incr(STATS_KEYS[outcome])
+
+
+def cache_stats() -> dict:
+    values = get_cache().get_many(STATS_KEYS.values())
+    stats = {name: values.get(key, 0) for name, key in STATS_KEYS.items()}
+    total = stats["hits"] + stats["misses"]
+    stats["hit_ratio"] = stats["hits"] / total if total else None
+    return stats
+
+
+def reset_cache_stats():
+    get_cache().delete_many(STATS_KEYS.values())
+
+
+class CachedResponseMixin:
+    """
+    Opt-in response cache for ``list`` and ``retrieve``.
+
+    Response data is cached per user and per full request path. Keys embed
+    a generation counter for every model in ``cache_models``; saving or
+    deleting any of them bumps the counter (see ``tracker.signals``), which
+    retires every dependent entry at once without scanning the cache.
+    """
+
+    cache_models = ()
+
+    def get_cache_key(self, request):
+        labels = [model._meta.label_lower for model in self.cache_models]
+        generations = get_generations(labels)
+        path = hashlib.md5(
+            request.get_full_path().encode(), usedforsecurity=False
+        ).hexdigest()
+        user = request.user.pk if request.user.is_authenticated else "anon"
+        return ":".join(
+            [KEY_PREFIX, self.basename, self.action, f"user-{user}", path]
+            + [str(generation) for generation in generations]
+        )
+
+    def cached_response(self, request, render):
+        if not cache_enabled():
+            return render()
+
+        cache = get_cache()
+        key = self.get_cache_key(request)
+        cached = cache.get(key)
+        if cached is not None:
+            _record("hits")
+            data, headers = cached
+            not_modified = get_conditional_response(
+                request,
+                etag=headers.get("ETag"),
+                last_modified=parse_http_date_safe(headers.get("Last-Modified")),
+            )
+            response = not_modified or Response(data)
+            for name, value in headers.items():
+                response[name] = value
+            return response
+
+        _record("misses")
+        response = render()
+        if response.status_code == 200:
+            headers = {
+                name: response[name] for name in CACHED_HEADERS if name in response
+            }
+            cache.set(key, (response.data, headers), settings.API_CACHE_TIMEOUT)
+        return response
+
+    def list(self, request, *args, **kwargs):
+        return self.cached_response(
+            request,
+            lambda: super(CachedResponseMixin, self).list(request, *args, **kwargs),
+        )
+
+    def retrieve(self, request, *args, **kwargs):
+        return self.cached_response(
+            request,
+            lambda: super(CachedResponseMixin, self).retrieve(request, *args, **kwargs),
+        )
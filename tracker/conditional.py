@@ -0,0 +1,86 @@
+import hashlib
+
+from django.utils.cache import get_conditional_response, quote_etag
+from django.utils.http import http_date
+from rest_framework.response import Response
+
+
+def make_etag(*parts) -> str:
+    digest = hashlib.md5(repr(parts).encode(), usedforsecurity=False)
+    return quote_etag(digest.hexdigest())
+
+
+class ConditionalGetMixin:
+    """
+    ETag / Last-Modified support for ``list`` and ``retrieve``.
+
+    Validators are derived from the rows that were loaded for the response
+    (the current page for lists), so they cost no extra queries and no
+    ``COUNT(*)``. When the client already holds the current representation a
+    304 is returned before any serializer runs.
+
+    The ETag covers the primary key and ``updated_at`` of every rendered row,
+    so it also changes when a row disappears from a page. Lists get no
+    Last-Modified: the newest ``updated_at`` of a page stays put when a row
+    is deleted or leaves the filter, so ``If-Modified-Since`` would answer
+    304 for a changed list.
+    """
+
+    def get_validator_parts(self, obj):
+        """Values that change whenever the representation of ``obj`` does."""
+        return (obj.pk, obj.updated_at)
+
+    def get_last_modified(self, obj):
+        return obj.updated_at
+
+    def get_validators(self, objects, *extra):
+        last_modified = max(
+            filter(None, map(self.get_last_modified, objects)), default=None
+        )
+        etag = make_etag(*map(self.get_validator_parts, objects), *extra)
+        return last_modified, etag
+
+    def conditional_response(self, request, validators, render):
+        last_modified, etag = validators
+        timestamp = int(last_modified.timestamp()) if last_modified else None
+        response = get_conditional_response(request, etag=etag, last_modified=timestamp)
+        if response is None:
+            response = render()
+        if response.status_code in (200, 304):
+            response["ETag"] = etag
+            if timestamp is not None:
+                response["Last-Modified"] = http_date(timestamp)
+        return response
+
+    def list(self, request, *args, **kwargs):
+        queryset = self.filter_queryset(self.get_queryset())
+        page = self.paginate_queryset(queryset)
+        if page is None:
+            objects = list(queryset)
+            _, etag = self.get_validators(objects)
+            return self.conditional_response(
+                request,
+                (None, etag),
+                lambda: Response(self.get_serializer(objects, many=True).data),
+            )
+
+        _, etag = self.get_validators(
+            page,
+            getattr(self.paginator, "has_next", None),
+            getattr(self.paginator, "has_previous", None),
+        )
+        return self.conditional_response(
+            request,
+            (None, etag),
+            lambda: self.get_paginated_response(
+                self.get_serializer(page, many=True).data
+            ),
+        )
+
+    def retrieve(self, request, *args, **kwargs):
+        instance = self.get_object()
+        return self.conditional_response(
+            request,
+            self.get_validators([instance]),
+            lambda: Response(self.get_serializer(instance).data),
+        )
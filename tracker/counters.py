@@ -0,0 +1,183 @@
+"""
+Bookkeeping of the per-status task counters of sprints and projects.
+
+Every write path turns its task changes into counter deltas and applies
+them in the same transaction with ``adjust_task_counts``: model signals for
+single saves and deletes, and the set-based paths (bulk create/update, the
+importer, ``Sprint.close``) explicitly. ``reconcile_task_counts`` repairs
+counters that drifted, e.g. after raw SQL or a ``QuerySet.update()`` that
+bypassed this module. ``update_tasks`` and ``delete_tasks`` are the
+set-based task UPDATE and DELETE that keep the counters.
+"""
+
+from collections import defaultdict
+
+from django.db import transaction
+from django.db.models import Count
+from django.utils import timezone
+
+from tracker.cache import invalidate
+from tracker.live import publish_changed
+from tracker.models import (
+    TASK_COUNT_FIELDS,
+    Project,
+    Sprint,
+    Task,
+    Tombstone,
+    adjust_task_counts,
+)
+
+
+def _add(deltas, state, sign):
+    if len(state) < len(Task.TRACKED_FIELDS):
+        return
+    field = TASK_COUNT_FIELDS.get(state["status"])
+    if field is not None:
+        deltas[(Sprint, state["sprint_id"], field)] += sign
+        deltas[(Project, state["project_id"], field)] += sign
+
+
+def task_deltas(created=(), updated=(), deleted=()):
+    """
+    Counter deltas of the given task changes. Updated tasks are compared
+    against the state they were loaded with. Tasks loaded with a tracked
+    field deferred are skipped and left to reconciliation.
+    """
+    deltas = defaultdict(int)
+    for task in created:
+        _add(deltas, task.tracked_state(), 1)
+    for task in deleted:
+        _add(deltas, task.tracked_state(), -1)
+    for task in updated:
+        previous = getattr(task, "_loaded_state", {})
+        current = task.tracked_state()
+        if len(previous) < len(Task.TRACKED_FIELDS) or previous == current:
+            continue
+        _add(deltas, previous, -1)
+        _add(deltas, current, 1)
+    return deltas
+
+
+def count_tasks(created=(), updated=(), deleted=()):
+    adjust_task_counts(task_deltas(created, updated, deleted))
+
+
+def update_tasks(queryset, **values):
+    """
+    Update the tasks of ``queryset`` with one UPDATE (``updated_at`` is set
+    too) and move their counters. The tasks are first counted per sprint,
+    project and status; a task changed concurrently between both queries can
+    leave a counter off by one until reconciliation. Returns the number of
+    updated tasks.
+    """
+    if "sprint" in values:
+        sprint = values.pop("sprint")
+        values["sprint_id"] = sprint and sprint.pk
+    with transaction.atomic():
+        groups = list(
+            queryset.values(*Task.TRACKED_FIELDS).annotate(count=Count("id")).order_by()
+        )
+        updated = queryset.update(updated_at=timezone.now(), **values)
+        deltas = defaultdict(int)
+        for group in groups:
+            count = group.pop("count")
+            _add(deltas, group, -count)
+            _add(deltas, {**group, **values}, count)
+        adjust_task_counts(deltas)
+        invalidate(Task)
+        sprint_ids = {group["sprint_id"] for group in groups}
+        project_ids = {group["project_id"] for group in groups}
+        if "sprint_id" in values:
+            sprint_ids.add(values["sprint_id"])
+        publish_changed(sprint_ids, project_ids, updated)
+    return updated
+
+
+def delete_tasks(queryset):
+    """
+    Delete the tasks of ``queryset`` with one DELETE, doing the work of the
+    per-row delete signals set-wise: one counter adjustment per sprint and
+    project, one INSERT of the sync tombstones and one live event. Call it in
+    a transaction. Returns the number of deleted tasks.
+    """
+    tasks = list(queryset.values("id", *Task.TRACKED_FIELDS))
+    if not tasks:
+        return 0
+    now = timezone.now()
+    count_tasks(deleted=[Task(**task) for task in tasks])
+    Tombstone.objects.bulk_create(
+        Tombstone(model="task", object_id=task["id"], deleted_at=now) for task in tasks
+    )
+    # Nothing references tasks, so the collector and its signals are skipped.
+    ids = [task["id"] for task in tasks]
+    deleted = Task.objects.filter(id__in=ids)._raw_delete(Task.objects.db)
+    invalidate(Task)
+    publish_changed(
+        {task["sprint_id"] for task in tasks},
+        {task["project_id"] for task in tasks},
+        deleted,
+    )
+    return deleted
+
+
+def _actual_counts(model, column):
+    counts = defaultdict(dict)
+    rows = (
+        Task.objects.filter(**{f"{column}__isnull": False})
+        .values(column, "status")
+        .annotate(count=Count("id"))
+        .order_by()
+    )
+    for row in rows:
+        field = TASK_COUNT_FIELDS.get(row["status"])
+        if field is not None:
+            counts[row[column]][field] = row["count"]
+    return counts
+
+
+def _stored_counts(model):
+    fields = list(TASK_COUNT_FIELDS.values())
+    for pk, *values in model.objects.values_list("pk", *fields).iterator():
+        yield pk, dict(zip(fields, values))
+
+
+def reconcile_task_counts(dry_run=False):
+    """
+    Recount the tasks of every sprint and project and fix the counters that
+    differ. Drifted rows are recounted under a row lock, so writers that
+    commit concurrently are neither lost nor counted twice. Returns the
+    number of repaired rows per model.
+    """
+    repaired = {}
+    for model, column in ((Sprint, "sprint_id"), (Project, "project_id")):
+        actual = _actual_counts(model, column)
+        drifted = [
+            pk
+            for pk, stored in _stored_counts(model)
+            if stored != {field: actual[pk].get(field, 0) for field in stored}
+        ]
+        if not dry_run:
+            for pk in drifted:
+                _repair(model, column, pk)
+        repaired[model._meta.model_name] = len(drifted)
+    return repaired
+
+
+def _repair(model, column, pk):
+    with transaction.atomic():
+        if not model.objects.select_for_update().filter(pk=pk).exists():
+            return
+        counts = dict.fromkeys(TASK_COUNT_FIELDS.values(), 0)
+        rows = (
+            Task.objects.filter(**{column: pk})
+            .values("status")
+            .annotate(count=Count("id"))
+            .order_by()
+        )
+        for row in rows:
+            field = TASK_COUNT_FIELDS.get(row["status"])
+            if field is not None:
+                counts[field] = row["count"]
+        # Like adjust_task_counts, for ETags, sync and the response cache.
+        model.objects.filter(pk=pk).update(updated_at=timezone.now(), **counts)
+        invalidate(model)
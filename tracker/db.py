@@ -0,0 +1,64 @@
+from django.contrib.postgres.operations import AddIndexConcurrently
+from django.db import connections
+from django.db.migrations import AddIndex
+
+
+def pool_stats(alias: str = "default") -> dict:
+    """
+    Connection pool statistics for ``alias``, as seen by this worker process.
+
+    Counters are cumulative since the pool was opened. ``avg_wait_ms`` is
+    the mean time a checkout spent queued for a free connection.
+    """
+    pool = getattr(connections[alias], "pool", None)
+    if pool is None:
+        return {"alias": alias, "pooled": False}
+
+    stats = pool.get_stats()
+    requests = stats.get("requests_num", 0)
+    return {
+        "alias": alias,
+        "pooled": True,
+        "name": pool.name,
+        "min_size": stats.get("pool_min"),
+        "max_size": stats.get("pool_max"),
+        "size": stats.get("pool_size", 0),
+        "available": stats.get("pool_available", 0),
+        "in_use": stats.get("pool_size", 0) - stats.get("pool_available", 0),
+        "waiting": stats.get("requests_waiting", 0),
+        "requests": requests,
+        "requests_queued": stats.get("requests_queued", 0),
+        "requests_errors": stats.get("requests_errors", 0),
+        "requests_timeouts": stats.get("requests_timeouts", 0),
+        "avg_wait_ms": (
+            stats.get("requests_wait_ms", 0) / requests if requests else 0.0
+        ),
+        "connections_opened": stats.get("connections_num", 0),
+        "connections_errors": stats.get("connections_errors", 0),
+        "connections_lost": stats.get("connections_lost", 0),
+        "returns_bad": stats.get("returns_bad", 0),
+    }
+
+
+class AddIndexConcurrentlyIfPostgres(AddIndexConcurrently):
+    """
+    ``CREATE INDEX CONCURRENTLY`` on PostgreSQL, so building an index on a
+    large table does not block writes. Other databases (the SQLite tests)
+    get a plain ``CREATE INDEX``. Needs ``atomic = False`` on the migration.
+    """
+
+    def database_forwards(self, app_label, schema_editor, from_state, to_state):
+        if schema_editor.connection.vendor == "postgresql":
+            super().database_forwards(app_label, schema_editor, from_state, to_state)
+        else:
+            AddIndex.database_forwards(
+                self, app_label, schema_editor, from_state, to_state
+            )
+
+    def database_backwards(self, app_label, schema_editor, from_state, to_state):
+        if schema_editor.connection.vendor == "postgresql":
+            super().database_backwards(app_label, schema_editor, from_state, to_state)
+        else:
+            AddIndex.database_backwards(
+                self, app_label, schema_editor, from_state, to_state
+            )
@@ -0,0 +1,108 @@
+"""
+Chunked deletion of projects and sprints.
+
+Deleting a project through Django's collector loads every sprint and task
+into memory and removes them in one long transaction. ``request_deletion``
+instead only hides the object (and a project's sprints) by setting
+``deleted_at``, records the tombstones sync clients need and returns a
+``Deletion`` to report progress. ``run_deletion``, queued as a ``delete``
+job (see ``tracker.jobs``), then deletes the tasks in batches of
+``API_DELETION_BATCH_SIZE``, each in a short transaction of its own that
+also records the progress, and finally the object itself. An interrupted run
+resumes with the next batch.
+"""
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import F
+from django.utils import timezone
+
+from tracker.cache import invalidate
+from tracker.counters import delete_tasks
+from tracker.jobs import enqueue
+from tracker.models import (
+    TASK_COUNT_FIELDS,
+    Deletion,
+    Project,
+    Sprint,
+    Task,
+    Tombstone,
+)
+
+MODELS = {model._meta.model_name: model for model in (Project, Sprint)}
+
+
+def request_deletion(obj) -> Deletion:
+    """Hide ``obj`` and queue the deletion of it and its tasks."""
+    model_name = obj._meta.model_name
+    with transaction.atomic():
+        now = timezone.now()
+        rows = type(obj).all_objects.filter(pk=obj.pk)
+        rows.update(deleted_at=now, updated_at=now)
+        obj.deleted_at = now
+        tombstones = [Tombstone(model=model_name, object_id=obj.pk, deleted_at=now)]
+        if isinstance(obj, Project):
+            sprints = Sprint.objects.filter(project=obj)
+            tombstones += [
+                Tombstone(model="sprint", object_id=pk, deleted_at=now)
+                for pk in sprints.values_list("id", flat=True)
+            ]
+            sprints.update(deleted_at=now, updated_at=now)
+        Tombstone.objects.bulk_create(tombstones)
+        # The counters spare a COUNT over the tasks.
+        counts = rows.values_list(*TASK_COUNT_FIELDS.values()).get()
+        deletion = Deletion.objects.create(
+            model=model_name, object_id=obj.pk, total_tasks=sum(counts)
+        )
+        enqueue("delete", {"deletion_id": deletion.pk})
+        invalidate(Project, Sprint, Task)
+    return deletion
+
+
+def _delete_batch(deletion, batch_size):
+    """Delete the next batch of tasks. Returns the number of deleted tasks."""
+    with transaction.atomic():
+        # The lock keeps concurrent runs of one deletion from counting twice.
+        deletion = Deletion.objects.select_for_update().get(pk=deletion.pk)
+        if deletion.finished_at is not None:
+            return 0
+        tasks = Task.objects.filter(
+            **{f"{deletion.model}_id": deletion.object_id}
+        ).order_by("id")[:batch_size]
+        deleted = delete_tasks(tasks)
+        Deletion.objects.filter(pk=deletion.pk).update(
+            deleted_tasks=F("deleted_tasks") + deleted
+        )
+    return deleted
+
+
+def run_deletion(deletion, batch_size=None, progress=None):
+    """
+    Delete the tasks of ``deletion`` batch by batch, then the object itself.
+    ``progress`` is called with the refreshed ``deletion`` after each batch.
+    """
+    batch_size = batch_size or settings.API_DELETION_BATCH_SIZE
+    while _delete_batch(deletion, batch_size):
+        deletion.refresh_from_db()
+        if progress is not None:
+            progress(deletion)
+
+    with transaction.atomic():
+        deletion = Deletion.objects.select_for_update().get(pk=deletion.pk)
+        if deletion.finished_at is None:
+            # Only the sprints and tasks written while it was being hidden
+            # are left for the collector.
+            model = MODELS[deletion.model]
+            model.all_objects.filter(pk=deletion.object_id).delete()
+            deletion.finished_at = timezone.now()
+            deletion.save(update_fields=["finished_at"])
+    return deletion
+
+
+def deletion_job(deletion_id):
+    deletion = run_deletion(Deletion.objects.get(pk=deletion_id))
+    return {"deleted_tasks": deletion.deleted_tasks}
+
+
+def pending_deletions():
+    return Deletion.objects.filter(finished_at__isnull=True).order_by("id")
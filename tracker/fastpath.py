@@ -0,0 +1,290 @@
+"""
+Read-only fast path for list endpoints.
+
+``ModelSerializer`` spends most of a large list rebuilding field state for
+every row. For list actions, ``FastListMixin`` instead fetches the page as
+``values()`` dicts and renders them with a ``RowPlan`` compiled from the
+view's serializer, which picks one converter per field up front: plain
+values are copied, everything else goes through the field's own
+``to_representation``. Nested serializers over reverse relations (a
+sprint's tasks) are loaded with one ``values()`` query per page.
+
+The output is identical to the serializer's. Serializers with fields the
+plan does not understand (method fields, non-primary-key relations,
+``source="*"``) fall back to regular serialization.
+"""
+
+import copy
+import threading
+from collections import OrderedDict, defaultdict
+
+from django.conf import settings
+from django.core.exceptions import FieldDoesNotExist
+from rest_framework import serializers
+
+from tracker.fieldsets import required_columns
+from tracker.metrics import timer
+
+# Fields whose representation of a database value is the value itself.
+IDENTITY_FIELDS = (
+    serializers.BooleanField,
+    serializers.CharField,
+    serializers.ChoiceField,
+    serializers.EmailField,
+    serializers.IntegerField,
+    serializers.SlugField,
+    serializers.URLField,
+)
+
+
+class PlanCache:
+    """
+    Compiled plans by serializer shape. Sparse fieldsets let clients pick
+    the shape, so only the ``API_FAST_PLAN_CACHE_SIZE`` most recently used
+    plans are kept.
+    """
+
+    def __init__(self):
+        self._plans = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._plans)
+
+    def get(self, key, compile):
+        with self._lock:
+            if key in self._plans:
+                self._plans.move_to_end(key)
+                return self._plans[key]
+        plan = compile()
+        with self._lock:
+            self._plans[key] = plan
+            while len(self._plans) > settings.API_FAST_PLAN_CACHE_SIZE:
+                self._plans.popitem(last=False)
+        return plan
+
+    def clear(self):
+        with self._lock:
+            self._plans.clear()
+
+
+_plans = PlanCache()
+
+
+class NestedRelation:
+    """A reverse relation rendered by a nested list serializer."""
+
+    def __init__(self, name, model, fk_column, plan):
+        self.name = name
+        self.model = model
+        self.fk_column = fk_column
+        self.plan = plan
+
+    def load(self, rows, pk_column):
+        by_parent = defaultdict(list)
+        children = self.model._default_manager.filter(
+            **{f"{self.fk_column}__in": [row[pk_column] for row in rows]}
+        ).values(self.fk_column, *self.plan.columns)
+        for child in children:
+            by_parent[child[self.fk_column]].append(child)
+        children = [child for group in by_parent.values() for child in group]
+        self.plan.load_nested(children)
+        for row in rows:
+            row[self.name] = by_parent.get(row[pk_column], [])
+
+
+class RowPlan:
+    def __init__(self, model, entries, columns):
+        self.model = model
+        # ``(name, column, converter, relation)`` in serializer field order.
+        self.entries = entries
+        self.columns = columns
+        self.pk_column = model._meta.pk.name
+        self.relations = [entry[3] for entry in entries if entry[3] is not None]
+
+    def load_nested(self, rows):
+        if rows:
+            for relation in self.relations:
+                relation.load(rows, self.pk_column)
+
+    def render(self, rows):
+        entries = self.entries
+        rendered = []
+        for row in rows:
+            item = {}
+            for name, column, convert, relation in entries:
+                if relation is not None:
+                    item[name] = relation.plan.render(row[name])
+                    continue
+                value = row[column]
+                item[name] = (
+                    value if convert is None or value is None else convert(value)
+                )
+            rendered.append(item)
+        return rendered
+
+
+def compile_plan(serializer, required=(), nested_required=()):
+    """
+    Compile a ``RowPlan`` for the fields of ``serializer`` (a model
+    serializer instance), or return ``None`` if it cannot be rendered from
+    ``values()``. ``required`` columns are fetched without being rendered,
+    ``nested_required`` likewise for nested serializers.
+    """
+    key = (
+        type(serializer),
+        _shape(serializer),
+        tuple(required),
+        tuple(nested_required),
+    )
+    return _plans.get(key, lambda: _compile(serializer, required, nested_required))
+
+
+def _shape(serializer):
+    return tuple(
+        (name, _shape(field.child) if hasattr(field, "child") else None)
+        for name, field in serializer.fields.items()
+    )
+
+
+def _compile(serializer, required, nested_required):
+    meta = getattr(serializer, "Meta", None)
+    model = getattr(meta, "model", None)
+    if model is None:
+        return None
+
+    entries = []
+    columns = {model._meta.pk.name, *required}
+    for name, field in serializer.fields.items():
+        if field.source == "*" or "." in field.source:
+            return None
+        try:
+            model_field = model._meta.get_field(field.source)
+        except FieldDoesNotExist:
+            return None
+
+        if isinstance(field, serializers.ListSerializer):
+            relation = _compile_relation(name, field, model_field, nested_required)
+            if relation is None:
+                return None
+            entries.append((name, None, None, relation))
+        elif isinstance(field, serializers.PrimaryKeyRelatedField):
+            if not model_field.concrete or field.pk_field is not None:
+                return None
+            entries.append((name, field.source, None, None))
+            columns.add(field.source)
+        elif isinstance(field, (serializers.RelatedField, serializers.BaseSerializer)):
+            return None
+        elif model_field.concrete and not model_field.is_relation:
+            # An unbound copy, the plan outlives the request of ``field``.
+            convert = (
+                None
+                if type(field) in IDENTITY_FIELDS
+                else copy.deepcopy(field).to_representation
+            )
+            entries.append((name, field.source, convert, None))
+            columns.add(field.source)
+        else:
+            return None
+    return RowPlan(model, entries, sorted(columns))
+
+
+def _compile_relation(name, field, model_field, required):
+    if not model_field.one_to_many or model_field.concrete:
+        return None
+    plan = compile_plan(field.child, required, required)
+    if plan is None:
+        return None
+    return NestedRelation(
+        name, model_field.related_model, model_field.field.attname, plan
+    )
+
+
+class FastListMixin:
+    """Serve ``list`` through a ``RowPlan`` when the serializer allows it."""
+
+    fast_actions = ("list",)
+    # Columns needed besides the rendered ones: ETag validators and the cursor.
+    fast_required_columns = ("id", "updated_at")
+
+    def get_fast_plan(self):
+        if not hasattr(self, "_fast_plan"):
+            self._fast_plan = None
+            if (
+                settings.API_FAST_SERIALIZATION
+                and self.action in self.fast_actions
+                and self.paginator is not None
+            ):
+                # Built through get_serializer so sparse fieldsets apply.
+                self._fast_plan = compile_plan(
+                    super().get_serializer(),
+                    required_columns(self, self.fast_required_columns),
+                    self.fast_required_columns,
+                )
+        return self._fast_plan
+
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        plan = self.get_fast_plan()
+        if plan is None:
+            return queryset
+        return (
+            queryset.select_related(None).prefetch_related(None).values(*plan.columns)
+        )
+
+    def paginate_queryset(self, queryset):
+        page = super().paginate_queryset(queryset)
+        plan = self.get_fast_plan()
+        if plan is not None and page is not None:
+            plan.load_nested(page)
+        return page
+
+    def get_serializer(self, *args, **kwargs):
+        plan = self.get_fast_plan()
+        if plan is None or not kwargs.get("many"):
+            return super().get_serializer(*args, **kwargs)
+        return FastListSerializer(plan, args[0] if args else kwargs["instance"])
+
+    def get_validator_parts(self, obj):
+        if not isinstance(obj, dict):
+            return super().get_validator_parts(obj)
+        plan = self.get_fast_plan()
+        return (
+            obj[plan.pk_column],
+            obj["updated_at"],
+            *(
+                [
+                    (child[relation.plan.pk_column], child["updated_at"])
+                    for child in obj[relation.name]
+                ]
+                for relation in plan.relations
+            ),
+        )
+
+    def get_last_modified(self, obj):
+        if not isinstance(obj, dict):
+            return super().get_last_modified(obj)
+        return max(
+            [
+                obj["updated_at"],
+                *(
+                    child["updated_at"]
+                    for relation in self.get_fast_plan().relations
+                    for child in obj[relation.name]
+                ),
+            ]
+        )
+
+
+class FastListSerializer:
+    """The part of the list serializer interface used by list actions."""
+
+    def __init__(self, plan, rows):
+        self.plan = plan
+        self.rows = rows
+
+    @property
+    def data(self):
+        # Bypasses TimedSerializerMixin, so report the render here.
+        with timer("serialize"):
+            return self.plan.render(self.rows)
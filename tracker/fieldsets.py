@@ -0,0 +1,158 @@
+from django.core.exceptions import FieldDoesNotExist
+from rest_framework import serializers
+
+
+def parse_fieldset(values) -> dict:
+    """
+    Parse ``["id,title", "tasks.status"]`` into ``{"id": None, "title": None,
+    "tasks": {"status": None}}``. ``None`` selects a field as a whole.
+    """
+    spec = {}
+    for value in values:
+        for path in filter(None, (part.strip() for part in value.split(","))):
+            name, _, rest = path.partition(".")
+            if not rest:
+                spec[name] = None
+            elif spec.get(name, {}) is not None:
+                spec.setdefault(name, {}).update(parse_fieldset([rest]))
+    return spec
+
+
+class Fieldset:
+    """The fields selected by ``?fields=`` and ``?exclude=``."""
+
+    def __init__(self, include=None, exclude=None):
+        self.include = include
+        self.exclude = exclude or {}
+
+    def __repr__(self):
+        return f"Fieldset({self.include!r}, {self.exclude!r})"
+
+    def includes(self, name) -> bool:
+        if self.exclude.get(name, {}) is None:
+            return False
+        return self.include is None or name in self.include
+
+    def nested(self, name):
+        """The fieldset of the nested serializer ``name``, if restricted."""
+        include = (self.include or {}).get(name)
+        exclude = self.exclude.get(name)
+        if include is None and exclude is None:
+            return None
+        return Fieldset(include, exclude)
+
+    def apply(self, serializer):
+        """Drop the unselected fields of ``serializer`` and its nested ones."""
+        fields = serializer.fields
+        unknown = {*(self.include or {}), *self.exclude} - set(fields)
+        if unknown:
+            raise serializers.ValidationError(
+                {"fields": [f"Unknown field: {name}" for name in sorted(unknown)]}
+            )
+        for name in list(fields):
+            if not self.includes(name):
+                fields.pop(name)
+                continue
+            nested = self.nested(name)
+            if nested is not None:
+                field = fields[name]
+                nested.apply(getattr(field, "child", field))
+        return serializer
+
+
+def model_columns(serializer, model, required=()):
+    """
+    Model fields the serializer reads, for ``QuerySet.only()``. Reverse
+    relations are left to prefetching. Returns ``None`` when a field reads
+    something other than a model field, since deferring could then turn
+    into a query per row.
+    """
+    columns = set(required)
+    for field in serializer.fields.values():
+        if field.source == "*":
+            return None
+        name = field.source.split(".")[0]
+        try:
+            model_field = model._meta.get_field(name)
+        except FieldDoesNotExist:
+            return None
+        if model_field.concrete:
+            columns.add(model_field.name)
+        elif not model_field.is_relation:
+            return None
+    return columns
+
+
+def required_columns(view, base=("id", "updated_at")):
+    """
+    Columns a list view reads whatever it renders: ``base`` (ETag
+    validators) plus the ones the ordering and the cursor sort on.
+    """
+    return [
+        *base,
+        *(field.lstrip("-") for field in view.ordering or ()),
+        *(getattr(view, "ordering_fields", None) or ()),
+    ]
+
+
+class SparseFieldsetMixin:
+    """
+    ``?fields=`` / ``?exclude=`` for ``list`` and ``retrieve``.
+
+    Both take comma separated field names; ``tasks.title`` selects inside a
+    nested serializer. The unselected fields are dropped from the response
+    and from the SQL through ``QuerySet.only()``.
+    """
+
+    fields_param = "fields"
+    exclude_param = "exclude"
+    sparse_actions = ("list", "retrieve")
+    # Columns needed whatever the fieldset: ETag validators and the cursor.
+    sparse_required_columns = ("id", "updated_at")
+
+    def get_fieldset(self):
+        if not hasattr(self, "_fieldset"):
+            self._fieldset = None
+            params = self.request.query_params
+            if self.action in self.sparse_actions and (
+                self.fields_param in params or self.exclude_param in params
+            ):
+                self._fieldset = Fieldset(
+                    parse_fieldset(params.getlist(self.fields_param)) or None,
+                    parse_fieldset(params.getlist(self.exclude_param)),
+                )
+        return self._fieldset
+
+    def get_sparse_columns(self, serializer_class, fieldset, model, required=()):
+        serializer = fieldset.apply(serializer_class(context={}))
+        return model_columns(serializer, model, required)
+
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        fieldset = self.get_fieldset()
+        if fieldset is None:
+            return queryset
+        columns = self.get_sparse_columns(
+            self.get_serializer_class(),
+            fieldset,
+            queryset.model,
+            required_columns(self, self.sparse_required_columns),
+        )
+        if columns is None:
+            return queryset
+        # Relations are rendered as primary keys, joins would only add columns.
+        return queryset.select_related(None).only(*columns)
+
+    def get_serializer(self, *args, **kwargs):
+        serializer = super().get_serializer(*args, **kwargs)
+        fieldset = self.get_fieldset()
+        if fieldset is not None:
+            fieldset.apply(getattr(serializer, "child", serializer))
+        return serializer
+
+    def get_validators(self, objects, *extra):
+        fieldset = self.get_fieldset()
+        if fieldset is not None:
+            # The same rows render differently per fieldset.
+            extra = (*extra, repr(fieldset))
+        return super().get_validators(objects, *extra)
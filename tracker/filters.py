@@ -0,0 +1,21 @@
+from django_filters import rest_framework as filters
+
+from tracker.models import Task
+
+
+class TaskFilter(filters.FilterSet):
+    # Foreign keys are filtered on the raw ``*_id`` column so that a filter
+    # does not cost an extra lookup query to validate the referenced row.
+    project = filters.NumberFilter(field_name="project_id")
+    sprint = filters.NumberFilter(field_name="sprint_id")
+    assignee = filters.NumberFilter(field_name="assignee_id")
+
+    class Meta:
+        model = Task
+        fields = {
+            "status": ["exact", "in"],
+            "priority": ["exact", "in"],
+            "sprint": ["isnull"],
+            "assignee": ["isnull"],
+            "due_date": ["exact", "gte", "lte", "isnull"],
+        }
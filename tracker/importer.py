@@ -0,0 +1,220 @@
+import csv
+import json
+import time
+from itertools import islice
+
+from django.contrib.auth import get_user_model
+from django.db import transaction
+from django.utils import timezone
+from django.utils.dateparse import parse_date, parse_datetime
+
+from tracker.cache import invalidate
+from tracker.counters import count_tasks
+from tracker.models import (
+    ImportCheckpoint,
+    Project,
+    Sprint,
+    Task,
+    TaskPriorityChoices,
+    TaskStatusChoices,
+)
+
+User = get_user_model()
+
+IMPORT_FORMATS = ("csv", "ndjson")
+
+TITLE_MAX_LENGTH = Task._meta.get_field("title").max_length
+
+
+class ImportRowError(ValueError):
+    pass
+
+
+def read_rows(stream, import_format: str):
+    """
+    Lazily yield input rows as dicts; blank CSV cells become ``None``. An
+    NDJSON line that does not parse is yielded as an ``ImportRowError``, so
+    it is reported with its row number (or skipped) like any invalid row.
+    """
+    if import_format == "csv":
+        for row in csv.DictReader(stream):
+            yield {key: (value if value != "" else None) for key, value in row.items()}
+    else:
+        for line in stream:
+            if line.strip():
+                try:
+                    yield json.loads(line)
+                except json.JSONDecodeError as exc:
+                    yield ImportRowError(f"invalid JSON: {exc.msg}")
+
+
+def _int(value, name):
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        raise ImportRowError(f"{name}: expected an integer, got {value!r}")
+
+
+def _choice(value, name, choices, default):
+    if value is None:
+        return default
+    value = _int(value, name)
+    if value not in choices.values:
+        raise ImportRowError(f"{name}: {value!r} is not a valid choice")
+    return value
+
+
+def _parse(value, name, parser):
+    if value is None:
+        return None
+    try:
+        parsed = parser(value)
+    except (TypeError, ValueError):
+        parsed = None
+    if parsed is None:
+        raise ImportRowError(f"{name}: invalid value {value!r}")
+    return parsed
+
+
+class TaskImporter:
+    """
+    Bulk loader for tasks.
+
+    Projects, sprints and users are resolved from lookup maps built once up
+    front, rows are inserted with ``bulk_create`` and every ``transaction_size``
+    rows are committed together. Each transaction also saves the number of
+    consumed input rows to the ``checkpoint`` ``ImportCheckpoint``, so an
+    interrupted import resumes exactly after the last committed row.
+    """
+
+    def __init__(
+        self,
+        batch_size=1000,
+        transaction_size=10000,
+        checkpoint=None,
+        skip_invalid=False,
+        log=None,
+    ):
+        self.batch_size = batch_size
+        self.transaction_size = transaction_size
+        self.checkpoint = checkpoint
+        self.skip_invalid = skip_invalid
+        self.log = log or (lambda message: None)
+
+        self.project_ids = set(Project.objects.values_list("id", flat=True))
+        self.sprint_projects = dict(Sprint.objects.values_list("id", "project_id"))
+        self.user_ids = set(User.objects.values_list("id", flat=True))
+        self.usernames = dict(User.objects.values_list(User.USERNAME_FIELD, "id"))
+
+    def read_checkpoint(self) -> int:
+        if not self.checkpoint:
+            return 0
+        checkpoint = ImportCheckpoint.objects.filter(name=self.checkpoint).first()
+        return checkpoint.position if checkpoint else 0
+
+    def write_checkpoint(self, position: int):
+        """Save ``position``, in the transaction of the rows it covers."""
+        if not self.checkpoint:
+            return
+        ImportCheckpoint.objects.update_or_create(
+            name=self.checkpoint, defaults={"position": position}
+        )
+
+    def build_task(self, row) -> Task:
+        if isinstance(row, ImportRowError):
+            raise row
+        if not isinstance(row, dict):
+            raise ImportRowError(f"expected an object, got {type(row).__name__}")
+
+        project_id = _int(row.get("project"), "project")
+        if project_id not in self.project_ids:
+            raise ImportRowError(f"project: {project_id} does not exist")
+
+        sprint_id = row.get("sprint")
+        if sprint_id is not None:
+            sprint_id = _int(sprint_id, "sprint")
+            if self.sprint_projects.get(sprint_id) != project_id:
+                raise ImportRowError(
+                    f"sprint: {sprint_id} does not exist in project {project_id}"
+                )
+
+        assignee_id = row.get("assignee")
+        if assignee_id is not None:
+            if str(assignee_id).isdigit():
+                assignee_id = int(assignee_id)
+                if assignee_id not in self.user_ids:
+                    raise ImportRowError(f"assignee: user {assignee_id} not found")
+            elif isinstance(assignee_id, str) and assignee_id in self.usernames:
+                assignee_id = self.usernames[assignee_id]
+            else:
+                raise ImportRowError(f"assignee: user {assignee_id!r} not found")
+
+        title = row.get("title")
+        if not title:
+            raise ImportRowError("title: this field is required")
+        if not isinstance(title, str):
+            raise ImportRowError(f"title: expected a string, got {title!r}")
+        if len(title) > TITLE_MAX_LENGTH:
+            raise ImportRowError(f"title: longer than {TITLE_MAX_LENGTH} characters")
+
+        description = row.get("description") or ""
+        if not isinstance(description, str):
+            raise ImportRowError(f"description: expected a string, got {description!r}")
+
+        due_date = _parse(row.get("due_date"), "due_date", parse_date)
+        completed_at = _parse(row.get("completed_at"), "completed_at", parse_datetime)
+        if completed_at is not None and timezone.is_naive(completed_at):
+            completed_at = timezone.make_aware(completed_at)
+
+        return Task(
+            project_id=project_id,
+            sprint_id=sprint_id,
+            assignee_id=assignee_id,
+            title=title,
+            description=description,
+            status=_choice(
+                row.get("status"), "status", TaskStatusChoices, TaskStatusChoices.TO_DO
+            ),
+            priority=_choice(
+                row.get("priority"),
+                "priority",
+                TaskPriorityChoices,
+                TaskPriorityChoices.MEDIUM,
+            ),
+            completed_at=completed_at,
+            due_date=due_date,
+        )
+
+    def run(self, rows, resume=False) -> dict:
+        """Import ``rows`` and return ``{"imported", "skipped", "position"}``."""
+        position = self.read_checkpoint() if resume else 0
+        rows = islice(rows, position, None)
+        imported = skipped = 0
+        started = time.monotonic()
+
+        while chunk := list(islice(rows, self.transaction_size)):
+            tasks = []
+            for offset, row in enumerate(chunk, start=position + 1):
+                try:
+                    tasks.append(self.build_task(row))
+                except ImportRowError as exc:
+                    if not self.skip_invalid:
+                        raise ImportRowError(f"row {offset}: {exc}") from exc
+                    self.log(f"Skipping row {offset}: {exc}")
+                    skipped += 1
+
+            position += len(chunk)
+            with transaction.atomic():
+                Task.objects.bulk_create(tasks, batch_size=self.batch_size)
+                count_tasks(created=tasks)
+                self.write_checkpoint(position)
+                invalidate(Task)
+            imported += len(tasks)
+
+            elapsed = max(time.monotonic() - started, 1e-9)
+            self.log(
+                f"Imported {imported} rows ({imported / elapsed:.0f} rows/s), "
+                f"input position {position}"
+            )
+
+        return {"imported": imported, "skipped": skipped, "position": position}
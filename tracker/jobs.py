@@ -0,0 +1,136 @@
+"""
+Background jobs kept in the database, without an external broker.
+
+``enqueue`` stores a ``Job`` naming one of ``JOB_HANDLERS`` with JSON
+arguments; ``manage.py run_jobs`` workers claim due jobs and run them
+outside the web workers. On PostgreSQL a job is claimed with ``SELECT ...
+FOR UPDATE SKIP LOCKED``, so workers never wait on each other. SQLite has
+no row locks, there the conditional ``UPDATE`` that marks the job running
+is the claim and a worker that lost the race looks for the next job.
+
+A failing job is retried ``API_JOBS_MAX_ATTEMPTS`` times in total, with a
+delay of ``API_JOBS_RETRY_SECONDS`` doubling per attempt. A job running
+longer than ``API_JOBS_TIMEOUT_SECONDS`` is taken to belong to a dead worker
+and claimed again, so handlers have to be safe to rerun; one that has used
+up its attempts fails instead. ``manage.py prune_jobs`` deletes the jobs
+finished more than ``API_JOBS_RETENTION_DAYS`` ago.
+"""
+
+import traceback
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.files.storage import default_storage
+from django.db import connections, transaction
+from django.db.models import F, Q
+from django.utils import timezone
+from django.utils.module_loading import import_string
+
+from tracker.models import Job, JobStatusChoices
+
+# Job name -> dotted path of the function called with the job's arguments.
+# Its return value, which must be JSON serializable, is the job's result.
+# A ``file`` in the result names a file in the default storage, which is
+# deleted with the job.
+JOB_HANDLERS = {
+    "delete": "tracker.deletion.deletion_job",
+    "export_tasks": "tracker.export.export_job",
+    "reconcile_task_counts": "tracker.counters.reconcile_task_counts",
+}
+
+
+def enqueue(name, args=None, user=None, run_at=None) -> Job:
+    """Queue the job ``name``; workers see it once the transaction commits."""
+    if name not in JOB_HANDLERS:
+        raise ValueError(f"Unknown job {name!r}.")
+    return Job.objects.create(
+        name=name,
+        args=args or {},
+        created_by=user,
+        max_attempts=settings.API_JOBS_MAX_ATTEMPTS,
+        run_at=run_at or timezone.now(),
+    )
+
+
+def retry_delay(attempts) -> timedelta:
+    return timedelta(seconds=settings.API_JOBS_RETRY_SECONDS * 2 ** (attempts - 1))
+
+
+def claim_job():
+    """Mark the next due job running and return it, or ``None``."""
+    now = timezone.now()
+    stale = now - timedelta(seconds=settings.API_JOBS_TIMEOUT_SECONDS)
+    due = Job.objects.filter(
+        Q(status=JobStatusChoices.QUEUED, run_at__lte=now)
+        | Q(status=JobStatusChoices.RUNNING, started_at__lt=stale)
+    ).order_by("run_at", "id")
+    if connections[due.db].features.has_select_for_update_skip_locked:
+        due = due.select_for_update(skip_locked=True)
+
+    while True:
+        with transaction.atomic():
+            job = due.only("id", "status", "attempts", "max_attempts").first()
+            if job is None:
+                return None
+            unchanged = Job.objects.filter(
+                pk=job.pk, status=job.status, attempts=job.attempts
+            )
+            if (
+                job.status == JobStatusChoices.RUNNING
+                and job.attempts >= job.max_attempts
+            ):
+                unchanged.update(
+                    status=JobStatusChoices.FAILED,
+                    error=f"Timed out after {job.attempts} attempts.",
+                    finished_at=now,
+                )
+                continue
+            claimed = unchanged.update(
+                status=JobStatusChoices.RUNNING,
+                attempts=F("attempts") + 1,
+                started_at=now,
+            )
+        if claimed:
+            return Job.objects.get(pk=job.pk)
+
+
+def run_job(job) -> Job:
+    """Run a claimed job and record its result, or schedule its retry."""
+    try:
+        result = import_string(JOB_HANDLERS[job.name])(**job.args)
+    except Exception:
+        job.error = traceback.format_exc()
+        if job.attempts < job.max_attempts:
+            job.status = JobStatusChoices.QUEUED
+            job.run_at = timezone.now() + retry_delay(job.attempts)
+        else:
+            job.status = JobStatusChoices.FAILED
+            job.finished_at = timezone.now()
+    else:
+        job.status = JobStatusChoices.SUCCEEDED
+        job.result = result
+        job.error = ""
+        job.finished_at = timezone.now()
+    job.save(update_fields=["status", "run_at", "result", "error", "finished_at"])
+    return job
+
+
+def prune_jobs(days, batch_size=1000) -> int:
+    """
+    Delete the jobs that finished more than ``days`` ago, and their files.
+    Returns the number of deleted jobs.
+    """
+    cutoff = timezone.now() - timedelta(days=days)
+    expired = Job.objects.filter(
+        status__in=[JobStatusChoices.SUCCEEDED, JobStatusChoices.FAILED],
+        finished_at__lt=cutoff,
+    )
+    pruned = 0
+    while True:
+        jobs = list(expired.order_by("id").values_list("id", "result")[:batch_size])
+        if not jobs:
+            return pruned
+        for _, result in jobs:
+            if isinstance(result, dict) and result.get("file"):
+                default_storage.delete(result["file"])
+        pruned += Job.objects.filter(id__in=[pk for pk, _ in jobs]).delete()[0]
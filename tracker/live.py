@@ -0,0 +1,355 @@
+"""
+Live task events for sprint boards and projects.
+
+Saving or deleting a task publishes an event to the configured broker once
+the transaction commits. Each worker hands the events it receives from the
+broker to a single in-process ``Hub``, which fans them out to the
+Server-Sent Events streams open on that worker (see
+``tracker.async_views``), so a board needs one event instead of one poll of
+the full sprint per viewer.
+
+``API_LIVE_BROKER`` is the dotted path of a ``Broker`` class. The default
+``PostgresBroker`` carries events between all workers with ``LISTEN`` and
+``NOTIFY``, at the cost of one extra database connection per worker with
+open streams; processes that only publish never listen.
+``InMemoryBroker`` delivers within the publishing process only, which suits
+a single worker and the tests. Streams are only kept open under ASGI.
+"""
+
+import asyncio
+import json
+import logging
+import threading
+import time
+
+import psycopg
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, connections, transaction
+from django.utils.module_loading import import_string
+
+TASK_CREATED = "task.created"
+TASK_UPDATED = "task.updated"
+TASK_DELETED = "task.deleted"
+TASKS_MOVED = "tasks.moved"
+TASKS_CHANGED = "tasks.changed"
+
+logger = logging.getLogger(__name__)
+
+
+def sprint_channel(pk):
+    return f"sprint:{pk}"
+
+
+def project_channel(pk):
+    return f"project:{pk}"
+
+
+class Broker:
+    """
+    Carries events between workers. ``publish`` is called from synchronous
+    code after commit; ``start`` is called once per worker, when it opens its
+    first stream, with the function that delivers received events to the
+    worker's hub.
+    """
+
+    def start(self, deliver):
+        raise NotImplementedError
+
+    def publish(self, event):
+        raise NotImplementedError
+
+
+class InMemoryBroker(Broker):
+    """Delivers events to the hub of the publishing process only."""
+
+    def __init__(self):
+        self._deliver = None
+
+    def start(self, deliver):
+        self._deliver = deliver
+
+    def publish(self, event):
+        if self._deliver is not None:
+            self._deliver(event)
+
+
+class PostgresBroker(Broker):
+    """
+    Publishes events with ``NOTIFY`` on the default database. Each worker
+    serving streams ``LISTEN``s on a connection of its own, outside the
+    pool, in a daemon thread that reconnects after errors. Events published
+    while it reconnects are lost, like those a slow stream drops.
+    """
+
+    channel = "tracker_live"
+    # PostgreSQL rejects NOTIFY payloads of 8000 bytes and more.
+    max_payload = 7900
+    reconnect_seconds = 1
+
+    def start(self, deliver):
+        thread = threading.Thread(
+            target=self.listen, args=(deliver,), name="live-broker", daemon=True
+        )
+        thread.start()
+
+    def listen(self, deliver):
+        params = connections[DEFAULT_DB_ALIAS].get_connection_params()
+        while True:
+            try:
+                with psycopg.connect(**params, autocommit=True) as conn:
+                    conn.execute(f"LISTEN {self.channel}")
+                    for notify in conn.notifies():
+                        deliver(json.loads(notify.payload))
+            except psycopg.Error:
+                logger.exception("Live broker connection lost, reconnecting.")
+                time.sleep(self.reconnect_seconds)
+
+    def payload(self, event) -> str:
+        """
+        ``event`` as JSON. An event too large for a notification becomes a
+        ``tasks.changed`` event, which has the boards reload.
+        """
+        payload = json.dumps(event, default=str)
+        if len(payload.encode()) < self.max_payload:
+            return payload
+        return json.dumps(
+            {
+                "type": TASKS_CHANGED,
+                "sprints": [event["sprint"]] if event.get("sprint") else [],
+                "projects": [event["project"]] if event.get("project") else [],
+                "count": 1,
+                "channels": event["channels"],
+            }
+        )
+
+    def publish(self, event):
+        with connections[DEFAULT_DB_ALIAS].cursor() as cursor:
+            cursor.execute(
+                "SELECT pg_notify(%s, %s)", [self.channel, self.payload(event)]
+            )
+
+
+class Subscription:
+    """The events of some channels, queued for one stream."""
+
+    def __init__(self, channels, loop):
+        self.channels = channels
+        self.loop = loop
+        self.queue = asyncio.Queue(settings.API_LIVE_QUEUE_SIZE)
+        # Set when the client fell behind and events were dropped.
+        self.overflowed = False
+
+    def put(self, event):
+        try:
+            self.queue.put_nowait(event)
+        except asyncio.QueueFull:
+            self.overflowed = True
+
+    async def get(self, timeout):
+        """The next event, or ``None`` after ``timeout`` seconds."""
+        try:
+            return await asyncio.wait_for(self.queue.get(), timeout)
+        except TimeoutError:
+            return None
+
+
+class Hub:
+    """Per-worker fan-out of broker events to the open streams."""
+
+    def __init__(self):
+        self._subscriptions = {}
+        self._lock = threading.Lock()
+
+    def subscribe(self, channels):
+        """Subscribe to ``channels``, from the event loop of the stream."""
+        subscription = Subscription(set(channels), asyncio.get_running_loop())
+        with self._lock:
+            for channel in subscription.channels:
+                self._subscriptions.setdefault(channel, set()).add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription):
+        with self._lock:
+            for channel in subscription.channels:
+                subscribers = self._subscriptions.get(channel)
+                if subscribers is not None:
+                    subscribers.discard(subscription)
+                    if not subscribers:
+                        del self._subscriptions[channel]
+
+    def subscriber_count(self):
+        with self._lock:
+            return len(set().union(*self._subscriptions.values()))
+
+    def dispatch(self, event):
+        """Queue ``event`` for its subscribers; callable from any thread."""
+        with self._lock:
+            subscribers = set().union(
+                *(self._subscriptions.get(channel, ()) for channel in event["channels"])
+            )
+        for subscription in subscribers:
+            try:
+                subscription.loop.call_soon_threadsafe(subscription.put, event)
+            except RuntimeError:
+                pass  # The stream's loop is closed, it is unsubscribing.
+
+
+hub = Hub()
+_broker = None
+_listening = False
+_broker_lock = threading.Lock()
+
+
+def get_broker():
+    global _broker
+    if _broker is None:
+        with _broker_lock:
+            if _broker is None:
+                _broker = import_string(settings.API_LIVE_BROKER)()
+    return _broker
+
+
+def start_listening():
+    """Deliver broker events to the hub, from the first stream of the worker."""
+    global _listening
+    broker = get_broker()
+    if not _listening:
+        with _broker_lock:
+            if not _listening:
+                broker.start(hub.dispatch)
+                _listening = True
+    return broker
+
+
+def reset_broker():
+    """Drop the broker, e.g. after ``API_LIVE_BROKER`` changed in tests."""
+    global _broker, _listening
+    with _broker_lock:
+        _broker = None
+        _listening = False
+
+
+def live_enabled() -> bool:
+    return settings.API_LIVE_ENABLED
+
+
+def publish(event):
+    """Publish ``event`` once the current transaction commits."""
+    transaction.on_commit(lambda: get_broker().publish(event))
+
+
+def task_event(event_type, task, data=None, previous=None) -> dict:
+    """
+    The event of a task change. ``previous`` holds the sprint and project
+    the task was loaded with, so a moved task also leaves its old board.
+    """
+    channels = {sprint_channel(task.sprint_id), project_channel(task.project_id)}
+    if previous:
+        channels.update(
+            {
+                sprint_channel(previous.get("sprint_id")),
+                project_channel(previous.get("project_id")),
+            }
+        )
+    channels.discard(sprint_channel(None))
+    channels.discard(project_channel(None))
+    event = {
+        "type": event_type,
+        "id": task.pk,
+        "sprint": task.sprint_id,
+        "project": task.project_id,
+        "channels": sorted(channels),
+    }
+    if data is not None:
+        event["data"] = data
+    return event
+
+
+def publish_tasks(event_type, tasks, serializer_class=None):
+    """
+    Publish an event per task, with the task rendered by ``serializer_class``
+    unless it was deleted.
+    """
+    if not live_enabled():
+        return
+    for task in tasks:
+        data = None if serializer_class is None else serializer_class(task).data
+        publish(
+            task_event(event_type, task, data, getattr(task, "_loaded_state", None))
+        )
+
+
+def publish_moved(sprint, rollover_to, count):
+    """Tell both boards to reload after tasks were moved with one UPDATE."""
+    if not live_enabled() or not count:
+        return
+    channels = {sprint_channel(sprint.pk), project_channel(sprint.project_id)}
+    if rollover_to is not None:
+        channels.add(sprint_channel(rollover_to.pk))
+    publish(
+        {
+            "type": TASKS_MOVED,
+            "sprint": sprint.pk,
+            "rollover_to": rollover_to and rollover_to.pk,
+            "project": sprint.project_id,
+            "count": count,
+            "channels": sorted(channels),
+        }
+    )
+
+
+def publish_changed(sprint_ids, project_ids, count):
+    """Tell the boards to reload after a set-based update of their tasks."""
+    if not live_enabled() or not count:
+        return
+    channels = {sprint_channel(pk) for pk in sprint_ids if pk is not None}
+    channels.update(project_channel(pk) for pk in project_ids)
+    publish(
+        {
+            "type": TASKS_CHANGED,
+            "sprints": sorted(pk for pk in sprint_ids if pk is not None),
+            "projects": sorted(project_ids),
+            "count": count,
+            "channels": sorted(channels),
+        }
+    )
+
+
+def publish_bulk(tasks):
+    """
+    One ``tasks.changed`` event for a bulk write, rather than a notification
+    per task. Moved tasks also reload the boards they left.
+    """
+    sprint_ids, project_ids = set(), set()
+    for task in tasks:
+        previous = getattr(task, "_loaded_state", {})
+        sprint_ids.update([task.sprint_id, previous.get("sprint_id")])
+        project_ids.update([task.project_id, previous.get("project_id")])
+    project_ids.discard(None)
+    publish_changed(sprint_ids, project_ids, len(tasks))
+
+
+def format_event(event) -> str:
+    payload = {key: value for key, value in event.items() if key != "channels"}
+    return f"event: {event['type']}\ndata: {json.dumps(payload, default=str)}\n\n"
+
+
+async def stream(channels):
+    """
+    Server-Sent Events of ``channels``. A comment is sent every
+    ``API_LIVE_HEARTBEAT_SECONDS`` to keep proxies from closing the
+    connection; a client that falls behind gets a ``resync`` event and the
+    stream ends, since it has to reload the board anyway.
+    """
+    start_listening()
+    subscription = hub.subscribe(channels)
+    try:
+        yield f"retry: {settings.API_LIVE_RETRY_MS}\n: connected\n\n"
+        while True:
+            event = await subscription.get(settings.API_LIVE_HEARTBEAT_SECONDS)
+            if subscription.overflowed:
+                yield 'event: resync\ndata: {"type": "resync"}\n\n'
+                return
+            yield ": keepalive\n\n" if event is None else format_event(event)
+    finally:
+        hub.unsubscribe(subscription)
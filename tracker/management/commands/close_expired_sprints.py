@@ -0,0 +1,52 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.utils import timezone
+
+from tracker.models import Sprint, SprintStatusChoices
+
+
+class Command(BaseCommand):
+    help = (
+        "Close sprints whose end date has passed and roll their unfinished "
+        "tasks over to the backlog (or to the project's next open sprint)."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=100,
+            help="Number of sprints closed per transaction.",
+        )
+        parser.add_argument(
+            "--to-next",
+            action="store_true",
+            help="Move unfinished tasks to the project's next open sprint "
+            "instead of the backlog.",
+        )
+
+    def handle(self, *args, batch_size, to_next, **options):
+        today = timezone.localdate()
+        expired = Sprint.objects.filter(end_date__lt=today).exclude(
+            status=SprintStatusChoices.COMPLETED
+        )
+
+        closed = moved = 0
+        while True:
+            with transaction.atomic():
+                batch = list(
+                    expired.select_for_update(skip_locked=True).order_by(
+                        "end_date", "id"
+                    )[:batch_size]
+                )
+                if not batch:
+                    break
+                for sprint in batch:
+                    rollover_to = sprint.next_sprint() if to_next else None
+                    moved += sprint.close(rollover_to=rollover_to)
+            closed += len(batch)
+            self.stdout.write(f"Closed {closed} sprints, moved {moved} tasks")
+
+        self.stdout.write(
+            self.style.SUCCESS(f"Done: closed {closed} sprints, moved {moved} tasks")
+        )
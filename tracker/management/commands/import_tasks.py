@@ -0,0 +1,86 @@
+import os
+import sys
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from tracker.importer import IMPORT_FORMATS, ImportRowError, TaskImporter, read_rows
+
+
+class Command(BaseCommand):
+    help = (
+        "Bulk import tasks from a CSV or NDJSON file using the same columns as "
+        "the task export. Progress is checkpointed in the database with every "
+        "transaction so a failed import can be continued with --resume."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("path", help="Input file, or '-' for stdin.")
+        parser.add_argument(
+            "--format",
+            dest="import_format",
+            choices=IMPORT_FORMATS,
+            help="Input format. Guessed from the file extension by default.",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=1000,
+            help="Rows per INSERT statement.",
+        )
+        parser.add_argument(
+            "--transaction-size",
+            type=int,
+            default=10000,
+            help="Rows committed per transaction.",
+        )
+        parser.add_argument(
+            "--checkpoint",
+            help="Name of the checkpoint. Defaults to the absolute input path.",
+        )
+        parser.add_argument(
+            "--resume",
+            action="store_true",
+            help="Skip the input rows recorded in the checkpoint.",
+        )
+        parser.add_argument(
+            "--skip-invalid",
+            action="store_true",
+            help="Log and skip invalid rows instead of stopping.",
+        )
+
+    def handle(self, *args, path, import_format, checkpoint, resume, **options):
+        if import_format is None:
+            import_format = os.path.splitext(path)[1].lstrip(".").lower()
+            if import_format not in IMPORT_FORMATS:
+                raise CommandError("Cannot guess the input format, use --format.")
+        if checkpoint is None and path != "-":
+            checkpoint = os.path.abspath(path)
+
+        importer = TaskImporter(
+            batch_size=options["batch_size"],
+            transaction_size=options["transaction_size"],
+            checkpoint=checkpoint,
+            skip_invalid=options["skip_invalid"],
+            log=self.stdout.write,
+        )
+
+        started = time.monotonic()
+        stream = sys.stdin if path == "-" else open(path, newline="")
+        try:
+            result = importer.run(read_rows(stream, import_format), resume=resume)
+        except ImportRowError as exc:
+            raise CommandError(
+                f"Import stopped at {exc}. Fix the input and rerun with --resume."
+            )
+        finally:
+            if stream is not sys.stdin:
+                stream.close()
+
+        elapsed = max(time.monotonic() - started, 1e-9)
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Imported {result['imported']} tasks, skipped {result['skipped']} "
+                f"in {elapsed:.1f}s ({result['imported'] / elapsed:.0f} rows/s)"
+            )
+        )
@@ -0,0 +1,29 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from tracker.jobs import prune_jobs
+
+
+class Command(BaseCommand):
+    help = (
+        "Delete finished background jobs older than the job retention, with "
+        "the files they wrote (e.g. exports)."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--days",
+            type=int,
+            default=settings.API_JOBS_RETENTION_DAYS,
+            help="Keep jobs that finished less than this many days ago.",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=1000,
+            help="Number of jobs deleted per query.",
+        )
+
+    def handle(self, *args, days, batch_size, **options):
+        pruned = prune_jobs(days, batch_size)
+        self.stdout.write(self.style.SUCCESS(f"Pruned {pruned} jobs"))
@@ -0,0 +1,41 @@
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from tracker.models import Tombstone
+
+
+class Command(BaseCommand):
+    help = (
+        "Delete sync tombstones older than the sync token lifetime; tokens "
+        "that could still need them are rejected by the sync endpoint."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--days",
+            type=int,
+            default=settings.API_SYNC_RETENTION_DAYS,
+            help="Keep tombstones younger than this many days.",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=10000,
+            help="Number of tombstones deleted per query.",
+        )
+
+    def handle(self, *args, days, batch_size, **options):
+        cutoff = timezone.now() - timedelta(days=days)
+        expired = Tombstone.objects.filter(deleted_at__lt=cutoff)
+
+        pruned = 0
+        while True:
+            ids = list(expired.order_by("id").values_list("id", flat=True)[:batch_size])
+            if not ids:
+                break
+            pruned += Tombstone.objects.filter(id__in=ids).delete()[0]
+
+        self.stdout.write(self.style.SUCCESS(f"Pruned {pruned} tombstones"))
@@ -0,0 +1,37 @@
+from django.core.management.base import BaseCommand
+
+from tracker.counters import reconcile_task_counts
+from tracker.jobs import enqueue
+
+
+class Command(BaseCommand):
+    help = (
+        "Recount the tasks of every sprint and project and repair the "
+        "per-status counters that drifted."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="Only report the number of drifted rows.",
+        )
+        parser.add_argument(
+            "--background",
+            action="store_true",
+            help="Queue the reconciliation for the run_jobs workers.",
+        )
+
+    def handle(self, *args, dry_run, background, **options):
+        if background:
+            job = enqueue("reconcile_task_counts", {"dry_run": dry_run})
+            self.stdout.write(self.style.SUCCESS(f"Queued {job}"))
+            return
+        repaired = reconcile_task_counts(dry_run=dry_run)
+        verb = "Found" if dry_run else "Repaired"
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"{verb} {repaired['sprint']} sprints and "
+                f"{repaired['project']} projects with drifted counters"
+            )
+        )
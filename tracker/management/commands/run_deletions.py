@@ -0,0 +1,33 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from tracker.deletion import pending_deletions, run_deletion
+
+
+class Command(BaseCommand):
+    help = (
+        "Delete the projects and sprints whose deletion was requested, their "
+        "tasks in batches. Interrupted deletions resume where they stopped."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=settings.API_DELETION_BATCH_SIZE,
+            help="Number of tasks deleted per transaction.",
+        )
+
+    def handle(self, *args, batch_size, **options):
+        def progress(deletion):
+            self.stdout.write(
+                f"{deletion}: deleted {deletion.deleted_tasks} of "
+                f"{deletion.total_tasks} tasks"
+            )
+
+        finished = 0
+        for deletion in pending_deletions():
+            run_deletion(deletion, batch_size, progress)
+            finished += 1
+
+        self.stdout.write(self.style.SUCCESS(f"Finished {finished} deletions"))
@@ -0,0 +1,47 @@
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from tracker.jobs import claim_job, run_job
+from tracker.models import JobStatusChoices
+
+
+class Command(BaseCommand):
+    help = (
+        "Run queued background jobs. Start as many workers as needed, each "
+        "claims its own jobs."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--once",
+            action="store_true",
+            help="Exit once no job is due instead of waiting for new ones.",
+        )
+        parser.add_argument(
+            "--poll-interval",
+            type=float,
+            default=settings.API_JOBS_POLL_SECONDS,
+            help="Seconds to wait before looking for jobs again when idle.",
+        )
+
+    def handle(self, *args, once, poll_interval, **options):
+        ran = 0
+        while True:
+            job = claim_job()
+            if job is None:
+                if once:
+                    break
+                time.sleep(poll_interval)
+                continue
+
+            started = time.monotonic()
+            job = run_job(job)
+            ran += 1
+            self.stdout.write(
+                f"{job}: {JobStatusChoices(job.status).label} after attempt "
+                f"{job.attempts} in {time.monotonic() - started:.1f}s"
+            )
+
+        self.stdout.write(self.style.SUCCESS(f"Ran {ran} jobs"))
@@ -0,0 +1,247 @@
+"""
+Per-request instrumentation.
+
+With ``API_METRICS_ENABLED``, ``MetricsMiddleware`` tracks, for every
+request, the SQL queries issued and the time spent in them, in serializers,
+in authentication and in total. The numbers are returned to staff users in
+a ``Server-Timing`` header and aggregated per view and action into
+histograms, served in the Prometheus text format at ``/metrics`` to the
+``API_METRICS_ALLOWED_IPS`` and staff. Histograms live in the worker
+process, so every worker exposes its own series.
+
+Timings overlap: ``serialize`` includes the queries issued while
+serializing, and none of them cover streaming a response body.
+"""
+
+import bisect
+import threading
+import time
+from contextvars import ContextVar
+
+from asgiref.sync import iscoroutinefunction
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.utils.decorators import sync_and_async_middleware
+from rest_framework.fields import empty
+
+DURATION_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+QUERY_BUCKETS = (0, 1, 2, 5, 10, 20, 50, 100, 200, 500)
+LABELS = ("view", "action")
+
+_current = ContextVar("tracker_request_metrics", default=None)
+
+
+class RequestMetrics:
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.queries = 0
+        self.timings = {"db": 0.0, "serialize": 0.0, "auth": 0.0}
+        self.active = set()
+
+
+class timer:
+    """
+    Add the time spent in the block to the ``name`` timing of the current
+    request. Nested blocks of the same name are only counted once.
+    """
+
+    def __init__(self, name):
+        self.name = name
+        self.metrics = None
+
+    def __enter__(self):
+        metrics = _current.get()
+        if metrics is not None and self.name not in metrics.active:
+            metrics.active.add(self.name)
+            self.metrics = metrics
+            self.started = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info):
+        if self.metrics is not None:
+            self.metrics.timings[self.name] += time.perf_counter() - self.started
+            self.metrics.active.discard(self.name)
+
+
+def record_query(execute, sql, params, many, context):
+    """Database execute wrapper counting the queries of the current request."""
+    metrics = _current.get()
+    if metrics is None:
+        return execute(sql, params, many, context)
+    metrics.queries += 1
+    with timer("db"):
+        return execute(sql, params, many, context)
+
+
+class TimedSerializerMixin:
+    """Report the time spent in a serializer to the request metrics."""
+
+    def to_representation(self, instance):
+        with timer("serialize"):
+            return super().to_representation(instance)
+
+    def run_validation(self, data=empty):
+        with timer("serialize"):
+            return super().run_validation(data)
+
+
+class Histogram:
+    def __init__(self, name, documentation, buckets):
+        self.name = name
+        self.documentation = documentation
+        self.buckets = buckets
+        self._series = {}
+        self._lock = threading.Lock()
+
+    def observe(self, labels, value):
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(labels)
+            if series is None:
+                series = self._series[labels] = [[0] * len(self.buckets), 0.0, 0]
+            if index < len(self.buckets):
+                series[0][index] += 1
+            series[1] += value
+            series[2] += 1
+
+    def clear(self):
+        with self._lock:
+            self._series.clear()
+
+    def render(self):
+        lines = [
+            f"# HELP {self.name} {self.documentation}",
+            f"# TYPE {self.name} histogram",
+        ]
+        with self._lock:
+            series = sorted(
+                (labels, list(counts), total, count)
+                for labels, (counts, total, count) in self._series.items()
+            )
+        for labels, counts, total, count in series:
+            label_text = ",".join(
+                f'{name}="{_escape(value)}"' for name, value in zip(LABELS, labels)
+            )
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets, counts):
+                cumulative += bucket_count
+                lines.append(
+                    f'{self.name}_bucket{{{label_text},le="{bound:g}"}} {cumulative}'
+                )
+            lines.append(f'{self.name}_bucket{{{label_text},le="+Inf"}} {count}')
+            lines.append(f"{self.name}_sum{{{label_text}}} {total:g}")
+            lines.append(f"{self.name}_count{{{label_text}}} {count}")
+        return "\n".join(lines)
+
+
+def _escape(value):
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+REQUEST_DURATION = Histogram(
+    "tracker_request_duration_seconds",
+    "Time spent handling the request.",
+    DURATION_BUCKETS,
+)
+SQL_DURATION = Histogram(
+    "tracker_request_sql_duration_seconds",
+    "Time spent in SQL queries per request.",
+    DURATION_BUCKETS,
+)
+SERIALIZER_DURATION = Histogram(
+    "tracker_request_serializer_duration_seconds",
+    "Time spent in serializers per request.",
+    DURATION_BUCKETS,
+)
+AUTH_DURATION = Histogram(
+    "tracker_request_auth_duration_seconds",
+    "Time spent authenticating the request.",
+    DURATION_BUCKETS,
+)
+QUERIES = Histogram(
+    "tracker_request_queries",
+    "SQL queries issued per request.",
+    QUERY_BUCKETS,
+)
+HISTOGRAMS = (
+    REQUEST_DURATION,
+    SQL_DURATION,
+    SERIALIZER_DURATION,
+    AUTH_DURATION,
+    QUERIES,
+)
+
+
+def render_metrics() -> str:
+    return "\n".join(histogram.render() for histogram in HISTOGRAMS) + "\n"
+
+
+def reset_metrics():
+    for histogram in HISTOGRAMS:
+        histogram.clear()
+
+
+def request_labels(request, response):
+    """The ``(view, action)`` labels of a request."""
+    match = getattr(request, "resolver_match", None)
+    if match is None:
+        # Unrouted paths would otherwise create a series per URL.
+        return "unmatched", request.method.lower()
+    view = (getattr(response, "renderer_context", None) or {}).get("view")
+    return match.view_name, getattr(view, "action", None) or request.method.lower()
+
+
+def _finish(request, response, metrics):
+    total = time.perf_counter() - metrics.started
+    timings = metrics.timings
+    labels = request_labels(request, response)
+    if labels[0] != "metrics":
+        REQUEST_DURATION.observe(labels, total)
+        SQL_DURATION.observe(labels, timings["db"])
+        SERIALIZER_DURATION.observe(labels, timings["serialize"])
+        AUTH_DURATION.observe(labels, timings["auth"])
+        QUERIES.observe(labels, metrics.queries)
+
+    # The timings tell query counts and slow paths apart, keep them in-house.
+    user = getattr(request, "user", None)
+    if user is None or not user.is_staff:
+        return response
+    response["Server-Timing"] = ", ".join(
+        [
+            f'db;dur={timings["db"] * 1000:.1f};desc="{metrics.queries} queries"',
+            f"serialize;dur={timings['serialize'] * 1000:.1f}",
+            f"auth;dur={timings['auth'] * 1000:.1f}",
+            f"total;dur={total * 1000:.1f}",
+        ]
+    )
+    return response
+
+
+@sync_and_async_middleware
+def MetricsMiddleware(get_response):
+    if not settings.API_METRICS_ENABLED:
+        raise MiddlewareNotUsed
+
+    if iscoroutinefunction(get_response):
+
+        async def middleware(request):
+            metrics = RequestMetrics()
+            token = _current.set(metrics)
+            try:
+                response = await get_response(request)
+            finally:
+                _current.reset(token)
+            return _finish(request, response, metrics)
+
+        return middleware
+
+    def middleware(request):
+        metrics = RequestMetrics()
+        token = _current.set(metrics)
+        try:
+            response = get_response(request)
+        finally:
+            _current.reset(token)
+        return _finish(request, response, metrics)
+
+    return middleware
@@ -0,0 +1,27 @@
+# Generated by Django 5.2.6 on 2026-10-18 14:12
+
+from django.conf import settings
+from django.db import migrations, models
+
+from tracker.db import AddIndexConcurrentlyIfPostgres
+
+
+class Migration(migrations.Migration):
+    # Indexes are built concurrently on PostgreSQL, outside a transaction.
+    atomic = False
+
+    dependencies = [
+        ('tracker', '0002_alter_task_sprint'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        AddIndexConcurrentlyIfPostgres(
+            model_name='project',
+            index=models.Index(fields=['-created_at', '-id'], name='project_created_id_idx'),
+        ),
+        AddIndexConcurrentlyIfPostgres(
+            model_name='task',
+            index=models.Index(fields=['-created_at', '-id'], name='task_created_id_idx'),
+        ),
+    ]
@@ -0,0 +1,35 @@
+# Generated by Django 5.2.6 on 2026-10-18 14:13
+
+from django.conf import settings
+from django.db import migrations, models
+
+from tracker.db import AddIndexConcurrentlyIfPostgres
+
+
+class Migration(migrations.Migration):
+    # Indexes are built concurrently on PostgreSQL, outside a transaction.
+    atomic = False
+
+    dependencies = [
+        ('tracker', '0003_cursor_pagination_indexes'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        AddIndexConcurrentlyIfPostgres(
+            model_name='task',
+            index=models.Index(fields=['project', 'status', '-created_at'], name='task_project_status_idx'),
+        ),
+        AddIndexConcurrentlyIfPostgres(
+            model_name='task',
+            index=models.Index(fields=['sprint', 'status', '-created_at'], name='task_sprint_status_idx'),
+        ),
+        AddIndexConcurrentlyIfPostgres(
+            model_name='task',
+            index=models.Index(fields=['assignee', 'status', '-created_at'], name='task_assignee_status_idx'),
+        ),
+        AddIndexConcurrentlyIfPostgres(
+            model_name='task',
+            index=models.Index(fields=['due_date'], name='task_due_date_idx'),
+        ),
+    ]
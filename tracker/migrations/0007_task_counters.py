@@ -0,0 +1,67 @@
+# Generated by Django 5.2.6 on 2026-10-18 15:09
+
+from django.db import migrations, models
+from django.db.models import Count
+
+# TaskStatusChoices at the time of this migration.
+COUNT_FIELDS = {0: 'todo_count', 1: 'in_progress_count', 2: 'done_count'}
+
+
+def backfill_counters(apps, schema_editor):
+    Task = apps.get_model('tracker', 'Task')
+    for model_name, column in (('sprint', 'sprint_id'), ('project', 'project_id')):
+        model = apps.get_model('tracker', model_name)
+        counts = {}
+        rows = (
+            Task.objects.filter(**{f'{column}__isnull': False})
+            .values(column, 'status')
+            .annotate(count=Count('id'))
+            .order_by()
+        )
+        for row in rows:
+            field = COUNT_FIELDS.get(row['status'])
+            if field is not None:
+                counts.setdefault(row[column], {})[field] = row['count']
+        for pk, values in counts.items():
+            model.objects.filter(pk=pk).update(**values)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tracker', '0006_sync_tombstones'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='project',
+            name='done_count',
+            field=models.IntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='project',
+            name='in_progress_count',
+            field=models.IntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='project',
+            name='todo_count',
+            field=models.IntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='sprint',
+            name='done_count',
+            field=models.IntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='sprint',
+            name='in_progress_count',
+            field=models.IntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='sprint',
+            name='todo_count',
+            field=models.IntegerField(default=0, editable=False),
+        ),
+        migrations.RunPython(backfill_counters, migrations.RunPython.noop),
+    ]
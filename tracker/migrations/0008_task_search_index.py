@@ -0,0 +1,41 @@
+# Generated by Django 5.2.6 on 2026-10-18 15:15
+
+from django.contrib.postgres.indexes import GinIndex
+from django.contrib.postgres.search import SearchVector
+from django.db import migrations
+
+# Must match tracker.search.search_vector(), or the planner ignores the index.
+SEARCH_INDEX = GinIndex(
+    SearchVector('title', weight='A', config='english')
+    + SearchVector('description', weight='B', config='english'),
+    name='task_search_idx',
+)
+
+
+def create_search_index(apps, schema_editor):
+    # Expression GIN indexes are PostgreSQL only, other databases scan.
+    # CREATE INDEX CONCURRENTLY keeps task writes going during the build.
+    if schema_editor.connection.vendor == 'postgresql':
+        schema_editor.add_index(
+            apps.get_model('tracker', 'Task'), SEARCH_INDEX, concurrently=True
+        )
+
+
+def drop_search_index(apps, schema_editor):
+    if schema_editor.connection.vendor == 'postgresql':
+        schema_editor.remove_index(
+            apps.get_model('tracker', 'Task'), SEARCH_INDEX, concurrently=True
+        )
+
+
+class Migration(migrations.Migration):
+    # CREATE INDEX CONCURRENTLY cannot run inside a transaction.
+    atomic = False
+
+    dependencies = [
+        ('tracker', '0007_task_counters'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_search_index, drop_search_index),
+    ]
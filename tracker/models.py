@@ -1,7 +1,14 @@
+from collections import defaultdict
+
 from django.contrib.auth import get_user_model
-from django.db import models
+from django.db import models, transaction
+from django.db.models import Count, F
+from django.utils import timezone
 from django.utils.translation import gettext_lazy as _
 
+from tracker.cache import invalidate
+from tracker.live import publish_moved
+
 User = get_user_model()
 
 
@@ -24,16 +31,83 @@ class TaskPriorityChoices(models.IntegerChoices):
     HOTFIX = 3, _("Hotfix")
 
 
-class Project(models.Model):
+class JobStatusChoices(models.IntegerChoices):
+    QUEUED = 0, _("Queued")
+    RUNNING = 1, _("Running")
+    SUCCEEDED = 2, _("Succeeded")
+    FAILED = 3, _("Failed")
+
+
+TASK_COUNT_FIELDS = {
+    TaskStatusChoices.TO_DO: "todo_count",
+    TaskStatusChoices.IN_PROGRESS: "in_progress_count",
+    TaskStatusChoices.DONE: "done_count",
+}
+
+
+class TaskCountsMixin:
+    """
+    Per-status task counters, changed only by ``adjust_task_counts``. A
+    plain ``save()`` of a stale copy must not overwrite them, so existing
+    rows are saved without the counter columns.
+    """
+
+    def save(self, *args, **kwargs):
+        if not self._state.adding and not kwargs.get("force_insert"):
+            if kwargs.get("update_fields") is None:
+                kwargs["update_fields"] = [
+                    field.name
+                    for field in self._meta.concrete_fields
+                    if not field.primary_key
+                    and field.name not in TASK_COUNT_FIELDS.values()
+                ]
+        super().save(*args, **kwargs)
+
+
+class VisibleManager(models.Manager):
+    """Hides the rows whose deletion is pending, see ``tracker.deletion``."""
+
+    def get_queryset(self):
+        return super().get_queryset().filter(deleted_at__isnull=True)
+
+
+class TaskQuerySet(models.QuerySet):
+    def visible(self):
+        """
+        Excludes the tasks of projects and sprints whose deletion is pending.
+        Tasks have no ``deleted_at`` of their own, marking them all would be
+        the long UPDATE that ``tracker.deletion`` avoids.
+        """
+        return self.filter(
+            project__deleted_at__isnull=True, sprint__deleted_at__isnull=True
+        )
+
+
+class Project(TaskCountsMixin, models.Model):
     name = models.CharField(max_length=128)
     description = models.TextField(blank=True)
     created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    todo_count = models.IntegerField(default=0, editable=False)
+    in_progress_count = models.IntegerField(default=0, editable=False)
+    done_count = models.IntegerField(default=0, editable=False)
+    deleted_at = models.DateTimeField(null=True, blank=True, editable=False)
+
+    objects = VisibleManager()
+    all_objects = models.Manager()
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["-created_at", "-id"], name="project_created_id_idx"),
+            models.Index(fields=["updated_at", "id"], name="project_updated_id_idx"),
+        ]
 
     def __str__(self):
         return f"Project id:{self.pk} - {self.name}"
 
 
-class Sprint(models.Model):
+class Sprint(TaskCountsMixin, models.Model):
     project = models.ForeignKey(
         Project, related_name="sprints", on_delete=models.CASCADE
     )
@@ -43,10 +117,61 @@ class Sprint(models.Model):
     status = models.IntegerField(
         choices=SprintStatusChoices.choices, default=SprintStatusChoices.PLANNED
     )
+    updated_at = models.DateTimeField(auto_now=True)
+
+    todo_count = models.IntegerField(default=0, editable=False)
+    in_progress_count = models.IntegerField(default=0, editable=False)
+    done_count = models.IntegerField(default=0, editable=False)
+    deleted_at = models.DateTimeField(null=True, blank=True, editable=False)
+
+    objects = VisibleManager()
+    all_objects = models.Manager()
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["updated_at", "id"], name="sprint_updated_id_idx"),
+        ]
 
     def __str__(self):
         return f"Spring id:{self.pk} - {self.name}"
 
+    def close(self, rollover_to=None):
+        """
+        Complete the sprint and move its unfinished tasks to ``rollover_to``,
+        or to the backlog when it is ``None``. Tasks are moved with a single
+        UPDATE. Returns the number of moved tasks.
+        """
+        with transaction.atomic():
+            unfinished = Task.objects.filter(sprint=self).exclude(
+                status=TaskStatusChoices.DONE
+            )
+            by_status = unfinished.values("status").annotate(count=Count("id"))
+            deltas = defaultdict(int)
+            for row in by_status.order_by():
+                field = TASK_COUNT_FIELDS[row["status"]]
+                deltas[(Sprint, self.pk, field)] -= row["count"]
+                if rollover_to is not None:
+                    deltas[(Sprint, rollover_to.pk, field)] += row["count"]
+            moved = unfinished.update(sprint=rollover_to, updated_at=timezone.now())
+            adjust_task_counts(deltas)
+            self.status = SprintStatusChoices.COMPLETED
+            self.save(update_fields=["status", "updated_at"])
+            invalidate(Task)
+            publish_moved(self, rollover_to, moved)
+        return moved
+
+    def next_sprint(self):
+        """Return the project's next sprint that is still open, if any."""
+        return (
+            Sprint.objects.filter(
+                project_id=self.project_id, start_date__gte=self.end_date
+            )
+            .exclude(pk=self.pk)
+            .exclude(status=SprintStatusChoices.COMPLETED)
+            .order_by("start_date", "id")
+            .first()
+        )
+
 
 class Task(models.Model):
     project = models.ForeignKey(
@@ -83,5 +208,173 @@ class Task(models.Model):
     completed_at = models.DateTimeField(null=True, blank=True)
     due_date = models.DateField(null=True, blank=True)
 
+    objects = TaskQuerySet.as_manager()
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["-created_at", "-id"], name="task_created_id_idx"),
+            # Board views: filter by owner and status, newest first.
+            models.Index(
+                fields=["project", "status", "-created_at"],
+                name="task_project_status_idx",
+            ),
+            models.Index(
+                fields=["sprint", "status", "-created_at"],
+                name="task_sprint_status_idx",
+            ),
+            models.Index(
+                fields=["assignee", "status", "-created_at"],
+                name="task_assignee_status_idx",
+            ),
+            models.Index(fields=["due_date"], name="task_due_date_idx"),
+            # ?ordering=updated_at pages on (updated_at, id) cursors, and sync
+            # reads the changed tasks in the same order.
+            models.Index(fields=["updated_at", "id"], name="task_updated_id_idx"),
+        ]
+
     def __str__(self):
         return f"Task id:{self.pk} - {self.title}"
+
+    # Fields whose previous value is needed when the task is saved: the board
+    # it leaves (tracker.live) and the counter it moves out of.
+    TRACKED_FIELDS = ("sprint_id", "project_id", "status")
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        task = super().from_db(db, field_names, values)
+        task._loaded_state = task.tracked_state()
+        return task
+
+    def tracked_state(self):
+        """The tracked fields that are loaded, deferred ones are left out."""
+        return {
+            name: self.__dict__[name]
+            for name in self.TRACKED_FIELDS
+            if name in self.__dict__
+        }
+
+    def save(self, *args, **kwargs):
+        super().save(*args, **kwargs)
+        # Post-save receivers have compared against the loaded state.
+        update_fields = kwargs.get("update_fields")
+        state = self.tracked_state()
+        if update_fields is not None:
+            saved = {self._meta.get_field(name).attname for name in update_fields}
+            state = {
+                **getattr(self, "_loaded_state", {}),
+                **{name: value for name, value in state.items() if name in saved},
+            }
+        self._loaded_state = state
+
+
+def adjust_task_counts(deltas):
+    """
+    Apply ``{(model, pk, field): delta}`` to the task counters with one
+    ``F()`` UPDATE per row. Rows are updated in a fixed order, so concurrent
+    writers lock them in the same order, and ``updated_at`` moves with the
+    counts for ETags and sync.
+    """
+    rows = defaultdict(dict)
+    for (model, pk, field), delta in deltas.items():
+        if pk is not None and delta:
+            rows[(model, pk)][field] = delta
+    if not rows:
+        return
+    now = timezone.now()
+    for (model, pk), changes in sorted(
+        rows.items(), key=lambda item: (item[0][0]._meta.label, item[0][1])
+    ):
+        model.objects.filter(pk=pk).update(
+            updated_at=now,
+            **{field: F(field) + delta for field, delta in changes.items()},
+        )
+    invalidate(*{model for model, _ in rows})
+
+
+class Tombstone(models.Model):
+    """A deleted project, sprint or task, reported by the sync endpoint."""
+
+    model = models.CharField(max_length=32)
+    object_id = models.BigIntegerField()
+    deleted_at = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        indexes = [
+            # Sync reads the tombstones of all models in (deleted_at, id) order.
+            models.Index(fields=["deleted_at", "id"], name="tombstone_deleted_id_idx"),
+        ]
+
+    def __str__(self):
+        return f"Tombstone {self.model}:{self.object_id}"
+
+
+class Deletion(models.Model):
+    """
+    A project or sprint being deleted in the background, with the progress
+    of its tasks, see ``tracker.deletion``.
+    """
+
+    model = models.CharField(max_length=32)
+    object_id = models.BigIntegerField()
+    total_tasks = models.IntegerField(default=0)
+    deleted_tasks = models.IntegerField(default=0)
+    created_at = models.DateTimeField(auto_now_add=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["finished_at", "id"], name="deletion_finished_id_idx"),
+        ]
+
+    def __str__(self):
+        return f"Deletion {self.model}:{self.object_id}"
+
+
+class Job(models.Model):
+    """Background work run by the ``run_jobs`` worker, see ``tracker.jobs``."""
+
+    name = models.CharField(max_length=64)
+    args = models.JSONField(default=dict, blank=True)
+    status = models.IntegerField(
+        choices=JobStatusChoices.choices, default=JobStatusChoices.QUEUED
+    )
+    attempts = models.IntegerField(default=0)
+    max_attempts = models.IntegerField(default=1)
+    run_at = models.DateTimeField(default=timezone.now)
+    started_at = models.DateTimeField(null=True, blank=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+    result = models.JSONField(null=True, blank=True)
+    error = models.TextField(blank=True)
+    created_by = models.ForeignKey(
+        User,
+        null=True,
+        blank=True,
+        on_delete=models.SET_NULL,
+        related_name="jobs",
+    )
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        indexes = [
+            models.Index(
+                fields=["status", "run_at", "id"], name="job_status_run_at_idx"
+            ),
+        ]
+
+    def __str__(self):
+        return f"Job id:{self.pk} - {self.name}"
+
+
+class ImportCheckpoint(models.Model):
+    """
+    Input rows consumed by a task import, saved in the transaction of each
+    chunk so a resumed import neither skips nor repeats rows, see
+    ``tracker.importer``.
+    """
+
+    name = models.CharField(max_length=512, unique=True)
+    position = models.BigIntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"ImportCheckpoint {self.name}:{self.position}"
@@ -0,0 +1,28 @@
+from django.conf import settings
+from rest_framework.pagination import CursorPagination
+
+
+class TrackerCursorPagination(CursorPagination):
+    """
+    Keyset pagination for tracker list endpoints.
+
+    Pages are addressed by an opaque cursor instead of an offset, so fetching
+    page N costs the same as fetching page 1 and no ``COUNT(*)`` is issued.
+    The ordering is taken from the view's ``ordering`` attribute and must
+    start with an indexed, (nearly) unique column; ``id`` is appended as a
+    tie-breaker when it is missing.
+    """
+
+    ordering = ("-created_at", "-id")
+    page_size_query_param = "page_size"
+    max_page_size = settings.API_MAX_PAGE_SIZE
+
+    def get_ordering(self, request, queryset, view):
+        view_ordering = getattr(view, "ordering", None)
+        if view_ordering:
+            self.ordering = view_ordering
+        ordering = super().get_ordering(request, queryset, view)
+
+        if not {"id", "-id", "pk", "-pk"} & set(ordering):
+            ordering += ("-id" if ordering[0].startswith("-") else "id",)
+        return ordering
@@ -17,3 +17,13 @@ class IsAssigneeOrAdmin(BasePermission):
             getattr(request.user, "is_staff", None)
             or getattr(obj, "assignee_id", None) == request.user.id
         )
+
+    def has_queryset_permission(self, request, view, queryset):
+        """``has_object_permission`` for every task of ``queryset`` at once."""
+        if request.method in SAFE_METHODS:
+            return True
+
+        return request.user.is_authenticated and (
+            getattr(request.user, "is_staff", None)
+            or not queryset.exclude(assignee_id=request.user.id).exists()
+        )
@@ -0,0 +1,345 @@
+"""
+Opt-in profiling of individual requests.
+
+``ProfilingMiddleware`` profiles a random ``API_PROFILE_SAMPLE_RATE``
+fraction of requests with cProfile. With ``API_PROFILE_SLOW_MS`` set, every
+other request is watched by a low-overhead stack sampler and its SQL is
+recorded, and the result is kept when the request turns out to be slower
+than the threshold. Stored profiles contain the executed SQL and the
+``EXPLAIN`` plans of the slowest SELECTs.
+
+Profiles are written as JSON files to ``API_PROFILE_DIR``, which works as a
+ring buffer of ``API_PROFILE_MAX_ENTRIES`` entries shared by all workers.
+Staff users browse them at ``/api/profiles/``. Under ASGI the stack sampler
+sees the event loop thread, so async views are best profiled by sampling.
+"""
+
+import cProfile
+import io
+import json
+import os
+import pstats
+import random
+import re
+import sys
+import threading
+import time
+import uuid
+from collections import Counter
+from contextvars import ContextVar
+from datetime import datetime, timezone
+
+from asgiref.sync import iscoroutinefunction, sync_to_async
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import DatabaseError, connections
+from django.utils.decorators import sync_and_async_middleware
+
+from tracker.metrics import request_labels
+
+PROFILE_ID = re.compile(r"^[0-9]+-[0-9a-f]{32}$")
+MAX_QUERIES = 500
+PROFILE_LINES = 60
+MAX_STACKS = 200
+
+_current = ContextVar("tracker_request_profile", default=None)
+# cProfile can only be active once per process on recent Pythons, concurrent
+# sampled requests fall back to the stack sampler.
+_cprofile_lock = threading.Lock()
+
+
+def record_sql(execute, sql, params, many, context):
+    """Database execute wrapper keeping the SQL of profiled requests."""
+    profile = _current.get()
+    if profile is None:
+        return execute(sql, params, many, context)
+    started = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        profile.record_query(
+            context["connection"].alias,
+            sql,
+            params,
+            many,
+            time.perf_counter() - started,
+        )
+
+
+class StackSampler:
+    """
+    Background thread collecting the stacks of registered threads every
+    ``API_PROFILE_STACK_INTERVAL_MS``, as collapsed ``frame;frame`` strings.
+    """
+
+    def __init__(self):
+        self._targets = {}
+        self._lock = threading.Lock()
+        self._thread = None
+
+    def start(self, thread_id):
+        samples = Counter()
+        with self._lock:
+            self._targets[thread_id] = samples
+            if self._thread is None:
+                self._thread = threading.Thread(
+                    target=self._run, name="tracker-stack-sampler", daemon=True
+                )
+                self._thread.start()
+        return samples
+
+    def stop(self, thread_id):
+        with self._lock:
+            self._targets.pop(thread_id, None)
+
+    def _run(self):
+        while True:
+            time.sleep(settings.API_PROFILE_STACK_INTERVAL_MS / 1000)
+            with self._lock:
+                if not self._targets:
+                    continue
+                frames = sys._current_frames()
+                for thread_id, samples in self._targets.items():
+                    frame = frames.get(thread_id)
+                    if frame is not None:
+                        samples[_collapse(frame)] += 1
+
+
+def _collapse(frame):
+    stack = []
+    while frame is not None:
+        code = frame.f_code
+        filename = "/".join(code.co_filename.rsplit("/", 2)[-2:])
+        stack.append(f"{filename}:{frame.f_lineno}({code.co_name})")
+        frame = frame.f_back
+    return ";".join(reversed(stack))
+
+
+stack_sampler = StackSampler()
+
+
+class RequestProfile:
+    def __init__(self, sampled):
+        self.sampled = sampled
+        self.queries = []
+        self.query_count = 0
+        self.profiler = None
+        self.samples = None
+        self._thread_id = None
+
+    def record_query(self, alias, sql, params, many, duration):
+        self.query_count += 1
+        if len(self.queries) < MAX_QUERIES:
+            self.queries.append((alias, sql, params, many, duration))
+
+    def start(self):
+        if self.sampled and _cprofile_lock.acquire(blocking=False):
+            self.profiler = cProfile.Profile()
+            try:
+                self.profiler.enable()
+            except ValueError:  # Another profiler is active.
+                self.profiler = None
+                _cprofile_lock.release()
+        if self.profiler is None:
+            self._thread_id = threading.get_ident()
+            self.samples = stack_sampler.start(self._thread_id)
+
+    def stop(self):
+        if self.profiler is not None:
+            self.profiler.disable()
+            _cprofile_lock.release()
+        else:
+            stack_sampler.stop(self._thread_id)
+
+    def stats(self):
+        if self.profiler is not None:
+            out = io.StringIO()
+            stats = pstats.Stats(self.profiler, stream=out)
+            stats.sort_stats("cumulative").print_stats(PROFILE_LINES)
+            return {"type": "cprofile", "stats": out.getvalue()}
+        return {
+            "type": "stack",
+            "interval_ms": settings.API_PROFILE_STACK_INTERVAL_MS,
+            "stacks": self.samples.most_common(MAX_STACKS),
+        }
+
+    def explain(self):
+        """EXPLAIN the slowest distinct SELECTs, without executing them."""
+        plans = []
+        seen = set()
+        for alias, sql, params, many, _ in sorted(
+            self.queries, key=lambda query: query[4], reverse=True
+        ):
+            if len(plans) >= settings.API_PROFILE_EXPLAIN_LIMIT:
+                break
+            if many or sql in seen or not sql.lstrip().upper().startswith("SELECT"):
+                continue
+            seen.add(sql)
+            connection = connections[alias]
+            try:
+                with connection.cursor() as cursor:
+                    cursor.execute(
+                        f"{connection.ops.explain_query_prefix()} {sql}", params
+                    )
+                    plan = "\n".join(
+                        " ".join(str(column) for column in row)
+                        for row in cursor.fetchall()
+                    )
+            except DatabaseError as exc:
+                plan = f"EXPLAIN failed: {exc}"
+            plans.append({"sql": sql, "plan": plan})
+        return plans
+
+
+def _profile_dir():
+    return settings.API_PROFILE_DIR
+
+
+def save_profile(record):
+    """Write ``record`` to the ring buffer and drop the oldest entries."""
+    directory = _profile_dir()
+    os.makedirs(directory, exist_ok=True)
+    profile_id = f"{time.time_ns()}-{uuid.uuid4().hex}"
+    path = os.path.join(directory, f"{profile_id}.json")
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w") as fh:
+        json.dump({"id": profile_id, **record}, fh, default=str)
+    os.replace(tmp_path, path)
+
+    for stale in _profile_ids()[settings.API_PROFILE_MAX_ENTRIES :]:
+        try:
+            os.unlink(os.path.join(directory, f"{stale}.json"))
+        except FileNotFoundError:
+            pass  # Pruned by another worker.
+    return profile_id
+
+
+def _profile_ids():
+    """Stored profile ids, newest first."""
+    try:
+        names = os.listdir(_profile_dir())
+    except FileNotFoundError:
+        return []
+    ids = [
+        name[: -len(".json")]
+        for name in names
+        if PROFILE_ID.match(name[: -len(".json")]) and name.endswith(".json")
+    ]
+    return sorted(
+        ids, key=lambda profile_id: int(profile_id.split("-")[0]), reverse=True
+    )
+
+
+def load_profile(profile_id):
+    """Return the stored profile ``profile_id``, or ``None``."""
+    if not PROFILE_ID.match(profile_id):
+        return None
+    try:
+        with open(os.path.join(_profile_dir(), f"{profile_id}.json")) as fh:
+            return json.load(fh)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return None
+
+
+SUMMARY_FIELDS = (
+    "id",
+    "started_at",
+    "method",
+    "path",
+    "view",
+    "action",
+    "status",
+    "duration_ms",
+    "trigger",
+    "query_count",
+)
+
+
+def list_profiles():
+    summaries = []
+    for profile_id in _profile_ids():
+        profile = load_profile(profile_id)
+        if profile is not None:
+            summaries.append({field: profile.get(field) for field in SUMMARY_FIELDS})
+    return summaries
+
+
+def _new_profile():
+    rate = settings.API_PROFILE_SAMPLE_RATE
+    sampled = rate > 0 and random.random() < rate
+    if sampled or settings.API_PROFILE_SLOW_MS > 0:
+        return RequestProfile(sampled)
+    return None
+
+
+def _store(request, response, profile, started_at, duration):
+    duration_ms = duration * 1000
+    slow = 0 < settings.API_PROFILE_SLOW_MS <= duration_ms
+    if not (profile.sampled or slow):
+        return
+    view, action = request_labels(request, response)
+    save_profile(
+        {
+            "started_at": started_at.isoformat(),
+            "method": request.method,
+            "path": request.get_full_path(),
+            "view": view,
+            "action": action,
+            "status": response.status_code,
+            "duration_ms": duration_ms,
+            "trigger": "sampled" if profile.sampled else "slow",
+            "query_count": profile.query_count,
+            "queries": [
+                {"sql": sql, "params": params, "duration_ms": elapsed * 1000}
+                for _, sql, params, _, elapsed in profile.queries
+            ],
+            "explain": profile.explain(),
+            "profile": profile.stats(),
+        }
+    )
+
+
+@sync_and_async_middleware
+def ProfilingMiddleware(get_response):
+    if settings.API_PROFILE_SAMPLE_RATE <= 0 and settings.API_PROFILE_SLOW_MS <= 0:
+        raise MiddlewareNotUsed
+
+    if iscoroutinefunction(get_response):
+
+        async def middleware(request):
+            profile = _new_profile()
+            if profile is None:
+                return await get_response(request)
+            started_at = datetime.now(timezone.utc)
+            started = time.perf_counter()
+            token = _current.set(profile)
+            profile.start()
+            try:
+                response = await get_response(request)
+            finally:
+                profile.stop()
+                _current.reset(token)
+            await sync_to_async(_store)(
+                request, response, profile, started_at, time.perf_counter() - started
+            )
+            return response
+
+        return middleware
+
+    def middleware(request):
+        profile = _new_profile()
+        if profile is None:
+            return get_response(request)
+        started_at = datetime.now(timezone.utc)
+        started = time.perf_counter()
+        token = _current.set(profile)
+        profile.start()
+        try:
+            response = get_response(request)
+        finally:
+            profile.stop()
+            _current.reset(token)
+        _store(request, response, profile, started_at, time.perf_counter() - started)
+        return response
+
+    return middleware
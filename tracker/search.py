@@ -0,0 +1,62 @@
+"""
+Full-text search over task titles and descriptions.
+
+On PostgreSQL tasks are matched with ``websearch_to_tsquery`` against a
+weighted ``tsvector`` of the title (weight A) and the description (weight
+B), served by the ``task_search_idx`` GIN expression index, and ranked with
+``ts_rank``. The index only matches queries built from the same expression,
+so ``search_vector()`` must stay in sync with migration 0008.
+
+Other databases (SQLite for local tests) fall back to case-insensitive
+substring matching of every search term, with title matches ranked first.
+"""
+
+from django.contrib.postgres.search import SearchQuery, SearchRank, SearchVector
+from django.db import connection
+from django.db.models import Case, F, FloatField, Q, Value, When
+
+SEARCH_CONFIG = "english"
+SEARCH_INDEX = "task_search_idx"
+
+
+def search_vector():
+    return SearchVector("title", weight="A", config=SEARCH_CONFIG) + SearchVector(
+        "description", weight="B", config=SEARCH_CONFIG
+    )
+
+
+def full_text_supported() -> bool:
+    return connection.vendor == "postgresql"
+
+
+def search_tasks(queryset, query, ranked=True):
+    """
+    Filter ``queryset`` down to the tasks matching ``query``. With ``ranked``
+    the tasks are annotated with ``rank`` and ordered best match first.
+    """
+    if full_text_supported():
+        search_query = SearchQuery(query, config=SEARCH_CONFIG, search_type="websearch")
+        # An alias keeps the vector out of the SELECT list.
+        queryset = queryset.alias(search=search_vector()).filter(search=search_query)
+        if ranked:
+            queryset = queryset.annotate(rank=SearchRank(F("search"), search_query))
+    else:
+        terms = query.split()
+        for term in terms:
+            queryset = queryset.filter(
+                Q(title__icontains=term) | Q(description__icontains=term)
+            )
+        if ranked:
+            in_title = Q()
+            for term in terms:
+                in_title &= Q(title__icontains=term)
+            queryset = queryset.annotate(
+                rank=Case(
+                    When(in_title, then=Value(1.0)),
+                    default=Value(0.5),
+                    output_field=FloatField(),
+                )
+            )
+    if ranked:
+        queryset = queryset.order_by("-rank", "-id")
+    return queryset
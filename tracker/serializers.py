@@ -1,12 +1,131 @@
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.utils import timezone
 from rest_framework import serializers
 
-from tracker.models import Project, Sprint, SprintStatusChoices, Task
+from tracker.cache import invalidate
+from tracker.counters import count_tasks
+from tracker.filters import TaskFilter
+from tracker.live import publish_bulk
+from tracker.metrics import TimedSerializerMixin
+from tracker.models import Deletion, Job, Project, Sprint, SprintStatusChoices, Task
 
+User = get_user_model()
+
+
+def parse_pk(value):
+    """Coerce a client-supplied primary key to ``int``, or return ``None``."""
+    if isinstance(value, bool):
+        return None
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return None
+
+
+class PreloadedPrimaryKeyRelatedField(serializers.PrimaryKeyRelatedField):
+    """
+    Primary key field that resolves against objects preloaded by the root
+    list serializer, so validating a batch costs one query per relation
+    instead of one per item. Falls back to a regular lookup otherwise.
+    """
+
+    def to_internal_value(self, data):
+        preloaded = getattr(self.root, "preloaded", {}).get(self.source)
+        if preloaded is None:
+            return super().to_internal_value(data)
+
+        pk = parse_pk(data)
+        if pk is None:
+            self.fail("incorrect_type", data_type=type(data).__name__)
+        try:
+            return preloaded[pk]
+        except KeyError:
+            self.fail("does_not_exist", pk_value=data)
+
+
+class TaskListSerializer(serializers.ListSerializer):
+    """
+    Batch create/update of tasks.
+
+    Related objects referenced by the batch are loaded up front, items are
+    validated together and written with ``bulk_create``/``bulk_update``.
+    For updates ``instance`` is a ``{pk: task}`` mapping and every item must
+    carry the ``id`` of the task it changes, once.
+    """
+
+    def to_internal_value(self, data):
+        # Oversized batches are left to the ``max_length`` check, unloaded.
+        if isinstance(data, list) and (
+            self.max_length is None or len(data) <= self.max_length
+        ):
+            self.preloaded = self._preload_related(data)
+        self.seen_ids = set()
+        return super().to_internal_value(data)
+
+    def _preload_related(self, data):
+        preloaded = {}
+        for name, field in self.child.fields.items():
+            if field.read_only or not isinstance(
+                field, PreloadedPrimaryKeyRelatedField
+            ):
+                continue
+            pks = {parse_pk(item.get(name)) for item in data if isinstance(item, dict)}
+            pks.discard(None)
+            preloaded[field.source] = field.get_queryset().in_bulk(pks)
+        return preloaded
+
+    def run_child_validation(self, data):
+        if self.instance is None:
+            return super().run_child_validation(data)
+
+        pk = parse_pk(data.get("id")) if isinstance(data, dict) else None
+        if pk not in self.instance:
+            raise serializers.ValidationError({"id": ["Task not found."]})
+        if pk in self.seen_ids:
+            # A second change of one task would count its status twice.
+            raise serializers.ValidationError({"id": ["Duplicate task."]})
+        self.seen_ids.add(pk)
+
+        self.child.instance = self.instance[pk]
+        self.child.initial_data = data
+        attrs = super().run_child_validation(data)
+        attrs["id"] = pk
+        return attrs
+
+    def create(self, validated_data):
+        tasks = Task.objects.bulk_create([Task(**attrs) for attrs in validated_data])
+        count_tasks(created=tasks)
+        invalidate(Task)
+        publish_bulk(tasks)
+        return tasks
+
+    def update(self, instance, validated_data):
+        tasks = []
+        fields = {"updated_at"}
+        now = timezone.now()
+        for attrs in validated_data:
+            task = instance[attrs.pop("id")]
+            for attr, value in attrs.items():
+                setattr(task, attr, value)
+            task.updated_at = now
+            fields.update(attrs)
+            tasks.append(task)
+
+        Task.objects.bulk_update(tasks, fields)
+        count_tasks(updated=tasks)
+        invalidate(Task)
+        publish_bulk(tasks)
+        return tasks
+
+
+class TaskSerializer(TimedSerializerMixin, serializers.ModelSerializer):
+    serializer_related_field = PreloadedPrimaryKeyRelatedField
 
-class TaskSerializer(serializers.ModelSerializer):
     class Meta:
         model = Task
         fields = "__all__"
+        list_serializer_class = TaskListSerializer
 
     def validate(self, attrs):
         sprint = attrs.get("sprint")
@@ -17,15 +136,102 @@ class TaskSerializer(serializers.ModelSerializer):
         return super().validate(attrs)
 
 
-class SprintSerializer(serializers.ModelSerializer):
+class TaskBulkDeleteSerializer(serializers.Serializer):
+    ids = serializers.ListField(
+        child=serializers.IntegerField(),
+        allow_empty=False,
+        max_length=settings.API_BULK_MAX_ITEMS,
+    )
+
+
+class TaskBulkAssignSerializer(serializers.Serializer):
+    """The tasks to assign, by ``ids`` or by task list ``filter``, and the user."""
+
+    ids = serializers.ListField(
+        child=serializers.IntegerField(),
+        allow_empty=False,
+        max_length=settings.API_BULK_MAX_ITEMS,
+        required=False,
+    )
+    filter = serializers.DictField(allow_empty=False, required=False)
+    user = serializers.PrimaryKeyRelatedField(
+        queryset=User.objects.all(), allow_null=True
+    )
+
+    def validate_filter(self, value):
+        # django-filter ignores unknown keys, a typo would match every task.
+        unknown = set(value) - set(TaskFilter.get_filters())
+        if unknown:
+            raise serializers.ValidationError(
+                f"Unknown filters: {', '.join(sorted(unknown))}."
+            )
+        return value
+
+    def validate(self, attrs):
+        if ("ids" in attrs) == ("filter" in attrs):
+            raise serializers.ValidationError("Pass either ids or filter.")
+        return attrs
+
+
+class SyncQuerySerializer(serializers.Serializer):
+    since = serializers.CharField(required=False)
+    limit = serializers.IntegerField(
+        required=False, min_value=1, max_value=settings.API_MAX_PAGE_SIZE
+    )
+
+
+class TaskSearchQuerySerializer(serializers.Serializer):
+    q = serializers.CharField(max_length=256)
+    page_size = serializers.IntegerField(
+        required=False, min_value=1, max_value=settings.API_MAX_PAGE_SIZE
+    )
+
+
+class SprintSerializer(TimedSerializerMixin, serializers.ModelSerializer):
     class Meta:
         model = Sprint
-        fields = "__all__"
+        exclude = ("deleted_at",)
 
     tasks = TaskSerializer(many=True, read_only=True)
 
 
-class ProjectSerializer(serializers.ModelSerializer):
+class SprintCloseSerializer(serializers.Serializer):
+    rollover_to = serializers.PrimaryKeyRelatedField(
+        queryset=Sprint.objects.all(), allow_null=True, default=None
+    )
+
+    def validate_rollover_to(self, value):
+        sprint = self.context["sprint"]
+        if value is None:
+            return value
+        if value.pk == sprint.pk:
+            raise serializers.ValidationError(
+                "Cannot roll tasks over to the same sprint."
+            )
+        if value.project_id != sprint.project_id:
+            raise serializers.ValidationError(
+                "Target sprint belongs to another project."
+            )
+        if value.status == SprintStatusChoices.COMPLETED:
+            raise serializers.ValidationError(
+                "Cannot add or move tasks to a closed sprint."
+            )
+        return value
+
+
+class ProjectSerializer(TimedSerializerMixin, serializers.ModelSerializer):
     class Meta:
         model = Project
+        exclude = ("deleted_at",)
+
+
+class DeletionSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = Deletion
         fields = "__all__"
+
+
+class JobSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = Job
+        exclude = ("created_by",)
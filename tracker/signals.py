@@ -0,0 +1,86 @@
+from django.contrib.auth import get_user_model
+from django.db import transaction
+from django.db.backends.signals import connection_created
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from rest_framework_simplejwt.settings import api_settings as jwt_settings
+
+from tracker.authentication import evict_cached_user
+from tracker.cache import invalidate
+from tracker.counters import count_tasks
+from tracker.live import (
+    TASK_CREATED,
+    TASK_DELETED,
+    TASK_UPDATED,
+    publish_tasks,
+)
+from tracker.metrics import record_query
+from tracker.models import Project, Sprint, Task, Tombstone
+from tracker.profiling import record_sql
+from tracker.serializers import TaskSerializer
+
+
+@receiver(post_save, sender=Project)
+@receiver(post_delete, sender=Project)
+@receiver(post_save, sender=Sprint)
+@receiver(post_delete, sender=Sprint)
+@receiver(post_save, sender=Task)
+@receiver(post_delete, sender=Task)
+def invalidate_cached_responses(sender, **kwargs):
+    invalidate(sender)
+
+
+@receiver(post_delete, sender=Project)
+@receiver(post_delete, sender=Sprint)
+@receiver(post_delete, sender=Task)
+def record_tombstone(sender, instance, **kwargs):
+    # Hidden projects and sprints got theirs when their deletion was requested.
+    if getattr(instance, "deleted_at", None) is not None:
+        return
+    Tombstone.objects.create(model=sender._meta.model_name, object_id=instance.pk)
+
+
+# Task fields, by name or attname, that move a task between counters.
+COUNTED_FIELDS = {"sprint", "sprint_id", "project", "project_id", "status"}
+
+
+@receiver(post_save, sender=Task)
+def count_saved_task(sender, instance, created, update_fields=None, **kwargs):
+    if created:
+        count_tasks(created=[instance])
+    elif update_fields is None or COUNTED_FIELDS & set(update_fields):
+        count_tasks(updated=[instance])
+
+
+@receiver(post_delete, sender=Task)
+def count_deleted_task(sender, instance, **kwargs):
+    count_tasks(deleted=[instance])
+
+
+@receiver(post_save, sender=Task)
+def publish_task_saved(sender, instance, created, **kwargs):
+    event_type = TASK_CREATED if created else TASK_UPDATED
+    publish_tasks(event_type, [instance], TaskSerializer)
+
+
+@receiver(post_delete, sender=Task)
+def publish_task_deleted(sender, instance, **kwargs):
+    publish_tasks(TASK_DELETED, [instance])
+
+
+@receiver(post_save, sender=get_user_model())
+@receiver(post_delete, sender=get_user_model())
+def evict_authenticated_user(sender, instance, update_fields=None, **kwargs):
+    # Logins only touch last_login, which authentication does not depend on.
+    if update_fields and set(update_fields) == {"last_login"}:
+        return
+    user_id = getattr(instance, jwt_settings.USER_ID_FIELD)
+    transaction.on_commit(lambda: evict_cached_user(user_id))
+
+
+@receiver(connection_created)
+def install_query_recorder(sender, connection, **kwargs):
+    # The wrapper list outlives the connection, reconnects must not stack it.
+    for wrapper in (record_query, record_sql):
+        if wrapper not in connection.execute_wrappers:
+            connection.execute_wrappers.append(wrapper)
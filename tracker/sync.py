@@ -0,0 +1,217 @@
+"""
+Incremental "changes since" sync.
+
+A sync token records, per model, the ``(updated_at, id)`` of the last row a
+client received, and the ``(deleted_at, id)`` of the last tombstone. The
+next sync returns the rows after those positions in that order, so the
+payload is proportional to the number of changes.
+
+A row's ``updated_at`` is taken before its transaction commits, so a
+returned row could still be joined by a concurrent write with an earlier
+timestamp that the client would then never see. Sync therefore stops at
+the start of the oldest statement-running client transaction on PostgreSQL
+(an import or a bulk write holds it back until it commits), but never more
+than ``API_SYNC_MAX_HOLD_SECONDS`` back, and ``API_SYNC_SETTLE_SECONDS``
+before that, to cover timestamps taken just before a transaction began and
+the clock skew between the web workers and the database. Other databases
+only get the settle window. Tokens are signed
+and expire after ``API_SYNC_RETENTION_DAYS``, when their tombstones are
+pruned.
+"""
+
+import logging
+from datetime import datetime, timedelta
+
+from django.conf import settings
+from django.core import signing
+from django.db import connection
+from django.db.models import Q
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.exceptions import APIException, ValidationError
+
+from tracker.fastpath import compile_plan
+from tracker.fieldsets import Fieldset
+from tracker.models import Project, Sprint, Task, Tombstone
+from tracker.serializers import ProjectSerializer, SprintSerializer, TaskSerializer
+
+logger = logging.getLogger(__name__)
+
+TOKEN_SALT = "tracker.sync"
+# Sprint tasks are synced on their own, not nested in the sprint.
+SYNC_MODELS = {
+    "projects": (Project, ProjectSerializer, None),
+    "sprints": (Sprint, SprintSerializer, Fieldset(exclude={"tasks": None})),
+    "tasks": (Task, TaskSerializer, None),
+}
+TOMBSTONE_KEYS = {
+    model._meta.model_name: key for key, (model, *_) in SYNC_MODELS.items()
+}
+TOMBSTONES = "deleted"
+
+
+class SyncTokenExpired(APIException):
+    status_code = status.HTTP_410_GONE
+    default_detail = "Sync token expired, start a full sync."
+    default_code = "sync_token_expired"
+
+
+def make_token(positions, issued_at) -> str:
+    return signing.dumps(
+        {
+            "issued_at": issued_at.isoformat(),
+            "positions": {
+                key: [position[0].isoformat(), position[1]] if position else None
+                for key, position in positions.items()
+            },
+        },
+        salt=TOKEN_SALT,
+        compress=True,
+    )
+
+
+def read_token(token) -> dict:
+    """Return the positions stored in ``token``."""
+    try:
+        data = signing.loads(token, salt=TOKEN_SALT)
+        issued_at = datetime.fromisoformat(data["issued_at"])
+        positions = {
+            key: (datetime.fromisoformat(value[0]), value[1]) if value else None
+            for key, value in data["positions"].items()
+        }
+    except (signing.BadSignature, KeyError, TypeError, ValueError):
+        raise ValidationError({"since": ["Invalid sync token."]})
+    max_age = timedelta(days=settings.API_SYNC_RETENTION_DAYS)
+    if timezone.now() - issued_at > max_age:
+        raise SyncTokenExpired()
+    return positions
+
+
+def oldest_transaction_start():
+    """
+    When the oldest transaction of another client that is running a
+    statement began, if any. Idle sessions, autovacuum and other background
+    workers are left out, they would hold every sync back.
+    """
+    if connection.vendor != "postgresql":
+        return None
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT min(xact_start) FROM pg_stat_activity"
+            " WHERE datname = current_database() AND pid <> pg_backend_pid()"
+            " AND backend_type = 'client backend' AND state = 'active'"
+        )
+        return cursor.fetchone()[0]
+
+
+def sync_cutoff(now):
+    """The newest timestamp a sync at ``now`` may return, see above."""
+    cutoff = now
+    oldest = oldest_transaction_start()
+    if oldest is not None and oldest < now:
+        limit = now - timedelta(seconds=settings.API_SYNC_MAX_HOLD_SECONDS)
+        if oldest < limit:
+            logger.warning(
+                "A transaction open since %s holds sync back by more than "
+                "API_SYNC_MAX_HOLD_SECONDS, its rows may be missed.",
+                oldest.isoformat(),
+            )
+        cutoff = max(oldest, limit)
+    return cutoff - timedelta(seconds=settings.API_SYNC_SETTLE_SECONDS)
+
+
+def _after(queryset, field, position):
+    if position is None:
+        return queryset
+    timestamp, pk = position
+    return queryset.filter(
+        Q(**{f"{field}__gt": timestamp}) | Q(**{field: timestamp, "pk__gt": pk})
+    )
+
+
+def _changed_rows(key, position, cutoff, limit, context):
+    model, serializer_class, fieldset = SYNC_MODELS[key]
+    queryset = model.objects.filter(updated_at__lte=cutoff)
+    if model is Task:
+        queryset = queryset.visible()
+    queryset = _after(queryset, "updated_at", position).order_by("updated_at", "id")
+
+    serializer = serializer_class(context=context)
+    if fieldset is not None:
+        fieldset.apply(serializer)
+    plan = compile_plan(serializer, ("id", "updated_at"))
+    if plan is None:
+        objects = list(queryset[: limit + 1])
+        rows = [{"id": obj.pk, "updated_at": obj.updated_at} for obj in objects]
+        data = [serializer.to_representation(obj) for obj in objects[:limit]]
+    else:
+        rows = list(queryset.values(*plan.columns)[: limit + 1])
+        data = plan.render(rows[:limit])
+
+    more = len(rows) > limit
+    rows = rows[:limit]
+    if rows:
+        position = (rows[-1]["updated_at"], rows[-1]["id"])
+    return data, position, more
+
+
+def _deleted(position, cutoff, limit):
+    tombstones = list(
+        _after(Tombstone.objects.filter(deleted_at__lte=cutoff), "deleted_at", position)
+        .order_by("deleted_at", "id")
+        .values("id", "model", "object_id", "deleted_at")[: limit + 1]
+    )
+    more = len(tombstones) > limit
+    tombstones = tombstones[:limit]
+    deleted = {key: [] for key in SYNC_MODELS}
+    for tombstone in tombstones:
+        key = TOMBSTONE_KEYS.get(tombstone["model"])
+        if key is not None:
+            deleted[key].append(tombstone["object_id"])
+    if tombstones:
+        position = (tombstones[-1]["deleted_at"], tombstones[-1]["id"])
+    return deleted, position, more
+
+
+def sync(token=None, limit=None, context=None) -> dict:
+    """
+    Changes after ``token``, or everything for an initial sync (which skips
+    the tombstones). Each model returns at most ``limit`` rows; ``has_more``
+    tells the client to sync again with the new token right away.
+    """
+    now = timezone.now()
+    cutoff = sync_cutoff(now)
+    limit = limit or settings.API_SYNC_PAGE_SIZE
+    positions = read_token(token) if token else {}
+
+    changes = {}
+    new_positions = {}
+    has_more = False
+    for key in SYNC_MODELS:
+        changes[key], new_positions[key], more = _changed_rows(
+            key, positions.get(key), cutoff, limit, context or {}
+        )
+        has_more = has_more or more
+
+    if token:
+        deleted, new_positions[TOMBSTONES], more = _deleted(
+            positions.get(TOMBSTONES), cutoff, limit
+        )
+        has_more = has_more or more
+    else:
+        # A new client has nothing to delete; start after the last tombstone.
+        deleted = {key: [] for key in SYNC_MODELS}
+        last = (
+            Tombstone.objects.filter(deleted_at__lte=cutoff)
+            .order_by("-deleted_at", "-id")
+            .values_list("deleted_at", "id")
+            .first()
+        )
+        new_positions[TOMBSTONES] = last
+
+    return {
+        "changes": changes,
+        "deleted": deleted,
+        "has_more": has_more,
+        "sync_token": make_token(new_positions, now),
+    }
@@ -1,6 +1,17 @@
 from django.urls import include, path
 from rest_framework.routers import DefaultRouter
 
+from tracker import async_views
+from tracker.views import (
+    CacheStatsView,
+    DatabasePoolStatsView,
+    DeletionDetailView,
+    JobDetailView,
+    JobDownloadView,
+    ProfileDetailView,
+    ProfileListView,
+    SyncView,
+)
 from tracker.viewsets import ProjectViewSet, SprintViewSet, TaskViewSet
 
 router = DefaultRouter()
@@ -10,4 +21,36 @@ router.register(r"projects", ProjectViewSet)
 
 urlpatterns = [
     path("", include(router.urls)),
+    path("sync/", SyncView.as_view(), name="sync"),
+    path("deletions/<int:pk>/", DeletionDetailView.as_view(), name="deletion_detail"),
+    path("jobs/<int:pk>/", JobDetailView.as_view(), name="job_detail"),
+    path("jobs/<int:pk>/download/", JobDownloadView.as_view(), name="job_download"),
+    path("cache/stats/", CacheStatsView.as_view(), name="cache_stats"),
+    path("db/pool/", DatabasePoolStatsView.as_view(), name="db_pool_stats"),
+    path("profiles/", ProfileListView.as_view(), name="profile_list"),
+    path(
+        "profiles/<str:profile_id>/",
+        ProfileDetailView.as_view(),
+        name="profile_detail",
+    ),
+    # Async read path, see tracker/async_views.py.
+    path("async/tasks/", async_views.task_list, name="async_task_list"),
+    path("async/tasks/<int:pk>/", async_views.task_detail, name="async_task_detail"),
+    path(
+        "async/sprints/<int:pk>/board/",
+        async_views.sprint_board,
+        name="async_sprint_board",
+    ),
+    path("async/projects/", async_views.project_list, name="async_project_list"),
+    # Live task events, see tracker/live.py.
+    path(
+        "live/sprints/<int:pk>/",
+        async_views.sprint_events,
+        name="live_sprint_events",
+    ),
+    path(
+        "live/projects/<int:pk>/",
+        async_views.project_events,
+        name="live_project_events",
+    ),
 ]
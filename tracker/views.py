@@ -1,2 +1,128 @@
+from django.conf import settings
+from django.core.exceptions import PermissionDenied
+from django.core.files.storage import default_storage
+from django.http import FileResponse, Http404, HttpResponse
+from django.shortcuts import get_object_or_404
+from django.views.decorators.http import require_GET
+from rest_framework.permissions import IsAdminUser, IsAuthenticated
+from rest_framework.response import Response
+from rest_framework.views import APIView
 
-# Create your views here.
+from tracker.cache import cache_stats
+from tracker.db import pool_stats
+from tracker.metrics import render_metrics
+from tracker.models import Deletion, Job, JobStatusChoices
+from tracker.profiling import list_profiles, load_profile
+from tracker.serializers import (
+    DeletionSerializer,
+    JobSerializer,
+    SyncQuerySerializer,
+)
+from tracker.sync import sync
+
+
+class CacheStatsView(APIView):
+    permission_classes = [IsAdminUser]
+
+    def get(self, request):
+        return Response(cache_stats())
+
+
+class DatabasePoolStatsView(APIView):
+    permission_classes = [IsAdminUser]
+
+    def get(self, request):
+        return Response(pool_stats())
+
+
+class ProfileListView(APIView):
+    permission_classes = [IsAdminUser]
+
+    def get(self, request):
+        return Response(list_profiles())
+
+
+class ProfileDetailView(APIView):
+    permission_classes = [IsAdminUser]
+
+    def get(self, request, profile_id):
+        profile = load_profile(profile_id)
+        if profile is None:
+            raise Http404
+        return Response(profile)
+
+
+class DeletionDetailView(APIView):
+    """Progress of a background project or sprint deletion."""
+
+    permission_classes = [IsAdminUser]
+
+    def get(self, request, pk):
+        return Response(DeletionSerializer(get_object_or_404(Deletion, pk=pk)).data)
+
+
+def get_job(request, pk) -> Job:
+    """The job ``pk`` if it was queued by the user, or for staff any job."""
+    jobs = Job.objects.all()
+    if not request.user.is_staff:
+        jobs = jobs.filter(created_by=request.user)
+    return get_object_or_404(jobs, pk=pk)
+
+
+class JobDetailView(APIView):
+    """Status and result of a background job."""
+
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request, pk):
+        return Response(JobSerializer(get_job(request, pk)).data)
+
+
+class JobDownloadView(APIView):
+    """The file written by a finished job, e.g. a task export."""
+
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request, pk):
+        job = get_job(request, pk)
+        if job.status != JobStatusChoices.SUCCEEDED or "file" not in (job.result or {}):
+            raise Http404
+        name = job.result["file"]
+        return FileResponse(
+            default_storage.open(name),
+            as_attachment=True,
+            filename=name.rsplit("/", 1)[-1],
+            content_type=job.result.get("content_type"),
+        )
+
+
+class SyncView(APIView):
+    """Rows changed and deleted since ``?since=<sync_token>``."""
+
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request):
+        query = SyncQuerySerializer(data=request.query_params)
+        query.is_valid(raise_exception=True)
+        return Response(
+            sync(
+                query.validated_data.get("since"),
+                query.validated_data.get("limit"),
+                context={"request": request, "view": self},
+            )
+        )
+
+
+@require_GET
+def metrics(request):
+    if not settings.API_METRICS_ENABLED:
+        raise Http404
+    if (
+        request.META.get("REMOTE_ADDR")
+        not in settings.API_METRICS_ALLOWED_IPS.split(",")
+        and not request.user.is_staff
+    ):
+        raise PermissionDenied
+    return HttpResponse(
+        render_metrics(), content_type="text/plain; version=0.0.4; charset=utf-8"
+    )
@@ -1,32 +1,232 @@
+from django.conf import settings
 from django.contrib.auth import get_user_model
+from django.db import transaction
+from django.db.models import Prefetch
+from django_filters.rest_framework import DjangoFilterBackend
 from rest_framework.decorators import action
+from rest_framework.exceptions import ValidationError
+from rest_framework.filters import OrderingFilter
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
+from rest_framework.settings import api_settings
 from rest_framework.viewsets import ModelViewSet
 
-from tracker.models import Project, Sprint, Task
+from tracker.cache import CachedResponseMixin
+from tracker.conditional import ConditionalGetMixin
+from tracker.counters import delete_tasks, update_tasks
+from tracker.deletion import request_deletion
+from tracker.export import EXPORT_CONTENT_TYPES, stream_tasks
+from tracker.fastpath import FastListMixin
+from tracker.fieldsets import SparseFieldsetMixin
+from tracker.filters import TaskFilter
+from tracker.jobs import enqueue
+from tracker.models import (
+    TASK_COUNT_FIELDS,
+    Project,
+    Sprint,
+    SprintStatusChoices,
+    Task,
+)
 from tracker.permissions import IsAdminOrReadOnly, IsAssigneeOrAdmin
-from tracker.serializers import ProjectSerializer, SprintSerializer, TaskSerializer
+from tracker.search import search_tasks
+from tracker.serializers import (
+    DeletionSerializer,
+    JobSerializer,
+    ProjectSerializer,
+    SprintCloseSerializer,
+    SprintSerializer,
+    TaskBulkAssignSerializer,
+    TaskBulkDeleteSerializer,
+    TaskSearchQuerySerializer,
+    TaskSerializer,
+    parse_pk,
+)
 
 User = get_user_model()
 
 
-class ProjectViewSet(ModelViewSet):
+class TaskExportMixin:
+    """
+    Adds an ``export`` action over the object's tasks: streamed on ``GET``,
+    written by a background job on ``POST``. Both only read, so any
+    authenticated user may export.
+    """
+
+    export_type_param = "type"
+
+    def get_export_format(self, request):
+        export_format = request.query_params.get(self.export_type_param, "csv")
+        if export_format not in EXPORT_CONTENT_TYPES:
+            return None
+        return export_format
+
+    def export_format_error(self):
+        return Response(
+            {"error": f"type must be one of: {', '.join(EXPORT_CONTENT_TYPES)}"},
+            status=400,
+        )
+
+    @action(detail=True, methods=["get"], permission_classes=[IsAuthenticated])
+    def export(self, request, pk: int):
+        obj = self.get_object()
+        export_format = self.get_export_format(request)
+        if export_format is None:
+            return self.export_format_error()
+
+        # The counters are an upper bound of the visible tasks, and free.
+        total = sum(getattr(obj, field) for field in TASK_COUNT_FIELDS.values())
+        if total > settings.API_EXPORT_SYNC_MAX_ROWS:
+            return Response(
+                {
+                    "error": f"Too many tasks to stream ({total}), "
+                    "POST to this URL to export them in a background job"
+                },
+                status=400,
+            )
+
+        filename = f"{obj._meta.model_name}-{obj.pk}-tasks"
+        return stream_tasks(obj.tasks.visible(), export_format, filename)
+
+    @export.mapping.post
+    def export_in_background(self, request, pk: int):
+        obj = self.get_object()
+        export_format = self.get_export_format(request)
+        if export_format is None:
+            return self.export_format_error()
+
+        job = enqueue(
+            "export_tasks",
+            {
+                "model": obj._meta.model_name,
+                "object_id": obj.pk,
+                "export_format": export_format,
+            },
+            user=request.user,
+        )
+        return Response(JobSerializer(job).data, status=202)
+
+
+class BackgroundDeleteMixin:
+    """
+    Hides the object and leaves the deletion of its tasks to the background,
+    see ``tracker.deletion``. Responds 202 with the deletion's progress.
+    """
+
+    def destroy(self, request, *args, **kwargs):
+        deletion = request_deletion(self.get_object())
+        return Response(DeletionSerializer(deletion).data, status=202)
+
+
+class ProjectViewSet(
+    CachedResponseMixin,
+    FastListMixin,
+    SparseFieldsetMixin,
+    ConditionalGetMixin,
+    TaskExportMixin,
+    BackgroundDeleteMixin,
+    ModelViewSet,
+):
     queryset = Project.objects.all()
     serializer_class = ProjectSerializer
     permission_classes = [IsAuthenticated & IsAdminOrReadOnly]
+    ordering = ("-created_at", "-id")
+    cache_models = (Project,)
 
 
-class SprintViewSet(ModelViewSet):
+class SprintViewSet(
+    CachedResponseMixin,
+    FastListMixin,
+    SparseFieldsetMixin,
+    ConditionalGetMixin,
+    TaskExportMixin,
+    BackgroundDeleteMixin,
+    ModelViewSet,
+):
     queryset = Sprint.objects.all()
     serializer_class = SprintSerializer
     permission_classes = [IsAuthenticated & IsAdminOrReadOnly]
+    ordering = ("-id",)
+    cache_models = (Sprint, Task)
+
+    def renders_tasks(self):
+        fieldset = self.get_fieldset()
+        return self.action not in ("close", "export", "export_in_background") and (
+            fieldset is None or fieldset.includes("tasks")
+        )
+
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        if not self.renders_tasks():
+            return queryset
+
+        tasks = Task.objects.select_related("project", "assignee")
+        nested = self.get_fieldset() and self.get_fieldset().nested("tasks")
+        if nested is not None:
+            columns = self.get_sparse_columns(
+                TaskSerializer,
+                nested,
+                Task,
+                (*self.sparse_required_columns, "sprint"),
+            )
+            if columns is not None:
+                tasks = Task.objects.only(*columns)
+        return queryset.prefetch_related(Prefetch("tasks", queryset=tasks))
+
+    # Sprint payloads embed their tasks, so task changes must invalidate them.
+    def get_validator_parts(self, obj):
+        if isinstance(obj, dict) or not self.renders_tasks():
+            return super().get_validator_parts(obj)
+        tasks = obj.tasks.all()
+        return (obj.pk, obj.updated_at, [(t.pk, t.updated_at) for t in tasks])
 
+    def get_last_modified(self, obj):
+        if isinstance(obj, dict) or not self.renders_tasks():
+            return super().get_last_modified(obj)
+        return max([obj.updated_at, *(task.updated_at for task in obj.tasks.all())])
 
-class TaskViewSet(ModelViewSet):
-    queryset = Task.objects.select_related("sprint", "assignee").all()
+    @action(detail=True, methods=["post"])
+    def close(self, request, pk: int):
+        sprint = self.get_object()
+        if sprint.status == SprintStatusChoices.COMPLETED:
+            return Response({"error": "Sprint is already closed"}, status=400)
+
+        serializer = SprintCloseSerializer(
+            data=request.data, context={"sprint": sprint}
+        )
+        serializer.is_valid(raise_exception=True)
+        rollover_to = serializer.validated_data["rollover_to"]
+
+        moved = sprint.close(rollover_to=rollover_to)
+        return Response(
+            {
+                "id": sprint.id,
+                "status": sprint.status,
+                "rollover_to": rollover_to and rollover_to.id,
+                "moved_tasks": moved,
+            },
+            status=200,
+        )
+
+
+class TaskViewSet(
+    CachedResponseMixin,
+    FastListMixin,
+    SparseFieldsetMixin,
+    ConditionalGetMixin,
+    ModelViewSet,
+):
+    queryset = Task.objects.visible().select_related("sprint", "assignee")
     serializer_class = TaskSerializer
-    permission_classes = [IsAuthenticated & IsAssigneeOrAdmin]
+    # Listed separately rather than composed with ``&``, so that
+    # ``check_queryset_permissions`` finds ``has_queryset_permission``.
+    permission_classes = [IsAuthenticated, IsAssigneeOrAdmin]
+    filter_backends = [DjangoFilterBackend, OrderingFilter]
+    filterset_class = TaskFilter
+    # Cursor pagination keys on the leading ordering column, so only
+    # (nearly) unique timestamps are offered as sort keys.
+    ordering_fields = ("created_at", "updated_at")
+    ordering = ("-created_at", "-id")
+    cache_models = (Task,)
 
     @action(detail=True, methods=["patch"])
     def assign(self, request, pk: int):
@@ -42,5 +242,130 @@ class TaskViewSet(ModelViewSet):
             return Response({"error": "User not found"}, status=404)
 
         task.assignee = user
-        task.save()
+        task.save(update_fields=["assignee", "updated_at"])
         return Response(status=200)
+
+    def check_queryset_permissions(self, request, queryset):
+        """``check_object_permissions`` for a set of tasks, in one query each."""
+        for permission in self.get_permissions():
+            check = getattr(permission, "has_queryset_permission", None)
+            if check is not None and not check(request, self, queryset):
+                self.permission_denied(
+                    request,
+                    message=getattr(permission, "message", None),
+                    code=getattr(permission, "code", None),
+                )
+
+    @action(detail=False, methods=["post"], url_path="bulk/assign")
+    def bulk_assign(self, request):
+        """
+        Assign the tasks given by ``ids`` or matching the task list ``filter``
+        to ``user`` (``null`` unassigns) with a single UPDATE.
+        """
+        serializer = TaskBulkAssignSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        data = serializer.validated_data
+
+        if "ids" in data:
+            ids = set(data["ids"])
+            tasks = Task.objects.visible().filter(pk__in=ids)
+            missing = ids - set(tasks.values_list("id", flat=True))
+            if missing:
+                return Response(
+                    {"ids": {pk: "Task not found." for pk in sorted(missing)}},
+                    status=404,
+                )
+        else:
+            filterset = self.filterset_class(
+                data["filter"], queryset=Task.objects.visible(), request=request
+            )
+            if not filterset.is_valid():
+                raise ValidationError({"filter": filterset.errors})
+            if all(
+                value in (None, "", [])
+                for value in filterset.form.cleaned_data.values()
+            ):
+                raise ValidationError({"filter": ["The filter matches every task."]})
+            tasks = filterset.qs
+
+        with transaction.atomic():
+            self.check_queryset_permissions(request, tasks)
+            if not request.user.is_staff:
+                # Tasks assigned to others after the check must stay untouched.
+                tasks = tasks.filter(assignee_id=request.user.id)
+            updated = update_tasks(tasks, assignee=data["user"])
+        return Response({"updated": updated}, status=200)
+
+    @action(detail=False, methods=["get"])
+    def search(self, request):
+        """
+        The ``page_size`` best matches of ``?q=``, ranked. The list filters
+        apply, so ``?project=`` scopes the search to one project.
+        """
+        params = TaskSearchQuerySerializer(data=request.query_params)
+        params.is_valid(raise_exception=True)
+        page_size = params.validated_data.get("page_size", api_settings.PAGE_SIZE)
+
+        queryset = self.filter_queryset(self.get_queryset())
+        tasks = list(search_tasks(queryset, params.validated_data["q"])[:page_size])
+        results = self.get_serializer(tasks, many=True).data
+        for task, data in zip(tasks, results):
+            data["rank"] = task.rank
+        return Response({"results": results})
+
+    def get_bulk_serializer(self, *args, **kwargs):
+        kwargs.setdefault("context", self.get_serializer_context())
+        return TaskSerializer(
+            *args, many=True, max_length=settings.API_BULK_MAX_ITEMS, **kwargs
+        )
+
+    @action(detail=False, methods=["post"])
+    def bulk(self, request):
+        serializer = self.get_bulk_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        with transaction.atomic():
+            serializer.save()
+        return Response(serializer.data, status=201)
+
+    @bulk.mapping.patch
+    def bulk_update(self, request):
+        items = request.data if isinstance(request.data, list) else []
+        if len(items) > settings.API_BULK_MAX_ITEMS:
+            # Fails on ``max_length`` before any task is loaded or locked.
+            self.get_bulk_serializer({}, data=items, partial=True).is_valid(
+                raise_exception=True
+            )
+        ids = {parse_pk(item.get("id")) for item in items if isinstance(item, dict)}
+        ids.discard(None)
+
+        with transaction.atomic():
+            tasks = Task.objects.visible().select_for_update(of=("self",)).in_bulk(ids)
+            for task in tasks.values():
+                self.check_object_permissions(request, task)
+
+            serializer = self.get_bulk_serializer(
+                tasks, data=request.data, partial=True
+            )
+            serializer.is_valid(raise_exception=True)
+            serializer.save()
+        return Response(serializer.data, status=200)
+
+    @bulk.mapping.delete
+    def bulk_destroy(self, request):
+        serializer = TaskBulkDeleteSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        ids = set(serializer.validated_data["ids"])
+
+        with transaction.atomic():
+            tasks = Task.objects.visible().select_for_update(of=("self",))
+            tasks = tasks.only("id", "assignee_id").in_bulk(ids)
+            missing = ids - tasks.keys()
+            if missing:
+                return Response(
+                    {"ids": {pk: "Task not found." for pk in sorted(missing)}},
+                    status=404,
+                )
+            for task in tasks.values():
+                self.check_object_permissions(request, task)
+            delete_tasks(Task.objects.filter(pk__in=ids))
+        return Response(status=204)